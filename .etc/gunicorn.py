@@ -1,25 +1,72 @@
 """Gunicorn configuration file."""
 
+import gc
 import logging
 import sys
 import typing
-from multiprocessing import cpu_count
+from pathlib import Path
 
 import environ
 import json_log_formatter
 
 
+# gunicorn loads this file before it changes to the project directory
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from config.tuning import MAX_WORKER_MEMORY_MB  # noqa: E402
+from config.tuning import MIB  # noqa: E402
+from config.tuning import STATS_INTERVAL  # noqa: E402
+from config.tuning import WorkerMonitor  # noqa: E402
+from config.tuning import WorkerSizing  # noqa: E402
+from config.tuning import cpu_limit  # noqa: E402
+from config.tuning import memory_limit  # noqa: E402
+from config.tuning import worker_class_for  # noqa: E402
+from config.tuning import worker_sizing  # noqa: E402
+
+
 env: environ.Env = environ.Env()
 
 bind: str = "unix:/srv/run/application/gunicorn.sock"
 backlog: int = 2048
 
-workers: int = env.int("GUNICORN_WORKERS", cpu_count() * 2 - 1)
-worker_class: str = "sync"
-timeout: int = env.int("GUNICORN_TIMEOUT", 300)
-max_requests: int = env.int("GUNICORN_MAX_REQUESTS", 1500)
+# Worker mode: sync, gthread (threads per worker), gevent (greenlets) or uvicorn (ASGI)
+worker_mode: str = env.str("GUNICORN_WORKER_MODE", "uvicorn" if env.bool("GUNICORN_ASGI", False) else "sync")
+worker_class: str = worker_class_for(worker_mode)
+wsgi_app: str = "config.asgi:application" if worker_mode == "uvicorn" else "config.wsgi:application"
+
+# Sized from the cgroup CPU quota and memory limit unless set explicitly
+cpus: float = cpu_limit()
+memory: typing.Optional[int] = memory_limit()
+sizing: WorkerSizing = worker_sizing(
+    worker_mode,
+    cpus,
+    memory,
+    worker_memory=env.int("GUNICORN_WORKER_MEMORY_MB", 256) * MIB,
+    threads=env.int("GUNICORN_THREADS", 4),
+)
+workers: int = env.int("GUNICORN_WORKERS", sizing.workers)
+threads: int = sizing.threads
+worker_connections: int = env.int("GUNICORN_WORKER_CONNECTIONS", 1000)
+timeout: int = env.int("GUNICORN_TIMEOUT", 30)
 graceful_timeout: int = env.int("GUNICORN_GRACEFUL_TIMEOUT", 30)
 
+# Recycling: after max_requests plus a random jitter, so the workers do not all restart at
+# once, or as soon as the resident memory of a worker exceeds GUNICORN_MAX_WORKER_MEMORY_MB
+max_requests: int = env.int("GUNICORN_MAX_REQUESTS", 1500)
+max_requests_jitter: int = env.int("GUNICORN_MAX_REQUESTS_JITTER", max_requests // 10)
+monitor: WorkerMonitor = WorkerMonitor(
+    max_memory=env.int("GUNICORN_MAX_WORKER_MEMORY_MB", MAX_WORKER_MEMORY_MB) * MIB,
+    stats_interval=env.int("GUNICORN_STATS_INTERVAL", STATS_INTERVAL),
+)
+
+reload: bool = env.bool("GUNICORN_RELOAD", default=False)
+reload_engine: str = "poll"
+
+# Import the application once in the master, the workers share its pages copy-on-write. The
+# gevent workers monkey patch on start, so the application is imported after that in each worker.
+# The reloaded workers would be forked from the stale import of the master, so not with reload.
+preload_app: bool = env.bool("GUNICORN_PRELOAD", not reload and worker_mode != "gevent")
+
 
 daemon: bool = False
 
@@ -30,14 +77,108 @@ user: str = env.str("DOCKER_USER")
 group: str = env.str("DOCKER_GROUP")
 tmp_upload_dir: typing.Any = None
 
-reload: bool = env.bool("GUNICORN_RELOAD", default=False)
-reload_engine: str = "poll"
-
 
 accesslog: str = "-"
 errorlog: str = "-"
 
 
+def on_starting(server: typing.Any) -> None:
+    """Log the worker sizing.
+
+    Args:
+        server: The arbiter.
+    """
+    limit = f"{memory // MIB} MiB" if memory is not None else "unlimited"
+    server.log.info(
+        f"Worker mode {worker_mode}: {workers} workers x {threads} threads for {cpus:g} CPUs and {limit} memory"
+    )
+
+
+def when_ready(server: typing.Any) -> None:
+    """Freeze the objects of the preloaded application before forking the workers.
+
+    Frozen objects are never visited by the garbage collector of the workers, which would
+    otherwise write to every shared page and copy it.
+
+    Args:
+        server: The arbiter.
+    """
+    if preload_app:
+        gc.freeze()
+
+
+def pre_fork(server: typing.Any, worker: typing.Any) -> None:
+    """Close the database connections of the master, the workers must open their own.
+
+    Args:
+        server: The arbiter.
+        worker: The worker about to be forked.
+    """
+    if preload_app:
+        from django.db import connections
+
+        from olympus.core.db.pool import close_pools
+
+        connections.close_all()
+        close_pools()
+
+
+def post_fork(server: typing.Any, worker: typing.Any) -> None:
+    """Make psycopg2 cooperative in the gevent workers.
+
+    Args:
+        server: The arbiter.
+        worker: The forked worker.
+    """
+    if worker_mode == "gevent":
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
+
+
+def post_request(worker: typing.Any, req: typing.Any, environ: dict[str, typing.Any], resp: typing.Any) -> None:
+    """Log the worker stats and stop the worker after this request once it uses too much memory.
+
+    Args:
+        worker: The worker.
+        req: The request.
+        environ: The WSGI environment.
+        resp: The response.
+    """
+    if monitor.check(worker) == "memory":
+        worker.alive = False
+
+
+def worker_int(worker: typing.Any) -> None:
+    """Log the worker stats when it is interrupted.
+
+    Args:
+        worker: The worker.
+    """
+    monitor.report(worker, "Worker interrupted", "interrupt")
+
+
+def worker_abort(worker: typing.Any) -> None:
+    """Log the worker stats when it is killed for exceeding the timeout.
+
+    Args:
+        worker: The worker.
+    """
+    monitor.report(worker, "Worker aborted", "timeout")
+
+
+def worker_exit(server: typing.Any, worker: typing.Any) -> None:
+    """Write the application logs still buffered by the worker.
+
+    Args:
+        server: The arbiter.
+        worker: The exiting worker.
+    """
+    from olympus.core.logger import flush_logs
+
+    flush_logs()
+
+
 class JsonRequestFormatter(json_log_formatter.JSONFormatter):
     """Custom JSON log formatter for Gunicorn."""
 
@@ -0,0 +1,47 @@
+"""Performance benchmarks.
+
+Every module is a standalone script, run it with ``python -m benchmarks.<module>``
+against the database configured in the environment.
+"""
+
+import os
+import time
+from typing import Callable
+
+
+def setup() -> None:
+    """Configure Django for a standalone benchmark run."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+    import django
+
+    django.setup()
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """Return the best wall time of several runs of the function.
+
+    Args:
+        func: The function to measure.
+        repeat: The number of runs.
+
+    Returns:
+        The best time in seconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def report(name: str, seconds: float, items: int) -> None:
+    """Print one result line.
+
+    Args:
+        name: The name of the measured case.
+        seconds: The measured time.
+        items: The number of processed items.
+    """
+    print(f"{name:<32} {seconds * 1000:>10.1f} ms {items / seconds:>14,.0f} items/s")
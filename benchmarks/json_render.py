@@ -0,0 +1,91 @@
+"""Benchmark the rendering of the API responses.
+
+Renders a 10k objects list, with ULIDs as loaded from the database, datetimes and decimals,
+with the DRF ``JSONRenderer`` and with the ``ORJSONRenderer``, then streams the same list in
+batches with ``iter_json_array``.
+"""
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import Decimal
+from typing import Any
+
+import orjson
+
+from benchmarks import measure
+from benchmarks import report
+from benchmarks import setup
+
+
+OBJECTS = 10_000
+
+
+def payload() -> list[dict[str, Any]]:
+    """Build the list of deals.
+
+    Returns:
+        The deals, like the output of a serializer.
+    """
+    from olympus.core.db.ulids import LazyULID
+    from olympus.core.db.ulids import ulid_generator
+
+    created_at = datetime(2024, 5, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": LazyULID(str(ulid)),
+            "tenant": "acme",
+            "name": f"Deal {index}",
+            "amount": Decimal(index) / 100,
+            "stage": "negotiation",
+            "created_at": created_at + timedelta(seconds=index),
+            "updated_at": created_at + timedelta(seconds=index, microseconds=index),
+            "owner": {"id": index % 50, "email": f"owner{index % 50}@example.com"},
+            "tags": ["inbound", "priority"],
+        }
+        for index, ulid in enumerate(ulid_generator.batch(OBJECTS))
+    ]
+
+
+def main() -> None:
+    """Run the benchmark.
+
+    Raises:
+        SystemExit: If both renderers do not produce the same JSON.
+    """
+    setup()
+
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.utils.encoders import JSONEncoder
+    from ulid import ULID
+
+    from olympus.core.renderers import ORJSONRenderer
+    from olympus.core.renderers import iter_json_array
+
+    class ULIDEncoder(JSONEncoder):
+        """DRF encoder extended with the ULIDs."""
+
+        def default(self, obj: Any) -> Any:
+            return str(obj) if isinstance(obj, ULID) else super().default(obj)
+
+    class DRFRenderer(JSONRenderer):
+        """DRF renderer with the ULID aware encoder."""
+
+        encoder_class = ULIDEncoder
+
+    data = payload()
+    drf, fast = DRFRenderer(), ORJSONRenderer()
+    if orjson.loads(fast.render(data)) != orjson.loads(drf.render(data)):
+        raise SystemExit("ORJSONRenderer does not match the DRF JSONRenderer.")
+
+    def streamed() -> None:
+        for _ in iter_json_array(data, list):
+            pass
+
+    report("drf JSONRenderer", measure(lambda: drf.render(data)), OBJECTS)
+    report("ORJSONRenderer", measure(lambda: fast.render(data)), OBJECTS)
+    report("iter_json_array (500 batches)", measure(streamed), OBJECTS)
+
+
+if __name__ == "__main__":
+    main()
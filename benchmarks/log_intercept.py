@@ -0,0 +1,51 @@
+"""Benchmark the standard library to loguru bridge of ``InterceptHandler``.
+
+Emits 50k records through a ``logging`` logger into a loguru sink that discards them,
+resolving the caller frame on every record, with the per call site depth cache, and
+for a level below the threshold.
+"""
+
+from benchmarks import measure
+from benchmarks import report
+from benchmarks import setup
+
+
+RECORDS = 50_000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    setup()
+
+    import logging
+
+    from olympus.core.logger import InterceptHandler
+    from olympus.core.logger import logger
+
+    logger.remove()
+    logger.add(lambda message: None, level="DEBUG")
+    intercept_handler = next(handler for handler in logging.root.handlers if isinstance(handler, InterceptHandler))
+    intercept_handler.min_levelno = logging.INFO
+    bench_logger = logging.getLogger("benchmarks.log_intercept")
+    bench_logger.setLevel(logging.DEBUG)
+
+    def uncached() -> None:
+        for index in range(RECORDS):
+            intercept_handler._depths.clear()
+            bench_logger.info("record %s", index)
+
+    def cached() -> None:
+        for index in range(RECORDS):
+            bench_logger.info("record %s", index)
+
+    def disabled() -> None:
+        for index in range(RECORDS):
+            bench_logger.debug("record %s", index)
+
+    report("frame walk", measure(uncached), RECORDS)
+    report("cached depth", measure(cached), RECORDS)
+    report("disabled level", measure(disabled), RECORDS)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark the JSON encoding of the log records.
+
+Captures 50k records of a logger from ``get_logger()``, and as many of the same logger with request
+values bound, from a handful of call sites. Encodes them with the previous dict based
+``serialize()`` and with ``encode()``, which reuses the pre-encoded level, call site and logger
+name ``extra`` members and formats the date once per second.
+"""
+
+from typing import Any
+
+import orjson
+
+from benchmarks import measure
+from benchmarks import report
+from benchmarks import setup
+
+
+RECORDS = 50_000
+
+
+def legacy_serialize(record: Any) -> bytes:
+    """Encode the record like ``serialize()`` did before the pre-encoded members.
+
+    Args:
+        record: Loguru record.
+
+    Returns:
+        The encoded line.
+    """
+    subset = {
+        "timestamp": record["time"].timestamp(),
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "name": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "path": record["file"].path,
+    }
+    if record["extra"]:
+        subset["extra"] = record["extra"]
+    return f"{orjson.dumps(subset, default=str).decode('utf-8')}\n".encode("utf-8")
+
+
+def main() -> None:
+    """Run the benchmark.
+
+    Raises:
+        SystemExit: If both encoders do not produce the same JSON.
+    """
+    setup()
+
+    from olympus.core.logger import encode
+    from olympus.core.logger import get_logger
+    from olympus.core.logger import logger
+
+    named_records: list[Any] = []
+    bound_records: list[Any] = []
+    named = get_logger("olympus.crm.deals")
+    bound = named.bind(tenant="acme", request_id="01HQ3Z8T4B6V9X2K7M5N1P0RSW")
+    logger.remove()
+    for records, log in ((named_records, named), (bound_records, bound)):
+        handler = logger.add(lambda message, records=records: records.append(message.record), level="DEBUG")
+        for index in range(RECORDS):
+            if index % 2:
+                log.info("deal {} updated", index)
+            else:
+                log.debug("contact {} fetched", index)
+        logger.remove(handler)
+
+    for records in (named_records, bound_records):
+        if [orjson.loads(encode(record)) for record in records[:10]] != [
+            orjson.loads(legacy_serialize(record)) for record in records[:10]
+        ]:
+            raise SystemExit("encode() does not match the dict based serialize().")
+
+    def legacy(records: list[Any]) -> None:
+        for record in records:
+            legacy_serialize(record)
+
+    def pre_encoded(records: list[Any]) -> None:
+        for record in records:
+            encode(record)
+
+    report("dict serialize, named", measure(lambda: legacy(named_records)), RECORDS)
+    report("pre-encoded, named", measure(lambda: pre_encoded(named_records)), RECORDS)
+    report("dict serialize, bound", measure(lambda: legacy(bound_records)), RECORDS)
+    report("pre-encoded, bound", measure(lambda: pre_encoded(bound_records)), RECORDS)
+
+
+if __name__ == "__main__":
+    main()
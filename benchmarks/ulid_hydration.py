@@ -0,0 +1,70 @@
+"""Benchmark the ORM hydration of ULID primary and foreign keys.
+
+Loads 100k rows, each with a ULID primary key and a foreign key to one of 100 parents,
+with the eager decoding, the lazy decoding and the LRU cached foreign key decoding.
+Everything runs inside a rolled back transaction.
+"""
+
+from benchmarks import measure
+from benchmarks import report
+from benchmarks import setup
+
+
+ROWS = 100_000
+PARENTS = 100
+
+
+def main() -> None:
+    """Run the benchmark."""
+    setup()
+
+    from django.db import connection
+    from django.db import models
+    from django.db import transaction
+
+    from olympus.core.db.fields import ULIDPrimaryKeyField
+    from olympus.core.db.ulids import cached_decoder
+
+    class BenchParent(models.Model):
+        id = ULIDPrimaryKeyField()
+
+        class Meta:
+            app_label = "core"
+
+    class BenchRow(models.Model):
+        id = ULIDPrimaryKeyField()
+        parent = models.ForeignKey(BenchParent, on_delete=models.CASCADE)
+
+        class Meta:
+            app_label = "core"
+
+    row_pk = BenchRow._meta.pk
+    parent_pk = BenchParent._meta.pk
+
+    with transaction.atomic():
+        with connection.schema_editor() as editor:
+            editor.create_model(BenchParent)
+            editor.create_model(BenchRow)
+        parents = BenchParent.objects.bulk_create([BenchParent() for _ in range(PARENTS)])
+        BenchRow.objects.bulk_create(
+            [BenchRow(parent=parents[index % PARENTS]) for index in range(ROWS)],
+            batch_size=5_000,
+        )
+
+        def hydrate() -> None:
+            list(BenchRow.objects.all())
+
+        for name, lazy, cache in (
+            ("eager", False, None),
+            ("lazy", True, None),
+            ("eager + fk cache", False, cached_decoder(1024)),
+            ("lazy + fk cache", True, cached_decoder(1024)),
+        ):
+            row_pk.lazy, parent_pk.decode_cache = lazy, cache
+            report(name, measure(hydrate), ROWS)
+
+        transaction.set_rollback(True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 """Celery configuration."""
 
 import os
+from typing import Any
 
 from celery import Celery
+from celery.signals import before_task_publish
+from celery.signals import task_postrun
+from celery.signals import task_prerun
+from celery.signals import worker_process_shutdown
+from celery.signals import worker_shutdown
 from environ import Env
 
 
@@ -13,3 +19,101 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 app = Celery(env.str("PROJECT_NAME", "celery"))
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+REQUEST_ID_TASK_HEADER = "request_id"
+
+
+@before_task_publish.connect
+def send_request_id(headers: dict[str, Any], **kwargs: Any) -> None:
+    """Send the correlation ID of the current request or task with the enqueued task.
+
+    Args:
+        headers: The message headers.
+        **kwargs: The signal arguments.
+    """
+    from olympus.core.correlation import get_request_id
+
+    request_id = get_request_id()
+    if request_id is not None:
+        headers.setdefault(REQUEST_ID_TASK_HEADER, request_id)
+
+
+@task_prerun.connect
+def restore_request_id(task_id: str, task: Any, **kwargs: Any) -> None:
+    """Activate the correlation ID sent with the task, or the task ID if it was enqueued outside of a request.
+
+    Args:
+        task_id: The task ID.
+        task: The task.
+        **kwargs: The signal arguments.
+    """
+    from olympus.core.correlation import get_request_id
+    from olympus.core.correlation import set_request_id
+
+    request_id = getattr(task.request, REQUEST_ID_TASK_HEADER, None) or get_request_id() or task_id
+    task.request.request_id_token = set_request_id(request_id)
+
+
+@task_postrun.connect
+def clear_request_id(task: Any, **kwargs: Any) -> None:
+    """Restore the correlation ID active before the task.
+
+    Args:
+        task: The task.
+        **kwargs: The signal arguments.
+    """
+    from olympus.core.correlation import reset_request_id
+
+    token = getattr(task.request, "request_id_token", None)
+    if token is not None:
+        reset_request_id(token)
+        task.request.request_id_token = None
+
+
+@task_prerun.connect
+def route_reads_to_replicas(task: Any, **kwargs: Any) -> None:
+    """Send the reads of the tasks declared with ``replica_reads=True`` to the read replicas until they write.
+
+    The other tasks read from the primary: they usually get the ID of a row the request that
+    enqueued them just wrote, which a lagging replica may not have yet::
+
+        @shared_task(replica_reads=True)
+        def export_deals(tenant_id: str) -> None: ...
+
+    Args:
+        task: The task.
+        **kwargs: The signal arguments.
+    """
+    from olympus.core.db.routers import start_replica_routing
+
+    if getattr(task, "replica_reads", False):
+        task.request.replica_routing_token = start_replica_routing()
+
+
+@task_postrun.connect
+def clear_replica_routing(task: Any, **kwargs: Any) -> None:
+    """Restore the routing active before the task.
+
+    Args:
+        task: The task.
+        **kwargs: The signal arguments.
+    """
+    from olympus.core.db.routers import stop_replica_routing
+
+    token = getattr(task.request, "replica_routing_token", None)
+    if token is not None:
+        stop_replica_routing(token)
+        task.request.replica_routing_token = None
+
+
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def flush_logs_on_shutdown(**kwargs: Any) -> None:
+    """Write the application logs still buffered by the worker.
+
+    Args:
+        **kwargs: The signal arguments.
+    """
+    from olympus.core.logger import flush_logs
+
+    flush_logs()
@@ -0,0 +1,224 @@
+"""Sizing and recycling of the gunicorn workers from the container limits.
+
+``os.cpu_count()`` reports the cores of the host inside a container, the CPU quota and the
+memory limit of the cgroup (v2, or v1 on older hosts) are what the workers actually get.
+"""
+
+import math
+import os
+import resource
+from pathlib import Path
+from typing import Any
+from typing import NamedTuple
+from typing import Optional
+
+
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+# The gunicorn worker class of every worker mode.
+WORKER_CLASSES = {
+    "sync": "sync",
+    "gthread": "gthread",
+    "gevent": "gevent",
+    "uvicorn": "config.workers.UvicornWorker",
+}
+WORKER_MODES = tuple(WORKER_CLASSES)
+# cgroup v1 reports an unlimited memory as the largest page aligned 64 bits value.
+UNLIMITED_MEMORY = 1 << 62
+MIB = 1024 * 1024
+MAX_WORKER_MEMORY_MB = 512
+STATS_INTERVAL = 500
+
+
+def _read(path: Path) -> Optional[str]:
+    """Return the stripped content of a cgroup file.
+
+    Args:
+        path: The file path.
+
+    Returns:
+        The content, ``None`` if the file does not exist.
+    """
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def cpu_limit(root: Path = CGROUP_ROOT) -> float:
+    """Return the number of CPUs available to the process.
+
+    Args:
+        root: The mount point of the cgroup file system.
+
+    Returns:
+        The CPU quota of the cgroup, bounded by the CPUs the process may run on.
+    """
+    available = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+    quota = period = None
+    cpu_max = _read(root / "cpu.max")
+    if cpu_max is not None:
+        value, _, interval = cpu_max.partition(" ")
+        if value != "max":
+            quota, period = int(value), int(interval or 100_000)
+    else:
+        value, interval = _read(root / "cpu" / "cpu.cfs_quota_us"), _read(root / "cpu" / "cpu.cfs_period_us")
+        if value is not None and interval is not None and int(value) > 0:
+            quota, period = int(value), int(interval)
+    if quota is None or not period:
+        return float(available)
+    return min(quota / period, float(available))
+
+
+def memory_limit(root: Path = CGROUP_ROOT) -> Optional[int]:
+    """Return the memory limit of the cgroup.
+
+    Args:
+        root: The mount point of the cgroup file system.
+
+    Returns:
+        The limit in bytes, ``None`` if the memory is not limited.
+    """
+    value = _read(root / "memory.max")
+    if value is None:
+        value = _read(root / "memory" / "memory.limit_in_bytes")
+    if value is None or value == "max" or int(value) >= UNLIMITED_MEMORY:
+        return None
+    return int(value)
+
+
+class WorkerSizing(NamedTuple):
+    """The number of gunicorn workers and of threads per worker."""
+
+    workers: int
+    threads: int
+
+
+def worker_class_for(mode: str) -> str:
+    """Return the gunicorn worker class of the worker mode.
+
+    Args:
+        mode: The worker mode, one of :data:`WORKER_MODES`.
+
+    Returns:
+        The worker class.
+
+    Raises:
+        ValueError: If the worker mode is unknown.
+    """
+    if mode not in WORKER_CLASSES:
+        raise ValueError(f"Unknown gunicorn worker mode {mode!r}, use one of {WORKER_MODES}.")
+    return WORKER_CLASSES[mode]
+
+
+def worker_sizing(
+    mode: str,
+    cpus: float,
+    memory: Optional[int],
+    worker_memory: int,
+    threads: int = 4,
+) -> WorkerSizing:
+    """Size the workers for the worker mode and the limits.
+
+    The blocking ``sync`` workers get the classic ``2 * CPUs + 1``, the ``gthread`` workers one
+    per CPU plus one with ``threads`` each, the ``gevent`` and ``uvicorn`` event loops one per CPU.
+    The workers are then capped so that ``worker_memory`` bytes each fit in the memory limit.
+
+    Args:
+        mode: The worker mode, one of :data:`WORKER_MODES`.
+        cpus: The number of available CPUs, possibly fractional.
+        memory: The memory limit in bytes, ``None`` if unlimited.
+        worker_memory: The expected resident memory of a worker in bytes.
+        threads: The number of threads of a ``gthread`` worker.
+
+    Returns:
+        The number of workers and of threads per worker.
+
+    Raises:
+        ValueError: If the worker mode is unknown.
+    """
+    if mode not in WORKER_MODES:
+        raise ValueError(f"Unknown gunicorn worker mode {mode!r}, use one of {WORKER_MODES}.")
+    cores = max(math.ceil(cpus), 1)
+    if mode == "sync":
+        workers = 2 * cores + 1
+    elif mode == "gthread":
+        workers = cores + 1
+    else:
+        workers = cores
+    if memory is not None:
+        workers = min(workers, memory // worker_memory)
+    return WorkerSizing(max(workers, 1), threads if mode == "gthread" else 1)
+
+
+def resident_memory() -> int:
+    """Return the resident memory of the current process.
+
+    Returns:
+        The resident set size in bytes, the peak one where ``/proc`` is not available.
+    """
+    statm = _read(Path("/proc/self/statm"))
+    if statm is None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return int(statm.split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class WorkerMonitor:
+    """Watch the resident memory and the requests of a gunicorn worker.
+
+    The monitor is created in the master and copied in every forked worker, each copy keeps
+    the state of its own worker. The stats are logged through the worker logger, so they are
+    written as JSON by the ``JsonRequestFormatter`` of the ``gunicorn.error`` logger.
+    """
+
+    def __init__(self, max_memory: int, stats_interval: int = STATS_INTERVAL) -> None:
+        """Initialize the monitor.
+
+        Args:
+            max_memory: The resident memory in bytes above which the worker is recycled, 0 to never recycle it.
+            stats_interval: The number of requests between two stats records.
+        """
+        self.max_memory = max_memory
+        self.stats_interval = stats_interval
+        self._reported = 0
+        self._recycling = False
+
+    def report(self, worker: Any, message: str, reason: Optional[str] = None) -> None:
+        """Log the memory and the request count of the worker.
+
+        Args:
+            worker: The gunicorn worker.
+            message: The log message.
+            reason: Why the worker restarts, if it does.
+        """
+        stats: dict[str, str | int | float] = {
+            "pid": worker.pid,
+            "requests": worker.nr,
+            "rss_mb": round(resident_memory() / MIB, 1),
+        }
+        if reason is not None:
+            stats["reason"] = reason
+        worker.log.info(message, extra=stats)
+
+    def check(self, worker: Any) -> Optional[str]:
+        """Check the worker after a request, logging its stats every ``stats_interval`` requests.
+
+        Args:
+            worker: The gunicorn worker.
+
+        Returns:
+            ``"memory"`` or ``"max_requests"`` the first time the worker must restart, ``None`` otherwise.
+        """
+        if self._recycling:
+            return None
+        reason = None
+        if self.max_memory and resident_memory() > self.max_memory:
+            reason = "memory"
+        elif worker.nr >= worker.max_requests:
+            reason = "max_requests"
+        if reason is not None:
+            self._recycling = True
+            self.report(worker, "Recycling worker", reason)
+        elif worker.nr - self._reported >= self.stats_interval:
+            self._reported = worker.nr
+            self.report(worker, "Worker stats")
+        return reason
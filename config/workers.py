@@ -0,0 +1,60 @@
+"""Gunicorn worker classes."""
+
+import sys
+from typing import Any
+
+import environ
+from gunicorn.arbiter import Arbiter
+from uvicorn.server import Server
+from uvicorn_worker import UvicornWorker as BaseUvicornWorker
+
+from config.tuning import MAX_WORKER_MEMORY_MB
+from config.tuning import MIB
+from config.tuning import STATS_INTERVAL
+from config.tuning import WorkerMonitor
+
+
+env: environ.Env = environ.Env()
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """Uvicorn worker serving the Django ASGI application under gunicorn.
+
+    Django does not implement the ASGI lifespan protocol, and the requests are already logged by
+    the ``RequestIDMiddleware``. gunicorn calls no request hooks for the ASGI workers, so the
+    memory and the requests are checked on the heartbeat instead.
+    """
+
+    CONFIG_KWARGS = {"loop": "auto", "http": "auto", "lifespan": "off", "access_log": False}
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the worker.
+
+        Args:
+            *args: The gunicorn worker arguments.
+            **kwargs: The gunicorn worker keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.server: Server | None = None
+        self.monitor = WorkerMonitor(
+            max_memory=env.int("GUNICORN_MAX_WORKER_MEMORY_MB", MAX_WORKER_MEMORY_MB) * MIB,
+            stats_interval=env.int("GUNICORN_STATS_INTERVAL", STATS_INTERVAL),
+        )
+
+    async def _serve(self) -> None:
+        """Serve the application, keeping the server to read its request count."""
+        self.config.app = self.wsgi
+        self.server = Server(config=self.config)
+        self._install_sigquit_handler()
+        await self.server.serve(sockets=self.sockets)
+        if not self.server.started:
+            sys.exit(Arbiter.WORKER_BOOT_ERROR)
+
+    async def callback_notify(self) -> None:
+        """Notify the arbiter, then log the stats and stop gracefully once the worker uses too much memory."""
+        self.notify()
+        if self.server is None:
+            return
+        self.nr = self.server.server_state.total_requests
+        if self.monitor.check(self) == "memory":
+            self.server.should_exit = True
@@ -7,3 +7,7 @@ class CoreConfig(AppConfig):
     """Core app config."""
 
     name: str = "olympus.core"
+
+    def ready(self) -> None:
+        """Register the system checks."""
+        from olympus.core import checks  # noqa: F401
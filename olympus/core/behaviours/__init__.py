@@ -2,6 +2,7 @@
 
 from .tenantable import Tenantable
 from .timable import Timable
+from .ulidable import BinaryULIDable
 from .ulidable import ULIDable
 
 
@@ -9,4 +10,5 @@ __all__ = (
     "Timable",
     "ULIDable",
     "Tenantable",
+    "BinaryULIDable",
 )
@@ -5,7 +5,9 @@ Behaviour for ULID primary key.
 
 from django.db import models
 
+from olympus.core.db.fields import BinaryULIDPrimaryKeyField
 from olympus.core.db.fields import ULIDPrimaryKeyField
+from olympus.core.db.managers import ULIDManager
 
 
 class ULIDable(models.Model):
@@ -13,6 +15,25 @@ class ULIDable(models.Model):
 
     id = ULIDPrimaryKeyField(primary_key=True)
 
+    objects = ULIDManager()
+
+    class Meta:
+        """Meta class for the model."""
+
+        abstract = True
+
+
+class BinaryULIDable(models.Model):
+    """Behaviour for ULID primary key stored as 16 raw bytes.
+
+    Drop-in replacement for :class:`ULIDable`, use
+    :class:`~olympus.core.db.operations.ConvertULIDStorage` to migrate existing tables.
+    """
+
+    id = BinaryULIDPrimaryKeyField(primary_key=True)
+
+    objects = ULIDManager()
+
     class Meta:
         """Meta class for the model."""
 
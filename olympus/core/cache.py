@@ -0,0 +1,444 @@
+"""Two-tier cache and the caching helpers.
+
+The ``default`` cache is a :class:`TieredCache`: a small LRU of the process in front of the
+``shared`` cache (Redis), so the hottest keys of a worker skip the network round trip. A write
+goes through to the shared cache, but the other processes may keep serving their local copy
+for up to ``LOCAL_TIMEOUT`` seconds, so only cache there what tolerates it.
+
+The helpers namespace the keys by the current tenant and protect the expensive values against
+cache stampedes::
+
+    from olympus.core.cache import get_or_compute
+    from olympus.core.cache import tenant_key
+
+    def pipeline_totals() -> dict[str, int]:
+        return get_or_compute(tenant_key("pipeline:totals"), compute_totals, timeout=300)
+"""
+
+import math
+import pickle  # noqa: S403
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Mapping
+from typing import Optional
+from typing import TypeVar
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.base import BaseCache
+from django.utils.functional import cached_property
+
+from olympus.core.tenancy import get_current_tenant
+
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+# The LRUs and their locks by shared cache alias, shared by the threads of the process like the
+# stores of Django's ``LocMemCache``.
+_local_caches: dict[str, OrderedDict[str, tuple[float, bytes]]] = {}
+_local_locks: dict[str, threading.Lock] = {}
+
+
+class TieredCache(BaseCache):
+    """Cache keeping the recently used values in the process in front of a shared cache.
+
+    ``LOCATION`` is the alias of the shared cache. The ``OPTIONS`` are ``LOCAL_MAX_ENTRIES``, the
+    size of the LRU of the process, and ``LOCAL_TIMEOUT``, the maximum number of seconds a value
+    is served from it.
+    """
+
+    def __init__(self, location: str, params: dict[str, Any]) -> None:
+        """Initialize the cache.
+
+        Args:
+            location: The alias of the shared cache.
+            params: The cache settings.
+        """
+        super().__init__(params)
+        options = params.get("OPTIONS", {})
+        self.location = location
+        self.local_max_entries = options.get("LOCAL_MAX_ENTRIES", 1024)
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 5)
+        self._local = _local_caches.setdefault(location, OrderedDict())
+        self._lock = _local_locks.setdefault(location, threading.Lock())
+
+    @cached_property
+    def shared(self) -> BaseCache:
+        """Return the shared cache.
+
+        Returns:
+            The cache of the ``LOCATION`` alias.
+        """
+        return caches[self.location]
+
+    def add(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> bool:
+        """Set a value only if the key does not exist yet.
+
+        Args:
+            key: The key.
+            value: The value.
+            timeout: The number of seconds before the value expires.
+            version: The key version.
+
+        Returns:
+            Whether the value was stored.
+        """
+        added = self.shared.add(key, value, timeout, version)
+        if added:
+            self._store(self.make_and_validate_key(key, version), value, timeout)
+        return bool(added)
+
+    def get(self, key: str, default: Any = None, version: Optional[int] = None) -> Any:
+        """Return a value, from the process if it is there.
+
+        Args:
+            key: The key.
+            default: The value of a missing key.
+            version: The key version.
+
+        Returns:
+            The value, ``default`` if the key is missing.
+        """
+        local_key = self.make_and_validate_key(key, version)
+        value = self._load(local_key)
+        if value is not _MISSING:
+            return value
+        value = self.shared.get(key, _MISSING, version)
+        if value is _MISSING:
+            return default
+        self._store(local_key, value, DEFAULT_TIMEOUT)
+        return value
+
+    def set(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> None:
+        """Store a value in the shared cache and in the process.
+
+        Args:
+            key: The key.
+            value: The value.
+            timeout: The number of seconds before the value expires.
+            version: The key version.
+        """
+        self.shared.set(key, value, timeout, version)
+        self._store(self.make_and_validate_key(key, version), value, timeout)
+
+    def touch(self, key: str, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> bool:
+        """Set a new expiration for a key of the shared cache.
+
+        Args:
+            key: The key.
+            timeout: The number of seconds before the value expires.
+            version: The key version.
+
+        Returns:
+            Whether the key exists.
+        """
+        return bool(self.shared.touch(key, timeout, version))
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        """Delete a key from the process and from the shared cache.
+
+        Args:
+            key: The key.
+            version: The key version.
+
+        Returns:
+            Whether the key existed in the shared cache.
+        """
+        self._discard([self.make_and_validate_key(key, version)])
+        return bool(self.shared.delete(key, version))
+
+    def get_many(self, keys: Iterable[str], version: Optional[int] = None) -> dict[str, Any]:
+        """Return the values of many keys, fetching the ones missing in the process at once.
+
+        Args:
+            keys: The keys.
+            version: The key version.
+
+        Returns:
+            The values of the existing keys.
+        """
+        found: dict[str, Any] = {}
+        missing: dict[str, str] = {}
+        for key in keys:
+            local_key = self.make_and_validate_key(key, version)
+            value = self._load(local_key)
+            if value is _MISSING:
+                missing[key] = local_key
+            else:
+                found[key] = value
+        if missing:
+            fetched = self.shared.get_many(missing, version)
+            for key, value in fetched.items():
+                self._store(missing[key], value, DEFAULT_TIMEOUT)
+            found.update(fetched)
+        return found
+
+    def set_many(
+        self, data: Mapping[str, Any], timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None
+    ) -> list[str]:
+        """Store many values at once.
+
+        Args:
+            data: The values by key.
+            timeout: The number of seconds before the values expire.
+            version: The key version.
+
+        Returns:
+            The keys that could not be stored.
+        """
+        failed = self.shared.set_many(data, timeout, version)
+        for key, value in data.items():
+            if key not in failed:
+                self._store(self.make_and_validate_key(key, version), value, timeout)
+        return failed
+
+    def delete_many(self, keys: Iterable[str], version: Optional[int] = None) -> None:
+        """Delete many keys at once.
+
+        Args:
+            keys: The keys.
+            version: The key version.
+        """
+        keys = list(keys)
+        self._discard([self.make_and_validate_key(key, version) for key in keys])
+        self.shared.delete_many(keys, version)
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        """Return whether a key exists.
+
+        Args:
+            key: The key.
+            version: The key version.
+
+        Returns:
+            Whether the key is in the process or in the shared cache.
+        """
+        if self._load(self.make_and_validate_key(key, version)) is not _MISSING:
+            return True
+        return bool(self.shared.has_key(key, version))
+
+    def incr(self, key: str, delta: int = 1, version: Optional[int] = None) -> int:
+        """Increment a value in the shared cache.
+
+        Args:
+            key: The key.
+            delta: The increment.
+            version: The key version.
+
+        Returns:
+            The new value.
+        """
+        self._discard([self.make_and_validate_key(key, version)])
+        return int(self.shared.incr(key, delta, version))
+
+    def clear(self) -> None:
+        """Remove every key from the process and from the shared cache."""
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def clear_local(self) -> None:
+        """Remove every key from the process only."""
+        with self._lock:
+            self._local.clear()
+
+    def _load(self, local_key: str) -> Any:
+        """Return a value of the process.
+
+        Args:
+            local_key: The full key.
+
+        Returns:
+            The value, ``_MISSING`` if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._local.get(local_key)
+            if entry is None:
+                return _MISSING
+            if entry[0] <= time.monotonic():
+                del self._local[local_key]
+                return _MISSING
+            self._local.move_to_end(local_key)
+        return pickle.loads(entry[1])  # noqa: S301
+
+    def _store(self, local_key: str, value: Any, timeout: Any) -> None:
+        """Keep a value in the process, evicting the least recently used ones.
+
+        Args:
+            local_key: The full key.
+            value: The value, pickled so that the callers do not share a mutable value.
+            timeout: The timeout of the value in the shared cache.
+        """
+        seconds = self.local_timeout
+        if timeout is not DEFAULT_TIMEOUT and timeout is not None:
+            seconds = min(seconds, timeout)
+        if seconds <= 0 or self.local_max_entries <= 0:
+            self._discard([local_key])
+            return
+        entry = (time.monotonic() + seconds, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        with self._lock:
+            self._local[local_key] = entry
+            self._local.move_to_end(local_key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def _discard(self, local_keys: list[str]) -> None:
+        """Remove keys from the process.
+
+        Args:
+            local_keys: The full keys.
+        """
+        with self._lock:
+            for local_key in local_keys:
+                self._local.pop(local_key, None)
+
+
+def tenant_key(key: str, tenant: Any = _MISSING) -> str:
+    """Namespace a cache key by tenant.
+
+    Args:
+        key: The key.
+        tenant: The tenant instance or primary key, the current tenant by default.
+
+    Returns:
+        The key prefixed with the tenant, or with ``-`` outside of a tenant context.
+    """
+    if tenant is _MISSING:
+        tenant = get_current_tenant()
+    if tenant is None:
+        return f"tenant:-:{key}"
+    return f"tenant:{getattr(tenant, 'pk', tenant)}:{key}"
+
+
+def get_many(keys: Iterable[str], cache: Optional[BaseCache] = None) -> dict[str, Any]:
+    """Return the values of many keys of the current tenant in a single round trip.
+
+    Args:
+        keys: The keys, without the tenant namespace.
+        cache: The cache, the default one by default.
+
+    Returns:
+        The values of the existing keys, by key without the tenant namespace.
+    """
+    cache = cache or caches["default"]
+    namespaced = {tenant_key(key): key for key in keys}
+    return {namespaced[key]: value for key, value in cache.get_many(namespaced).items()}
+
+
+def set_many(data: Mapping[str, Any], timeout: Any = DEFAULT_TIMEOUT, cache: Optional[BaseCache] = None) -> list[str]:
+    """Store many values of the current tenant in a single round trip.
+
+    Args:
+        data: The values by key, without the tenant namespace.
+        timeout: The number of seconds before the values expire.
+        cache: The cache, the default one by default.
+
+    Returns:
+        The keys, without the tenant namespace, that could not be stored.
+    """
+    cache = cache or caches["default"]
+    namespaced = {tenant_key(key): key for key in data}
+    failed = cache.set_many({key: data[original] for key, original in namespaced.items()}, timeout)
+    return [namespaced[key] for key in failed]
+
+
+def delete_many(keys: Iterable[str], cache: Optional[BaseCache] = None) -> None:
+    """Delete many keys of the current tenant in a single round trip.
+
+    Args:
+        keys: The keys, without the tenant namespace.
+        cache: The cache, the default one by default.
+    """
+    cache = cache or caches["default"]
+    cache.delete_many([tenant_key(key) for key in keys])
+
+
+# The threads of a process computing the same key wait for each other on one of these locks.
+_compute_locks = [threading.Lock() for _ in range(64)]
+
+
+def _expired(entry: tuple[Any, float, float], beta: float) -> bool:
+    """Return whether a value must be recomputed, possibly before it expires.
+
+    The probability grows as the expiry approaches and with the time the value took to compute
+    (XFetch), so one caller refreshes a hot key early instead of all of them at its expiry.
+
+    Args:
+        entry: The value, its computation time and its expiry timestamp.
+        beta: Above 1 favors earlier refreshes, 0 disables them.
+
+    Returns:
+        Whether to recompute the value.
+    """
+    _, delta, expires = entry
+    return time.time() - delta * beta * math.log(1.0 - random.random()) >= expires  # noqa: S311
+
+
+def get_or_compute(
+    key: str,
+    compute: Callable[[], T],
+    timeout: float = 300,
+    beta: float = 1.0,
+    lock_timeout: float = 10.0,
+    cache: Optional[BaseCache] = None,
+) -> T:
+    """Return a cached value, computing it once when it is missing or about to expire.
+
+    The value is refreshed early with a probability growing as it approaches its expiry. A
+    single caller computes it at a time: the threads of a process wait for it, the other
+    processes serve the previous value meanwhile, or wait for the new one up to ``lock_timeout``
+    seconds if there is none.
+
+    Args:
+        key: The key, namespace it with :func:`tenant_key` for the tenant data.
+        compute: Computes the value.
+        timeout: The number of seconds the value is valid.
+        beta: The eagerness of the early refreshes, 0 disables them.
+        lock_timeout: The maximum number of seconds of a computation.
+        cache: The cache, the default one by default.
+
+    Returns:
+        The value.
+    """
+    cache = cache or caches["default"]
+    entry = cache.get(key)
+    if entry is not None and not _expired(entry, beta):
+        return entry[0]  # type: ignore[no-any-return]
+
+    with _compute_locks[hash(key) % len(_compute_locks)]:
+        latest = cache.get(key)
+        if latest is not None and (entry is None or latest[2] != entry[2]) and not _expired(latest, 0):
+            return latest[0]  # type: ignore[no-any-return]
+        entry = latest
+
+        lock_key, token = f"{key}:lock", uuid.uuid4().hex
+        locked = cache.add(lock_key, token, lock_timeout)
+        if not locked:
+            if entry is not None:
+                return entry[0]  # type: ignore[no-any-return]
+            deadline = time.monotonic() + lock_timeout
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                entry = cache.get(key)
+                if entry is not None:
+                    return entry[0]  # type: ignore[no-any-return]
+        try:
+            started = time.time()
+            value = compute()
+            finished = time.time()
+            # Kept past its expiry, so the other processes serve it while it is recomputed.
+            cache.set(key, (value, finished - started, finished + timeout), timeout + lock_timeout)
+        finally:
+            # Only the own lock, the one of another process is left after a wait timed out or the
+            # computation outlived it. Read from the shared cache, the local copy is the own one.
+            if locked and (cache.shared if isinstance(cache, TieredCache) else cache).get(lock_key) == token:
+                cache.delete(lock_key)
+        return value
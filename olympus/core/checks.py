@@ -0,0 +1,100 @@
+"""System checks of the Olympus models."""
+
+from typing import Any
+
+from django.apps import apps
+from django.core.checks import CheckMessage
+from django.core.checks import Error
+from django.core.checks import Tags
+from django.core.checks import Warning
+from django.core.checks import register
+from django.db import models
+
+from olympus.core.behaviours import Tenantable
+from olympus.core.db.partitioning import nullable_partition_key
+
+
+TENANT_INDEXES = (("tenant", "id"), ("tenant", "created_at"))
+
+
+def _candidate_models(app_configs: Any) -> list[type[models.Model]]:
+    """Return the models to check.
+
+    Args:
+        app_configs: The app configs to check, all of them if ``None``.
+
+    Returns:
+        The models.
+    """
+    if app_configs is None:
+        return list(apps.get_models())
+    return [model for app_config in app_configs for model in app_config.get_models()]
+
+
+def missing_tenant_indexes(model: type[models.Model]) -> list[tuple[str, ...]]:
+    """Return the tenant composite indexes the model does not declare.
+
+    A tenant query that filters by the tenant and orders by the ``id`` or the ``created_at``
+    falls back to the single column foreign key index and a sort without them.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The field lists of the missing indexes.
+    """
+    field_names = {field.name for field in model._meta.get_fields()}
+    declared = {tuple(index.fields[:2]) for index in model._meta.indexes}
+    return [fields for fields in TENANT_INDEXES if set(fields) <= field_names and fields not in declared]
+
+
+@register(Tags.models)
+def check_tenant_indexes(app_configs: Any = None, **kwargs: Any) -> list[CheckMessage]:
+    """Flag the tenant models whose tenant queries would not use a composite index.
+
+    Args:
+        app_configs: The app configs to check, all of them if ``None``.
+        **kwargs: The keyword arguments.
+
+    Returns:
+        The list of warnings.
+    """
+    return [
+        Warning(
+            f"{model._meta.label} has no ({', '.join(fields)}) index, its tenant queries will sort.",
+            hint="Add olympus.core.db.models.tenant_indexes() to Meta.indexes.",
+            obj=model,
+            id="olympus.W001",
+        )
+        for model in _candidate_models(app_configs)
+        if issubclass(model, Tenantable)
+        for fields in missing_tenant_indexes(model)
+    ]
+
+
+@register(Tags.models)
+def check_partition_keys(app_configs: Any = None, **kwargs: Any) -> list[CheckMessage]:
+    """Flag the partitioned models whose partition key is nullable.
+
+    Args:
+        app_configs: The app configs to check, all of them if ``None``.
+        **kwargs: The keyword arguments.
+
+    Returns:
+        The list of errors.
+    """
+    errors: list[CheckMessage] = []
+    for model in _candidate_models(app_configs):
+        partitioning = getattr(model, "partitioning", None)
+        key = nullable_partition_key(model, partitioning) if partitioning is not None else None
+        if key is not None:
+            errors.append(
+                Error(
+                    f"{model._meta.label} is partitioned by the nullable {key.name!r}, "
+                    "the partition key joins the primary key.",
+                    hint=f"Redeclare {key.name!r} with null=False and an on_delete other than SET_NULL.",
+                    obj=model,
+                    id="olympus.E001",
+                )
+            )
+    return errors
@@ -0,0 +1,91 @@
+"""Correlation ID of the current request or task.
+
+The ID is kept in a context variable like the tenant, it is added to every log record, sent
+with the Celery tasks enqueued by the request and restored in the workers, so the logs of a
+request and of all the tasks it triggered share the same ``request_id``.
+"""
+
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from contextvars import Token
+from typing import Iterator
+from typing import Optional
+
+from olympus.core.db.ulids import ulid_generator
+
+
+REQUEST_ID_HEADER = "X-Request-ID"
+REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+_current_request_id: ContextVar[Optional[str]] = ContextVar("olympus_current_request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    """Return the correlation ID of the current request or task.
+
+    Returns:
+        The ID, ``None`` outside of a request or a task.
+    """
+    return _current_request_id.get()
+
+
+def new_request_id() -> str:
+    """Generate a correlation ID.
+
+    Returns:
+        A ULID, so the IDs sort by the start of the requests.
+    """
+    return str(ulid_generator())
+
+
+def clean_request_id(value: Optional[str]) -> Optional[str]:
+    """Validate a correlation ID received from a client or a proxy.
+
+    Args:
+        value: The received value.
+
+    Returns:
+        The ID, ``None`` if it is missing or could forge the log lines.
+    """
+    if value and REQUEST_ID_PATTERN.fullmatch(value):
+        return value
+    return None
+
+
+def set_request_id(request_id: Optional[str]) -> Token[Optional[str]]:
+    """Activate the correlation ID until the token is reset.
+
+    Args:
+        request_id: The ID.
+
+    Returns:
+        The token restoring the previous ID.
+    """
+    return _current_request_id.set(request_id)
+
+
+def reset_request_id(token: Token[Optional[str]]) -> None:
+    """Restore the correlation ID active before :func:`set_request_id`.
+
+    Args:
+        token: The token returned by :func:`set_request_id`.
+    """
+    _current_request_id.reset(token)
+
+
+@contextmanager
+def request_id_context(request_id: Optional[str]) -> Iterator[None]:
+    """Activate the correlation ID for the duration of the context.
+
+    Args:
+        request_id: The ID.
+
+    Yields:
+        Nothing, the ID is active while the context is.
+    """
+    token = set_request_id(request_id)
+    try:
+        yield
+    finally:
+        reset_request_id(token)
@@ -0,0 +1 @@
+"""PostgreSQL backend with an optional in-process connection pool."""
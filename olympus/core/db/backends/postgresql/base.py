@@ -0,0 +1,85 @@
+"""PostgreSQL database wrapper taking its connections from a pool.
+
+Pooling is enabled per database with ``OPTIONS["pool"]``, the keyword arguments of
+:class:`~olympus.core.db.pool.ConnectionPool`, like the ``pool`` option of Django 5.1. Without it
+the backend is the stock one.
+"""
+
+from functools import partial
+from typing import Any
+from typing import Optional
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from olympus.core.db.pool import ConnectionPool
+from olympus.core.db.pool import get_pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL database wrapper with an optional connection pool."""
+
+    def __init__(self, settings_dict: dict[str, Any], alias: str = "default") -> None:
+        """Initialize the wrapper.
+
+        Args:
+            settings_dict: The settings of the database.
+            alias: The database alias.
+
+        Raises:
+            ImproperlyConfigured: If pooling is combined with persistent connections.
+        """
+        super().__init__(settings_dict, alias)
+        if self.settings_dict["OPTIONS"].get("pool") and self.settings_dict["CONN_MAX_AGE"]:
+            raise ImproperlyConfigured("Pooled connections require CONN_MAX_AGE = 0.")
+
+    @property
+    def pool(self) -> Optional[ConnectionPool]:
+        """Return the connection pool of the database in the current process.
+
+        Returns:
+            The pool, ``None`` if pooling is disabled.
+        """
+        options = self.settings_dict["OPTIONS"].get("pool")
+        if not options:
+            return None
+        return get_pool(self.alias, {} if options is True else options)
+
+    def get_connection_params(self) -> dict[str, Any]:
+        """Return the parameters of ``psycopg2.connect()``.
+
+        Returns:
+            The parameters, without the pool options.
+        """
+        params = super().get_connection_params()
+        params.pop("pool", None)
+        return params
+
+    def get_new_connection(self, conn_params: dict[str, Any]) -> Any:
+        """Take a connection from the pool, or open one without pooling.
+
+        Args:
+            conn_params: The parameters of ``psycopg2.connect()``.
+
+        Returns:
+            The connection.
+        """
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        connection = pool.getconn(partial(super().get_new_connection, conn_params))
+        # The parent sets the isolation level of the wrapper only for a new connection.
+        self.isolation_level = IsolationLevel(
+            self.settings_dict["OPTIONS"].get("isolation_level", IsolationLevel.READ_COMMITTED)
+        )
+        return connection
+
+    def _close(self) -> None:
+        """Give the connection back to the pool, or close it without pooling."""
+        pool = self.pool
+        if pool is None or self.connection is None:
+            super()._close()
+            return
+        with self.wrap_database_errors:
+            pool.putconn(self.connection)
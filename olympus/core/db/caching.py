@@ -0,0 +1,226 @@
+"""Read-through cache of model instances by primary key.
+
+A model opts in with a ``cached`` manager::
+
+    class Pipeline(CRMBaseModel):
+        cached = CachedCRMManager()
+
+    pipeline = Pipeline.cached.get(pipeline_id)
+    pipelines = Pipeline.cached.get_many(pipeline_ids)
+
+The instances are cached by ULID in the ``MODEL_CACHE_ALIAS`` cache with their ``updated_at``.
+A save or a delete replaces the entry with a tombstone carrying the new ``updated_at``, so a
+concurrent read that fetched the previous row, or a lagging replica, cannot put it back: a row
+is cached over a tombstone only if it is at least as recent. The bulk updates of the
+``CRMQuerySet`` leave a tombstone without a version, nothing is cached for the key until it
+expires. With the two-tier default cache, the other processes may serve their local copy for
+up to ``CACHE_LOCAL_TIMEOUT`` seconds after a change.
+"""
+
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.db import models
+from django.db import transaction
+from django.utils.functional import cached_property
+
+from olympus.core.tenancy import get_current_tenant
+
+
+# A tombstone is kept long enough to outlive the reads that started before the change.
+TOMBSTONE_TIMEOUT = 30
+
+
+class ModelCache:
+    """Cache of the instances of a model, with its hit and miss counters."""
+
+    def __init__(self, model: type[models.Model]) -> None:
+        """Initialize the cache.
+
+        Args:
+            model: The model.
+        """
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @cached_property
+    def prefix(self) -> str:
+        """Return the prefix of the keys, computed once the model class is complete.
+
+        Returns:
+            The model label and a hash of its fields, so a deploy changing them does not load stale instances.
+        """
+        opts = self.model._meta
+        fields = ",".join(field.attname for field in opts.concrete_fields)
+        return f"model:{opts.label_lower}:{hashlib.md5(fields.encode(), usedforsecurity=False).hexdigest()[:8]}"
+
+    @property
+    def cache(self) -> BaseCache:
+        """Return the cache storing the instances.
+
+        Returns:
+            The ``MODEL_CACHE_ALIAS`` cache.
+        """
+        return caches[settings.MODEL_CACHE_ALIAS]
+
+    def key(self, pk: Any) -> str:
+        """Return the cache key of an instance.
+
+        Args:
+            pk: The primary key.
+
+        Returns:
+            The key.
+        """
+        return f"{self.prefix}:{pk}"
+
+    def get_many(self, pks: Iterable[Any]) -> dict[Any, models.Model]:
+        """Return the instances of the primary keys, fetching the missing ones with a single query.
+
+        Args:
+            pks: The primary keys.
+
+        Returns:
+            The existing instances by primary key, normalized by the primary key field.
+        """
+        pk_field = self.model._meta.pk
+        keys = {self.key(pk): pk for pk in {pk_field.to_python(pk) for pk in pks}}
+        cache = self.cache
+        entries = cache.get_many(keys)
+        found = {keys[key]: entry[1] for key, entry in entries.items() if entry[1] is not None}
+        missing = {pk: key for key, pk in keys.items() if pk not in found}
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(missing)
+        if missing:
+            fetched = self.model._base_manager.filter(pk__in=list(missing))
+            for obj in fetched:
+                found[obj.pk] = obj
+                self._fill(cache, missing[obj.pk], obj, entries.get(missing[obj.pk]))
+        return found
+
+    def invalidate(self, pks: Iterable[Any], version: Optional[datetime] = None, using: Optional[str] = None) -> None:
+        """Replace the cached instances with tombstones, again once the transaction commits.
+
+        Args:
+            pks: The primary keys.
+            version: The ``updated_at`` of the change, ``None`` to cache nothing until the tombstones expire.
+            using: The database alias of the change.
+        """
+        tombstones = {self.key(pk): (version, None) for pk in pks}
+        if not tombstones:
+            return
+        self.cache.set_many(tombstones, TOMBSTONE_TIMEOUT)
+        transaction.on_commit(lambda: self.cache.set_many(tombstones, TOMBSTONE_TIMEOUT), using=using)
+
+    def stats(self) -> dict[str, int | float]:
+        """Return the hit and miss counters of the process.
+
+        Returns:
+            The hits, the misses and the hit ratio.
+        """
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / (hits + misses), 4) if hits or misses else 0.0,
+        }
+
+    def _fill(self, cache: BaseCache, key: str, obj: models.Model, entry: Optional[tuple[Any, Any]]) -> None:
+        """Cache a fetched instance unless a more recent change left a tombstone.
+
+        Args:
+            cache: The cache.
+            key: The key of the instance.
+            obj: The instance.
+            entry: The tombstone read before the fetch, if any.
+        """
+        version = getattr(obj, "updated_at", None)
+        timeout = settings.MODEL_CACHE_TIMEOUT
+        if entry is None:
+            # Does not overwrite a tombstone left by a change since the read.
+            cache.add(key, (version, obj), timeout)
+        elif entry[0] is not None and version is not None and version >= entry[0]:
+            cache.set(key, (version, obj), timeout)
+
+
+_model_caches: dict[type[models.Model], ModelCache] = {}
+
+
+def model_cache(model: type[models.Model]) -> Optional[ModelCache]:
+    """Return the cache of a model.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The cache, ``None`` if the model did not opt in.
+    """
+    return _model_caches.get(model)
+
+
+def model_cache_stats() -> dict[str, dict[str, int | float]]:
+    """Return the hit and miss counters of every cached model in the process.
+
+    Returns:
+        The counters by model label.
+    """
+    return {model._meta.label: cache.stats() for model, cache in _model_caches.items()}
+
+
+def _invalidate_instance(sender: type[models.Model], instance: models.Model, using: str, **kwargs: Any) -> None:
+    """Invalidate the cached instance after a save or a delete.
+
+    Args:
+        sender: The model.
+        instance: The saved or deleted instance.
+        using: The database alias.
+        **kwargs: The signal arguments.
+    """
+    cache = model_cache(sender)
+    if cache is not None:
+        cache.invalidate([instance.pk], getattr(instance, "updated_at", None), using=using)
+
+
+def register_model_cache(model: type[models.Model]) -> ModelCache:
+    """Create the cache of a model and invalidate it on its saves and deletes.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The cache.
+    """
+    cache = _model_caches.get(model)
+    if cache is None:
+        cache = _model_caches[model] = ModelCache(model)
+        uid = f"olympus.model_cache.{model._meta.label_lower}"
+        models.signals.post_save.connect(_invalidate_instance, sender=model, dispatch_uid=uid)
+        models.signals.post_delete.connect(_invalidate_instance, sender=model, dispatch_uid=uid)
+    return cache
+
+
+def in_current_tenant(obj: models.Model) -> bool:
+    """Return whether the instance belongs to the current tenant.
+
+    Args:
+        obj: The instance.
+
+    Returns:
+        ``True`` outside of a tenant context or if the tenants match.
+    """
+    tenant = get_current_tenant()
+    if tenant is None:
+        return True
+    attname = obj._meta.get_field("tenant").attname
+    return bool(getattr(obj, attname) == getattr(tenant, "pk", tenant))
@@ -1,13 +1,22 @@
+import uuid
 from typing import Any
 from typing import Optional
 from typing import Sequence
 from typing import cast
 
+from django.conf import settings
 from django.db import models
 from ulid import ULID
 
+from olympus.core.db.lookups import ULIDAfterTime
+from olympus.core.db.lookups import ULIDBeforeTime
+from olympus.core.db.ulids import LazyULID
+from olympus.core.db.ulids import cached_decoder
+from olympus.core.db.ulids import decode
+from olympus.core.db.ulids import ulid_generator
 
-class ULIDField(models.CharField[Any, Any]):
+
+class ULIDField(models.CharField):  # type: ignore[type-arg]
     """
     A field that stores ULIDs (Universally Unique Lexicographically Sortable Identifiers).
 
@@ -16,11 +25,31 @@ class ULIDField(models.CharField[Any, Any]):
     """
 
     description = "Universally Unique Lexicographically Sortable Identifier"
+    empty_strings_allowed = False
 
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        *args: Any,
+        lazy: Optional[bool] = None,
+        decode_cache_size: Optional[int] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the field.
+
+        Args:
+            *args: The arguments.
+            lazy: Load the values as :class:`LazyULID`, defaults to ``settings.ULID_LAZY_DECODE``.
+            decode_cache_size: Size of the LRU cache used to decode the foreign key values pointing at
+                this field, defaults to ``settings.ULID_DECODE_CACHE_SIZE``. ``0`` disables the cache.
+            **kwargs: The keyword arguments.
+        """
         kwargs.setdefault("max_length", 26)
         kwargs.setdefault("editable", False)
         super().__init__(*args, **kwargs)
+        self.lazy = settings.ULID_LAZY_DECODE if lazy is None else lazy
+        if decode_cache_size is None:
+            decode_cache_size = settings.ULID_DECODE_CACHE_SIZE
+        self.decode_cache = cached_decoder(decode_cache_size) if decode_cache_size else None
 
     def get_prep_value(self, value: Any) -> Optional[str]:
         """Convert the value to a string before saving to the database.
@@ -50,7 +79,12 @@ class ULIDField(models.CharField[Any, Any]):
         """
         if value is None:
             return None
-        return cast(ULID, ULID.from_str(value))
+        if self.decode_cache is not None and getattr(expression, "target", self) is not self:
+            # Foreign key column, the same values repeat across the rows.
+            return self.decode_cache(value)
+        if self.lazy:
+            return LazyULID(value)
+        return decode(value)
 
     def to_python(self, value: Any) -> Optional[ULID]:
         """Convert the value to a ULID object.
@@ -87,11 +121,16 @@ class ULIDField(models.CharField[Any, Any]):
         return name, path, args, kwargs
 
 
+ULIDField.register_lookup(ULIDAfterTime)
+ULIDField.register_lookup(ULIDBeforeTime)
+
+
 class ULIDPrimaryKeyField(ULIDField):
     """
     A primary key field that uses ULIDs.
 
-    This field automatically generates a ULID when a new object is created.
+    This field automatically generates a ULID when a new object without one is saved,
+    IDs assigned by the caller are kept.
     """
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -105,7 +144,7 @@ class ULIDPrimaryKeyField(ULIDField):
         super().__init__(*args, **kwargs)
 
     def pre_save(self, model_instance: models.Model, add: bool) -> ULID:
-        """Generate a new ULID if this is a new object.
+        """Generate a new ULID if the object has none yet.
 
         Args:
             model_instance: The model instance.
@@ -115,8 +154,8 @@ class ULIDPrimaryKeyField(ULIDField):
             The ULID.
         """
         value = getattr(model_instance, self.attname)
-        if value is None or add:
-            value = ULID()
+        if not value:
+            value = ulid_generator()
             setattr(model_instance, self.attname, value)
         return cast(ULID, value)
 
@@ -130,3 +169,104 @@ class ULIDPrimaryKeyField(ULIDField):
         if kwargs.get("primary_key") is True:
             del kwargs["primary_key"]
         return name, path, args, kwargs
+
+
+class BinaryULIDField(ULIDField):
+    """
+    A field that stores ULIDs as 16 raw bytes instead of a 26 chars string.
+
+    PostgreSQL keeps the value in a native ``uuid`` column, other backends use ``BINARY(16)``.
+    Both compare the value byte by byte, so the ordering of the ULIDs is preserved.
+    """
+
+    description = "Universally Unique Lexicographically Sortable Identifier (binary)"
+
+    def db_type(self, connection: Any) -> str:
+        """Return the database column type of the field.
+
+        Args:
+            connection: The connection.
+
+        Returns:
+            The database column type.
+        """
+        if connection.vendor == "postgresql":
+            return "uuid"
+        return "binary(16)"
+
+    def get_prep_value(self, value: Any) -> Optional[ULID]:  # type: ignore[override]
+        """Convert the value to a ULID object before saving to the database.
+
+        Args:
+            value: The value to convert.
+
+        Returns:
+            The ULID object.
+        """
+        return self.to_python(value)
+
+    def get_db_prep_value(self, value: Any, connection: Any, prepared: bool = False) -> Any:
+        """Convert the value to the backend specific binary representation.
+
+        Args:
+            value: The value to convert.
+            connection: The connection.
+            prepared: Whether the value is already prepared.
+
+        Returns:
+            The UUID object for PostgreSQL, raw bytes otherwise.
+        """
+        if not prepared:
+            value = self.get_prep_value(value)
+        if value is None:
+            return None
+        if connection.vendor == "postgresql":
+            return value.to_uuid()
+        return value.bytes
+
+    def from_db_value(self, value: Any, expression: Any, connection: Any) -> Optional[ULID]:  # noqa
+        """Convert the database value to a ULID object.
+
+        Args:
+            value: The value to convert.
+            expression: The expression.
+            connection: The connection.
+
+        Returns:
+            The ULID object.
+        """
+        return self.to_python(value)
+
+    def to_python(self, value: Any) -> Optional[ULID]:
+        """Convert the value to a ULID object.
+
+        Args:
+            value: The value to convert.
+
+        Returns:
+            The ULID object.
+        """
+        if value is None or isinstance(value, ULID):
+            return value
+        if isinstance(value, uuid.UUID):
+            return cast(ULID, ULID.from_uuid(value))
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return cast(ULID, ULID.from_bytes(bytes(value)))
+        return cast(ULID, ULID.from_str(str(value)))
+
+    def get_internal_type(self) -> str:
+        """Return the internal type of the field.
+
+        Returns:
+            The internal type of the field.
+        """
+        return "BinaryULIDField"
+
+
+class BinaryULIDPrimaryKeyField(ULIDPrimaryKeyField, BinaryULIDField):
+    """
+    A primary key field that uses ULIDs stored as 16 raw bytes.
+
+    This field automatically generates a ULID when a new object without one is saved,
+    IDs assigned by the caller are kept.
+    """
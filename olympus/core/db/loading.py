@@ -0,0 +1,227 @@
+"""Streaming bulk loading of the CRM tables with PostgreSQL ``COPY``.
+
+The rows are converted to the ``COPY`` text format while PostgreSQL reads them, ``chunk_size``
+rows at a time, so arbitrarily large imports run in constant memory and a single statement.
+"""
+
+import itertools
+import time
+from datetime import date
+from datetime import time as dt_time
+from typing import Any
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db import NotSupportedError
+from django.db import connections
+from django.db import models
+from django.db import transaction
+from django.utils import timezone
+
+from olympus.core.db.caching import model_cache
+from olympus.core.db.managers import upsert_sql
+from olympus.core.db.ulids import ulid_generator
+
+
+COPY_NULL = "\\N"
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+class LoadResult(NamedTuple):
+    """The outcome of a bulk load."""
+
+    rows: int
+    inserted: int
+    updated: int
+    seconds: float
+
+    @property
+    def rate(self) -> float:
+        """Return the throughput of the load.
+
+        Returns:
+            The number of rows per second.
+        """
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def copy_value(value: Any) -> str:
+    """Render a database value in the ``COPY`` text format.
+
+    Args:
+        value: The value prepared by ``Field.get_db_prep_save``.
+
+    Returns:
+        The escaped text.
+    """
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (date, dt_time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, memoryview)):
+        return f"\\\\x{bytes(value).hex()}"
+    if hasattr(value, "adapted"):
+        # psycopg2 ``Json`` adapter of the JSON fields.
+        value = value.dumps(value.adapted)
+    return str(value).translate(COPY_ESCAPES)
+
+
+class _CopyStream:
+    """File-like object that renders the next chunk of rows on every read."""
+
+    def __init__(self, chunks: Iterator[str]) -> None:
+        """Initialize the stream.
+
+        Args:
+            chunks: The chunks of ``COPY`` lines.
+        """
+        self._chunks = chunks
+
+    def read(self, size: int = -1) -> str:
+        """Return the next chunk, psycopg2 sends it as is whatever its size.
+
+        Args:
+            size: The size hint of psycopg2, ignored.
+
+        Returns:
+            The chunk, an empty string at the end.
+        """
+        return next(self._chunks, "")
+
+
+def _field_value(field: "models.Field[Any, Any]", row: Mapping[str, Any] | models.Model, fallback: Any) -> Any:
+    """Return the Python value of the field in the row.
+
+    Args:
+        field: The concrete field.
+        row: The dict keyed by field name or attname, or the model instance.
+        fallback: The value used instead of an empty one.
+
+    Returns:
+        The value, ``None`` if it is empty and there is no fallback.
+    """
+    if isinstance(row, models.Model):
+        value = getattr(row, field.attname)
+    elif field.attname in row or field.name in row:
+        value = row.get(field.attname, row.get(field.name))
+    else:
+        value = field.get_default()
+    if value is None or (value == "" and not field.empty_strings_allowed):
+        return fallback
+    return value if isinstance(row, models.Model) else field.to_python(value)
+
+
+def _copy_chunks(
+    model: type[models.Model],
+    rows: Iterable[Mapping[str, Any] | models.Model],
+    connection: Any,
+    chunk_size: int,
+    counter: list[int],
+) -> Iterator[str]:
+    """Serialize the rows into chunks of ``COPY`` lines.
+
+    Args:
+        model: The model.
+        rows: The dicts keyed by field name or attname, or the model instances.
+        connection: The connection.
+        chunk_size: The number of rows per chunk.
+        counter: The single item list incremented with the number of serialized rows.
+
+    Yields:
+        The chunks.
+    """
+    fields = model._meta.concrete_fields
+    timestamps = {
+        field for field in fields if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+    }
+    pk_index = fields.index(model._meta.pk)
+    rows = iter(rows)
+    while chunk := list(itertools.islice(rows, chunk_size)):
+        now = timezone.now()
+        values = [[_field_value(field, row, now if field in timestamps else None) for field in fields] for row in chunk]
+        missing = [row for row in values if row[pk_index] is None]
+        for row, value in zip(missing, ulid_generator.batch(len(missing)), strict=True):
+            row[pk_index] = value
+        lines = (
+            "\t".join(
+                copy_value(field.get_db_prep_save(value, connection)) for field, value in zip(fields, row, strict=True)
+            )
+            for row in values
+        )
+        counter[0] += len(chunk)
+        yield "".join(f"{line}\n" for line in lines)
+
+
+def bulk_load(
+    model: type[models.Model],
+    rows: Iterable[Mapping[str, Any] | models.Model],
+    chunk_size: int = 10_000,
+    merge_on: Optional[Sequence[str]] = None,
+    update_fields: Optional[Sequence[str]] = None,
+    using: str = DEFAULT_DB_ALIAS,
+) -> LoadResult:
+    """Load the rows into the table of the model with a single streamed ``COPY``.
+
+    Missing primary keys get monotonic ULIDs and empty ``auto_now``/``auto_now_add`` fields the
+    load time. Without ``merge_on`` the rows are copied straight into the table and any conflict
+    aborts the load. With ``merge_on`` they are copied into a temporary staging table first and
+    then upserted like :meth:`~olympus.core.db.managers.CRMQuerySet.bulk_upsert` does, on these
+    unique fields, invalidating the cached instances of the updated rows. Everything runs in one
+    transaction.
+
+    Args:
+        model: The model.
+        rows: The dicts keyed by field name or attname, or the model instances.
+        chunk_size: The number of rows serialized at a time.
+        merge_on: The unique fields to upsert on through a staging table.
+        update_fields: The fields overwritten on the existing rows when merging, all by default.
+        using: The database alias.
+
+    Returns:
+        The number of loaded, inserted and updated rows and the duration.
+
+    Raises:
+        NotSupportedError: If the database is not PostgreSQL.
+    """
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        raise NotSupportedError("bulk_load is supported on PostgreSQL only.")
+
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    columns = ", ".join(quote(field.column) for field in model._meta.concrete_fields)
+    counter = [0]
+    stream = _CopyStream(_copy_chunks(model, rows, connection, chunk_size, counter))
+
+    started = time.perf_counter()
+    with transaction.atomic(using=using, savepoint=False), connection.cursor() as cursor:
+        if merge_on is None:
+            cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN", stream)
+            inserted, updated = counter[0], 0
+        else:
+            staging = quote(f"{model._meta.db_table}_staging")
+            cursor.execute(f"CREATE TEMPORARY TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+            cursor.copy_expert(f"COPY {staging} ({columns}) FROM STDIN", stream)
+            pk = model._meta.pk
+            cursor.execute(
+                f"WITH merged AS ({upsert_sql(model, connection, merge_on, update_fields, source=staging)}) "  # noqa: S608
+                "SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted), "
+                f"array_agg({quote(pk.column)}) FILTER (WHERE NOT inserted) FROM merged"
+            )
+            inserted, updated, updated_pks = cursor.fetchone()
+            cursor.execute(f"DROP TABLE {staging}")
+            cache = model_cache(model)
+            if cache is not None and updated_pks:
+                from_db_value = getattr(pk, "from_db_value", None)
+                cache.invalidate(
+                    [from_db_value(value, None, connection) if from_db_value else value for value in updated_pks],
+                    using=using,
+                )
+    return LoadResult(counter[0], inserted, updated, time.perf_counter() - started)
@@ -0,0 +1,65 @@
+"""Custom lookups for the ULID fields.
+
+The timestamp is the prefix of a ULID, so a time window translates into a range scan
+over the primary key index instead of a scan of a ``created_at`` index.
+"""
+
+from typing import Any
+
+from django.db.models import lookups
+
+from olympus.core.db.ulids import ulid_floor
+
+
+class ULIDAfterTime(lookups.GreaterThanOrEqual):
+    """Match the ULIDs generated at the given datetime or later: ``id__after_time=datetime``."""
+
+    lookup_name = "after_time"
+
+    def get_prep_lookup(self) -> Any:
+        """Translate the datetime into the lower bound ULID.
+
+        Returns:
+            The prepared right hand side.
+        """
+        self.rhs = ulid_floor(self.rhs)
+        return super().get_prep_lookup()
+
+    def get_rhs_op(self, connection: Any, rhs: str) -> str:
+        """Use the ``>=`` operator of the backend.
+
+        Args:
+            connection: The connection.
+            rhs: The right hand side SQL.
+
+        Returns:
+            The operator SQL.
+        """
+        return str(connection.operators["gte"] % rhs)
+
+
+class ULIDBeforeTime(lookups.LessThan):
+    """Match the ULIDs generated before the given datetime: ``id__before_time=datetime``."""
+
+    lookup_name = "before_time"
+
+    def get_prep_lookup(self) -> Any:
+        """Translate the datetime into the upper bound ULID.
+
+        Returns:
+            The prepared right hand side.
+        """
+        self.rhs = ulid_floor(self.rhs)
+        return super().get_prep_lookup()
+
+    def get_rhs_op(self, connection: Any, rhs: str) -> str:
+        """Use the ``<`` operator of the backend.
+
+        Args:
+            connection: The connection.
+            rhs: The right hand side SQL.
+
+        Returns:
+            The operator SQL.
+        """
+        return str(connection.operators["lt"] % rhs)
@@ -0,0 +1,434 @@
+"""Olympus Base Managers and QuerySets."""
+
+import inspect
+from datetime import datetime
+from typing import Any
+from typing import Iterable
+from typing import NamedTuple
+from typing import Optional
+from typing import Sequence
+
+from django.db import NotSupportedError
+from django.db import connections
+from django.db import models
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from olympus.core.db.caching import in_current_tenant
+from olympus.core.db.caching import model_cache
+from olympus.core.db.caching import register_model_cache
+from olympus.core.db.ulids import ulid_generator
+from olympus.core.tenancy import get_current_tenant
+
+
+class ULIDQuerySet(models.QuerySet):  # type: ignore[type-arg]
+    """QuerySet for models with a ULID primary key."""
+
+    def bulk_create(self, objs: Iterable[models.Model], *args: Any, **kwargs: Any) -> list[models.Model]:
+        """Fill the missing primary keys of the whole batch in one pass, then insert it.
+
+        The generated IDs are strictly increasing in the order of ``objs``. Objects that already
+        have a primary key keep it, which allows idempotent upserts with caller supplied IDs.
+
+        Args:
+            objs: The objects to create.
+            *args: The arguments of ``QuerySet.bulk_create``.
+            **kwargs: The keyword arguments of ``QuerySet.bulk_create``.
+
+        Returns:
+            The created objects.
+        """
+        return super().bulk_create(self._fill_primary_keys(objs), *args, **kwargs)
+
+    def _fill_primary_keys(self, objs: Iterable[models.Model]) -> list[models.Model]:
+        """Assign increasing ULIDs to the objects without a primary key.
+
+        Args:
+            objs: The objects.
+
+        Returns:
+            The list of the objects.
+        """
+        objs = list(objs)
+        attname = self.model._meta.pk.attname
+        missing = [obj for obj in objs if not getattr(obj, attname)]
+        if missing:
+            for obj, value in zip(missing, ulid_generator.batch(len(missing)), strict=True):
+                setattr(obj, attname, value)
+        return objs
+
+    def created_after(self, value: datetime) -> "ULIDQuerySet":
+        """Filter the objects created at the datetime or later, using the primary key index.
+
+        Args:
+            value: The datetime.
+
+        Returns:
+            The filtered queryset.
+        """
+        return self.filter(pk__after_time=value)
+
+    def created_before(self, value: datetime) -> "ULIDQuerySet":
+        """Filter the objects created before the datetime, using the primary key index.
+
+        Args:
+            value: The datetime.
+
+        Returns:
+            The filtered queryset.
+        """
+        return self.filter(pk__before_time=value)
+
+    def created_between(self, start: datetime, end: datetime) -> "ULIDQuerySet":
+        """Filter the objects created in the ``[start, end)`` window, using the primary key index.
+
+        The creation time is the one embedded in the ULID, with millisecond precision.
+
+        Args:
+            start: The start of the window, inclusive.
+            end: The end of the window, exclusive.
+
+        Returns:
+            The filtered queryset.
+        """
+        return self.filter(pk__after_time=start, pk__before_time=end)
+
+
+class TenantQuerySet(models.QuerySet):  # type: ignore[type-arg]
+    """QuerySet for models with a tenant."""
+
+    def for_tenant(self, tenant: Any) -> "TenantQuerySet":
+        """Filter the objects of the tenant.
+
+        Args:
+            tenant: The tenant instance or primary key.
+
+        Returns:
+            The filtered queryset.
+        """
+        return self.filter(tenant=tenant)
+
+
+def auto_now_add_fields(model: type[models.Model]) -> list["models.Field[Any, Any]"]:
+    """Return the ``auto_now_add`` fields of the model.
+
+    Args:
+        model: The model.
+
+    Returns:
+        The fields, in the order of the concrete fields.
+    """
+    return [field for field in model._meta.concrete_fields if getattr(field, "auto_now_add", False)]
+
+
+def upsert_sql(
+    model: type[models.Model],
+    connection: Any,
+    unique_fields: Sequence[str],
+    update_fields: Optional[Sequence[str]] = None,
+    source: Optional[str] = None,
+) -> str:
+    """Build the ``INSERT ... ON CONFLICT DO UPDATE`` statement of the model.
+
+    The statement returns the primary key, the ``auto_now_add`` columns and the ``inserted`` flag
+    of every row. On conflict the ``auto_now_add`` fields are never overwritten, the returned values
+    are the ones kept by the existing rows, and the ``auto_now`` fields are always overwritten, even
+    when missing from ``update_fields``.
+
+    Args:
+        model: The model.
+        connection: The connection.
+        unique_fields: The conflict target fields.
+        update_fields: The fields overwritten on conflict, all the other ones by default.
+        source: The quoted name of the table to insert the rows from, ``VALUES {rows}`` if ``None``.
+
+    Returns:
+        The statement.
+    """
+    opts = model._meta
+    quote = connection.ops.quote_name
+    if update_fields is None:
+        update_fields = [
+            field.name
+            for field in opts.concrete_fields
+            if not field.primary_key and field.name not in unique_fields and not getattr(field, "auto_now_add", False)
+        ]
+    update_fields = [
+        *update_fields,
+        *(
+            field.name
+            for field in opts.concrete_fields
+            if getattr(field, "auto_now", False) and field.name not in update_fields
+        ),
+    ]
+    table, pk = quote(opts.db_table), quote(opts.pk.column)
+    returning = ", ".join([pk, *(quote(field.column) for field in auto_now_add_fields(model))])
+    columns = ", ".join(quote(field.column) for field in opts.concrete_fields)
+    conflict = ", ".join(quote(opts.get_field(name).column) for name in unique_fields)
+    updates = ", ".join(
+        f"{quote(column)} = EXCLUDED.{quote(column)}"
+        for column in (opts.get_field(name).column for name in update_fields)
+    )
+    # A no-op assignment keeps ``DO UPDATE``, so the conflicting rows are returned as well.
+    updates = updates or f"{pk} = {table}.{pk}"
+    rows = "VALUES {rows}" if source is None else f"SELECT {columns} FROM {source}"  # noqa: S608
+    return (
+        f"INSERT INTO {table} ({columns}) {rows} "  # noqa: S608
+        f"ON CONFLICT ({conflict}) DO UPDATE SET {updates} RETURNING {returning}, xmax = 0 AS inserted"
+    )
+
+
+BULK_CREATE_SIGNATURE = inspect.signature(models.QuerySet.bulk_create)
+
+
+class UpsertResult(NamedTuple):
+    """The objects of a bulk upsert, split by the performed operation."""
+
+    inserted: list[models.Model]
+    updated: list[models.Model]
+
+
+class CRMQuerySet(TenantQuerySet, ULIDQuerySet):
+    """QuerySet for the CRM models.
+
+    The bulk updates invalidate the cached instances of the models with a ``cached`` manager,
+    which the ``post_save`` signal does not.
+    """
+
+    def bulk_create(self, objs: Iterable[models.Model], *args: Any, **kwargs: Any) -> list[models.Model]:
+        """Insert the objects, invalidating the cached instances of the rows updated on conflict.
+
+        With ``update_conflicts`` the updated rows keep their primary key, which Django does not
+        return, so the rows with the unique fields of the objects are invalidated.
+
+        Args:
+            objs: The objects to create.
+            *args: The arguments of ``QuerySet.bulk_create``.
+            **kwargs: The keyword arguments of ``QuerySet.bulk_create``.
+
+        Returns:
+            The created objects.
+        """
+        cache = model_cache(self.model)
+        options = BULK_CREATE_SIGNATURE.bind(self, objs, *args, **kwargs).arguments
+        if cache is None or not options.get("update_conflicts"):
+            return super().bulk_create(objs, *args, **kwargs)
+        self._for_write = True
+        with transaction.atomic(using=self.db, savepoint=False):
+            created = super().bulk_create(objs, *args, **kwargs)
+            cache.invalidate(self._unique_pks(created, options.get("unique_fields") or []), using=self.db)
+        return created
+
+    def _unique_pks(self, objs: Sequence[models.Model], unique_fields: Sequence[str]) -> list[Any]:
+        """Return the primary keys of the rows with the unique fields of the objects.
+
+        Args:
+            objs: The objects.
+            unique_fields: The conflict target fields.
+
+        Returns:
+            The primary keys, in any tenant.
+        """
+        opts = self.model._meta
+        attnames = [opts.pk.attname if name == "pk" else opts.get_field(name).attname for name in unique_fields]
+        if not objs or not attnames:
+            return []
+        condition = Q()
+        for obj in objs:
+            condition |= Q(**{attname: getattr(obj, attname) for attname in attnames})
+        return list(self.model._base_manager.using(self.db).filter(condition).values_list("pk", flat=True))
+
+    def update(self, **kwargs: Any) -> int:
+        """Update the rows, invalidating their cached instances.
+
+        Args:
+            **kwargs: The new field values.
+
+        Returns:
+            The number of updated rows.
+        """
+        # Set before self.db is read, so that the snapshot of the primary keys, the UPDATE and the
+        # invalidation all run on the primary.
+        self._for_write = True
+        cache = model_cache(self.model)
+        if cache is None:
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db, savepoint=False):
+            pks = list(self.values_list("pk", flat=True))
+            rows = super().update(**kwargs)
+            cache.invalidate(pks, using=self.db)
+        return rows
+
+    def bulk_update(self, objs: Iterable[models.Model], *args: Any, **kwargs: Any) -> int:
+        """Update the objects, invalidating their cached instances.
+
+        Args:
+            objs: The objects to update.
+            *args: The arguments of ``QuerySet.bulk_update``.
+            **kwargs: The keyword arguments of ``QuerySet.bulk_update``.
+
+        Returns:
+            The number of updated rows.
+        """
+        self._for_write = True
+        objs = list(objs)
+        rows = super().bulk_update(objs, *args, **kwargs)
+        cache = model_cache(self.model)
+        if cache is not None:
+            cache.invalidate([obj.pk for obj in objs], using=self.db)
+        return rows
+
+    def bulk_upsert(
+        self,
+        objs: Iterable[models.Model],
+        unique_fields: Sequence[str],
+        update_fields: Optional[Sequence[str]] = None,
+        batch_size: int = 1000,
+    ) -> UpsertResult:
+        """Insert the objects, or update the rows with the same unique fields, with ``INSERT ... ON CONFLICT``.
+
+        Unlike ``bulk_create(update_conflicts=True)`` the ``auto_now`` and ``auto_now_add`` timestamps
+        are set: new rows get both, updated rows keep their ``created_at`` and get a new ``updated_at``.
+        Missing primary keys are generated in one batch, updated objects get the primary key of the
+        existing row. The unique fields must be covered by a unique constraint, include ``tenant`` in
+        them to keep the upsert within a tenant. Each unique key may appear only once in ``objs``.
+
+        Args:
+            objs: The objects to upsert.
+            unique_fields: The fields identifying the existing rows.
+            update_fields: The fields overwritten on the existing rows, all the other ones by default.
+            batch_size: The number of rows per statement.
+
+        Returns:
+            The inserted and the updated objects.
+
+        Raises:
+            NotSupportedError: If the database is not PostgreSQL.
+        """
+        # Like bulk_create, so that self.db is the primary and not a read replica.
+        self._for_write = True
+        connection = connections[self.db]
+        if connection.vendor != "postgresql":
+            raise NotSupportedError("bulk_upsert is supported on PostgreSQL only.")
+
+        objs = self._fill_primary_keys(objs)
+        opts = self.model._meta
+        fields = opts.concrete_fields
+        now = timezone.now()
+        timestamps = [
+            field.attname
+            for field in fields
+            if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False)
+        ]
+        for obj in objs:
+            for attname in timestamps:
+                setattr(obj, attname, now)
+        created_fields = auto_now_add_fields(self.model)
+        sql = upsert_sql(self.model, connection, unique_fields, update_fields)
+        row = f"({', '.join(['%s'] * len(fields))})"
+
+        result = UpsertResult([], [])
+        with transaction.atomic(using=self.db, savepoint=False), connection.cursor() as cursor:
+            for start in range(0, len(objs), batch_size):
+                batch = objs[start : start + batch_size]
+                params = [
+                    field.get_db_prep_save(getattr(obj, field.attname), connection) for obj in batch for field in fields
+                ]
+                cursor.execute(sql.format(rows=", ".join([row] * len(batch))), params)
+                for obj, (value, *created, inserted) in zip(batch, cursor.fetchall(), strict=True):
+                    setattr(obj, opts.pk.attname, opts.pk.from_db_value(value, None, connection))
+                    # The updated rows keep their creation timestamps.
+                    for field, created_value in zip(created_fields, created, strict=True):
+                        setattr(obj, field.attname, created_value)
+                    obj._state.adding = False
+                    obj._state.db = self.db
+                    (result.inserted if inserted else result.updated).append(obj)
+            cache = model_cache(self.model)
+            if cache is not None:
+                cache.invalidate([obj.pk for obj in result.updated], now, using=self.db)
+        return result
+
+
+ULIDManager = models.Manager.from_queryset(ULIDQuerySet)
+
+
+class UnscopedCRMManager(models.Manager.from_queryset(CRMQuerySet)):  # type: ignore[misc]
+    """Manager for the CRM models that ignores the current tenant."""
+
+
+class CRMManager(UnscopedCRMManager):
+    """Manager for the CRM models scoped to the current tenant.
+
+    Outside of a tenant context (migrations, shell, tasks that did not activate one) the
+    queries are not scoped.
+    """
+
+    def get_queryset(self) -> CRMQuerySet:
+        """Return the queryset filtered by the current tenant.
+
+        Returns:
+            The queryset.
+        """
+        queryset: CRMQuerySet = super().get_queryset()
+        tenant = get_current_tenant()
+        if tenant is not None:
+            queryset = queryset.for_tenant(tenant)  # type: ignore[assignment]
+        return queryset
+
+
+class CachedCRMManager(CRMManager):
+    """Manager of the CRM models reading the instances by primary key through the cache.
+
+    ``get(pk)`` and ``get_many(pks)`` serve the instances from the cache, see
+    :mod:`olympus.core.db.caching`, the other queries are the ones of :class:`CRMManager`.
+    """
+
+    def contribute_to_class(self, cls: type[models.Model], name: str) -> None:
+        """Register the cache of the concrete models.
+
+        Args:
+            cls: The model.
+            name: The name of the manager.
+        """
+        super().contribute_to_class(cls, name)
+        if not cls._meta.abstract:
+            register_model_cache(cls)
+
+    def get(self, *args: Any, **kwargs: Any) -> models.Model:
+        """Return an instance by primary key through the cache, or run a regular ``get``.
+
+        Args:
+            *args: The primary key alone, or the arguments of ``QuerySet.get``.
+            **kwargs: ``pk``/``id`` alone, or the keyword arguments of ``QuerySet.get``.
+
+        Returns:
+            The instance.
+
+        Raises:
+            DoesNotExist: If no instance of the current tenant has the primary key.
+        """
+        if len(args) == 1 and not kwargs and not isinstance(args[0], models.Q):
+            pk = args[0]
+        elif not args and len(kwargs) == 1 and next(iter(kwargs)) in ("pk", self.model._meta.pk.name):
+            pk = next(iter(kwargs.values()))
+        else:
+            return super().get(*args, **kwargs)
+        obj = self.get_many([pk]).get(self.model._meta.pk.to_python(pk))
+        if obj is None:
+            raise self.model.DoesNotExist(f"{self.model._meta.object_name} matching query does not exist.")
+        return obj
+
+    def get_many(self, pks: Iterable[Any]) -> dict[Any, models.Model]:
+        """Return the instances of the current tenant by primary key through the cache.
+
+        The cache misses are fetched with a single ``IN`` query.
+
+        Args:
+            pks: The primary keys.
+
+        Returns:
+            The existing instances by primary key.
+        """
+        cache = register_model_cache(self.model)
+        return {pk: obj for pk, obj in cache.get_many(pks).items() if in_current_tenant(obj)}
@@ -1,16 +1,50 @@
 """Olympus Base Models."""
 
+from typing import Optional
+
 from django.db import models
 
 from olympus.core.behaviours import Tenantable
 from olympus.core.behaviours import Timable
 from olympus.core.behaviours import ULIDable
+from olympus.core.db.managers import CRMManager
+from olympus.core.db.managers import UnscopedCRMManager
+from olympus.core.db.partitioning import Partitioning
+
+
+def tenant_indexes() -> list[models.Index]:
+    """Return the composite indexes serving the tenant scoped queries.
+
+    ``(tenant, id)`` serves the lookups and the keyset pagination of a tenant, ``(tenant, created_at)``
+    the time ordered listings. Models that declare their own ``Meta.indexes`` should include them::
+
+        class Meta(CRMBaseModel.Meta):
+            indexes = [*tenant_indexes(), models.Index(fields=["tenant", "name"])]
+
+    Returns:
+        The list of indexes, named after the concrete model.
+    """
+    return [
+        models.Index(fields=["tenant", "id"]),
+        models.Index(fields=["tenant", "created_at"]),
+    ]
 
 
 class CRMBaseModel(ULIDable, Timable, Tenantable, models.Model):
-    """Base model for all models."""
+    """Base model for all models.
+
+    Set ``partitioning`` to store the table as a PostgreSQL partitioned table, see
+    :mod:`olympus.core.db.partitioning`. Declare ``cached = CachedCRMManager()`` to read the
+    instances by primary key through the cache, see :mod:`olympus.core.db.caching`.
+    """
+
+    partitioning: Optional[Partitioning] = None
+
+    objects = CRMManager()
+    unscoped = UnscopedCRMManager()
 
     class Meta:
         """Meta class for the model."""
 
         abstract = True
+        indexes = tenant_indexes()
@@ -0,0 +1,289 @@
+"""Custom migration operations."""
+
+from contextlib import contextmanager
+from typing import Any
+from typing import Iterator
+
+from django.db import NotSupportedError
+from django.db import migrations
+from django.db.migrations.operations.base import Operation
+
+from olympus.core.db.partitioning import Partitioning
+from olympus.core.db.partitioning import RangePartitioning
+from olympus.core.db.partitioning import create_partitioned_table
+from olympus.core.db.partitioning import roll_partitions
+
+
+ULID_FUNCTIONS_SQL = """
+CREATE OR REPLACE FUNCTION olympus_ulid_to_uuid(value text) RETURNS uuid AS $$
+DECLARE
+    alphabet CONSTANT text := '0123456789ABCDEFGHJKMNPQRSTVWXYZ';
+    bits varbit := B'';
+    hex text := '';
+BEGIN
+    FOR i IN 1..26 LOOP
+        bits := bits || (strpos(alphabet, upper(substr(value, i, 1))) - 1)::bit(5);
+    END LOOP;
+    bits := substring(bits FROM 3);
+    FOR i IN 0..31 LOOP
+        hex := hex || to_hex(substring(bits FROM i * 4 + 1 FOR 4)::bit(4)::int);
+    END LOOP;
+    RETURN hex::uuid;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE STRICT;
+
+CREATE OR REPLACE FUNCTION olympus_uuid_to_ulid(value uuid) RETURNS text AS $$
+DECLARE
+    alphabet CONSTANT text := '0123456789ABCDEFGHJKMNPQRSTVWXYZ';
+    bits varbit := B'00' || ('x' || replace(value::text, '-', ''))::bit(128);
+    result text := '';
+BEGIN
+    FOR i IN 0..25 LOOP
+        result := result || substr(alphabet, substring(bits FROM i * 5 + 1 FOR 5)::bit(5)::int + 1, 1);
+    END LOOP;
+    RETURN result;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE STRICT;
+"""
+
+
+@contextmanager
+def _ulid_using_sql(schema_editor: Any) -> Iterator[None]:
+    """Make the schema editor cast ULID columns through the conversion functions.
+
+    Args:
+        schema_editor: The schema editor.
+
+    Yields:
+        Nothing, the schema editor is patched while the context is active.
+    """
+    original = schema_editor._using_sql
+    connection = schema_editor.connection
+
+    def using_sql(new_field: Any, old_field: Any) -> str:
+        old_type = old_field.db_parameters(connection=connection)["type"]
+        new_type = new_field.db_parameters(connection=connection)["type"]
+        if old_type.startswith("varchar") and new_type == "uuid":
+            return " USING olympus_ulid_to_uuid(%(column)s)"
+        if old_type == "uuid" and new_type.startswith("varchar"):
+            return " USING olympus_uuid_to_ulid(%(column)s)"
+        return str(original(new_field, old_field))
+
+    schema_editor._using_sql = using_sql
+    try:
+        yield
+    finally:
+        del schema_editor._using_sql
+
+
+class ConvertULIDStorage(migrations.AlterField):
+    """Convert a ULID column between the char and the binary storage in place.
+
+    Works like ``AlterField``, but the existing values of the column and of every foreign key
+    pointing at it are rewritten by a SQL function instead of a plain cast. Only PostgreSQL is supported.
+
+    Example::
+
+        operations = [
+            ConvertULIDStorage("deal", "id", BinaryULIDPrimaryKeyField()),
+        ]
+    """
+
+    def database_forwards(self, app_label: str, schema_editor: Any, from_state: Any, to_state: Any) -> None:
+        """Convert the column to the storage of the target state.
+
+        Args:
+            app_label: The app label.
+            schema_editor: The schema editor.
+            from_state: The state before the operation.
+            to_state: The state after the operation.
+
+        Raises:
+            NotSupportedError: If the database is not PostgreSQL.
+        """
+        if schema_editor.connection.vendor != "postgresql":
+            raise NotSupportedError("ConvertULIDStorage is supported on PostgreSQL only.")
+
+        schema_editor.execute(ULID_FUNCTIONS_SQL)
+        with _ulid_using_sql(schema_editor):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+        to_model = to_state.apps.get_model(app_label, self.model_name)
+        to_field = to_model._meta.get_field(self.name)
+        if self.allow_migrate_model(schema_editor.connection.alias, to_model) and to_field.db_type(
+            schema_editor.connection
+        ).startswith("varchar"):
+            # Char storage is expected to have the ``LIKE`` indexes, restore them.
+            fields = [(to_model, to_field)] + [
+                (rel.related_model, rel.field)
+                for rel in to_model._meta.related_objects
+                if not rel.many_to_many and rel.field.target_field == to_field
+            ]
+            for model, field in fields:
+                statement = schema_editor._create_like_index_sql(model, field)
+                if statement is not None:
+                    schema_editor.execute(statement)
+
+    def describe(self) -> str:
+        """Return a human readable description of the operation.
+
+        Returns:
+            The description.
+        """
+        return f"Convert ULID storage of {self.name} on {self.model_name}"
+
+    def reduce(self, operation: Any, app_label: str) -> Any:
+        """Never merge into a plain ``AlterField``, it would lose the value conversion.
+
+        Args:
+            operation: The next operation.
+            app_label: The app label.
+
+        Returns:
+            The result of the field operation reduction.
+        """
+        return super(migrations.AlterField, self).reduce(operation, app_label)
+
+
+class CreatePartitionedModel(migrations.CreateModel):
+    """Create the table of a model as a PostgreSQL partitioned table with its initial partitions.
+
+    Example::
+
+        operations = [
+            CreatePartitionedModel(
+                "Activity",
+                fields=[...],
+                partitioning=RangePartitioning(key="id", interval="month"),
+            ),
+        ]
+    """
+
+    def __init__(self, name: str, fields: Any, partitioning: Partitioning, **kwargs: Any) -> None:
+        """Initialize the operation.
+
+        Args:
+            name: The model name.
+            fields: The model fields.
+            partitioning: The partitioning of the table.
+            **kwargs: The other ``CreateModel`` arguments.
+        """
+        self.partitioning = partitioning
+        super().__init__(name, fields, **kwargs)
+
+    def deconstruct(self) -> tuple[str, list[Any], dict[str, Any]]:
+        """Deconstruct the operation with its partitioning.
+
+        Returns:
+            The name, the positional and the keyword arguments.
+        """
+        name, args, kwargs = super().deconstruct()
+        kwargs["partitioning"] = self.partitioning
+        return name, args, kwargs
+
+    def database_forwards(self, app_label: str, schema_editor: Any, from_state: Any, to_state: Any) -> None:
+        """Create the partitioned table.
+
+        Args:
+            app_label: The app label.
+            schema_editor: The schema editor.
+            from_state: The state before the operation.
+            to_state: The state after the operation.
+
+        Raises:
+            NotSupportedError: If the database is not PostgreSQL.
+        """
+        if schema_editor.connection.vendor != "postgresql":
+            raise NotSupportedError("CreatePartitionedModel is supported on PostgreSQL only.")
+
+        model = to_state.apps.get_model(app_label, self.name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            create_partitioned_table(schema_editor, model, self.partitioning)
+
+    def describe(self) -> str:
+        """Return a human readable description of the operation.
+
+        Returns:
+            The description.
+        """
+        return f"Create partitioned model {self.name}"
+
+    def reduce(self, operation: Any, app_label: str) -> Any:
+        """Never merge into a plain ``CreateModel``, it would lose the partitioning.
+
+        Args:
+            operation: The next operation.
+            app_label: The app label.
+
+        Returns:
+            The result of the model operation reduction.
+        """
+        return super(migrations.CreateModel, self).reduce(operation, app_label)
+
+
+class RollPartitions(Operation):
+    """Create the upcoming range partitions of a model, e.g. after changing its ``premake``.
+
+    The partitions are rolled periodically by the ``roll_partitions`` Celery task as well,
+    reversing the operation leaves the partitions in place.
+    """
+
+    reversible = True
+    reduces_to_sql = False
+
+    def __init__(self, model_name: str, partitioning: RangePartitioning) -> None:
+        """Initialize the operation.
+
+        Args:
+            model_name: The model name.
+            partitioning: The range partitioning of the table.
+        """
+        self.model_name = model_name
+        self.partitioning = partitioning
+
+    def deconstruct(self) -> tuple[str, list[Any], dict[str, Any]]:
+        """Deconstruct the operation.
+
+        Returns:
+            The name, the positional and the keyword arguments.
+        """
+        return self.__class__.__name__, [], {"model_name": self.model_name, "partitioning": self.partitioning}
+
+    def state_forwards(self, app_label: str, state: Any) -> None:
+        """Leave the state unchanged, partitions are not part of it.
+
+        Args:
+            app_label: The app label.
+            state: The project state.
+        """
+
+    def database_forwards(self, app_label: str, schema_editor: Any, from_state: Any, to_state: Any) -> None:
+        """Create the missing partitions and detach the expired ones.
+
+        Args:
+            app_label: The app label.
+            schema_editor: The schema editor.
+            from_state: The state before the operation.
+            to_state: The state after the operation.
+        """
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            roll_partitions(schema_editor, model, self.partitioning)
+
+    def database_backwards(self, app_label: str, schema_editor: Any, from_state: Any, to_state: Any) -> None:
+        """Keep the partitions, they may already hold rows.
+
+        Args:
+            app_label: The app label.
+            schema_editor: The schema editor.
+            from_state: The state before the operation.
+            to_state: The state after the operation.
+        """
+
+    def describe(self) -> str:
+        """Return a human readable description of the operation.
+
+        Returns:
+            The description.
+        """
+        return f"Roll partitions of {self.model_name}"
@@ -0,0 +1,362 @@
+"""Native PostgreSQL table partitioning of the CRM models.
+
+A model opts in by declaring a ``partitioning`` attribute and creating its table with the
+:class:`~olympus.core.db.operations.CreatePartitionedModel` migration operation::
+
+    class Activity(CRMBaseModel):
+        partitioning = RangePartitioning(key="id", interval="month", premake=3, retention=12)
+
+Range partitioning by ``id`` splits the table by the time prefix of the ULIDs and keeps the
+single column primary key, so other tables can still reference it. Partitioning by any other
+column makes the primary key ``(id, <key>)``, which PostgreSQL requires, and such tables cannot
+be referenced by foreign keys. The key column becomes ``NOT NULL`` with the primary key, so the
+partition key field must not be nullable: a model partitioned by ``tenant`` redeclares the
+nullable ``SET_NULL`` foreign key of ``Tenantable`` as a required one. Queries filtering on the
+partition key, e.g. ``created_between`` for the ``id``, are pruned to the matching partitions by
+PostgreSQL.
+"""
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone as dt_timezone
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+from django.db import models
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+from olympus.core.db.ulids import ulid_floor
+
+
+INTERVALS = ("day", "week", "month")
+
+
+@deconstructible
+@dataclass
+class RangePartitioning:
+    """Partition by time ranges of the ULID ``id`` or of a datetime column.
+
+    Attributes:
+        key: The partition key field, ``id`` or a datetime field such as ``created_at``.
+        interval: The length of a partition, ``day``, ``week`` or ``month``.
+        premake: The number of partitions created ahead of the current one.
+        retention: The number of past partitions kept attached, all of them if ``None``.
+    """
+
+    key: str = "id"
+    interval: str = "month"
+    premake: int = 3
+    retention: Optional[int] = None
+
+    method = "RANGE"
+
+    def __post_init__(self) -> None:
+        """Validate the interval.
+
+        Raises:
+            ValueError: If the interval is not supported.
+        """
+        if self.interval not in INTERVALS:
+            raise ValueError(f"Unsupported partition interval {self.interval!r}, use one of {INTERVALS}.")
+
+    def floor(self, value: datetime) -> datetime:
+        """Return the start of the partition containing the datetime.
+
+        Args:
+            value: The datetime.
+
+        Returns:
+            The start of the partition, in UTC.
+        """
+        value = value.astimezone(dt_timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.interval == "week":
+            return value - timedelta(days=value.weekday())
+        if self.interval == "month":
+            return value.replace(day=1)
+        return value
+
+    def shift(self, value: datetime, count: int) -> datetime:
+        """Return the start of the partition ``count`` intervals after the one starting at the datetime.
+
+        Args:
+            value: The start of a partition.
+            count: The number of intervals, negative to go back.
+
+        Returns:
+            The start of the other partition.
+        """
+        if self.interval == "month":
+            months = value.year * 12 + value.month - 1 + count
+            return value.replace(year=months // 12, month=months % 12 + 1)
+        return value + timedelta(days=count * (7 if self.interval == "week" else 1))
+
+    def suffix(self, start: datetime) -> str:
+        """Return the partition name suffix of the partition starting at the datetime.
+
+        Args:
+            start: The start of the partition.
+
+        Returns:
+            The suffix.
+        """
+        return start.strftime("%Y%m" if self.interval == "month" else "%Y%m%d")
+
+    def bound(self, field: "models.Field[Any, Any]", value: datetime, connection: Any) -> Any:
+        """Return the database value of the partition bound.
+
+        Args:
+            field: The partition key field.
+            value: The datetime of the bound.
+            connection: The connection.
+
+        Returns:
+            The lowest ULID of the millisecond for the ULID fields, the datetime otherwise.
+        """
+        if isinstance(field, models.DateTimeField):
+            return field.get_db_prep_value(value, connection)
+        return field.get_db_prep_value(ulid_floor(value), connection)
+
+
+@deconstructible
+@dataclass
+class ListPartitioning:
+    """Partition by the values of a column, one partition per tenant by default.
+
+    The key must not be nullable, see :func:`nullable_partition_key`. Rows of values without a
+    partition go to the default partition, use :func:`create_list_partition` to move a large
+    tenant into its own partition.
+
+    Attributes:
+        key: The partition key field.
+    """
+
+    key: str = "tenant"
+
+    method = "LIST"
+
+
+@deconstructible
+@dataclass
+class HashPartitioning:
+    """Partition by the hash of a column into a fixed number of partitions.
+
+    The key must not be nullable, see :func:`nullable_partition_key`.
+
+    Attributes:
+        key: The partition key field.
+        modulus: The number of partitions.
+    """
+
+    key: str = "tenant"
+    modulus: int = 8
+
+    method = "HASH"
+
+
+Partitioning = RangePartitioning | ListPartitioning | HashPartitioning
+
+
+def nullable_partition_key(model: type[models.Model], partitioning: Partitioning) -> Optional["models.Field[Any, Any]"]:
+    """Return the partition key field if it is nullable.
+
+    A partition key other than the primary key joins the primary key, which cannot hold ``NULL``:
+    the rows without a value could not be inserted and an ``on_delete=SET_NULL`` would fail.
+
+    Args:
+        model: The model.
+        partitioning: The partitioning of the table.
+
+    Returns:
+        The nullable key field, ``None`` if the key is valid.
+    """
+    key = model._meta.get_field(partitioning.key)
+    return key if key.null and not key.primary_key else None
+
+
+@contextmanager
+def _partitioned_table_sql(schema_editor: Any, partitioning: Partitioning) -> Iterator[None]:
+    """Make the schema editor create the next table as a partitioned one.
+
+    Args:
+        schema_editor: The schema editor.
+        partitioning: The partitioning of the table.
+
+    Yields:
+        Nothing, the schema editor is patched while the context is active.
+    """
+    original = schema_editor.table_sql
+    quote = schema_editor.quote_name
+
+    def table_sql(model: type[models.Model]) -> tuple[str, Any]:
+        sql, params = original(model)
+        key = model._meta.get_field(partitioning.key)
+        if not key.primary_key:
+            # Every unique constraint of a partitioned table must contain the partition key.
+            pk = quote(model._meta.pk.column)
+            sql = f"{sql.replace(' PRIMARY KEY', '', 1)[:-1]}, PRIMARY KEY ({pk}, {quote(key.column)}))"
+        return f"{sql} PARTITION BY {partitioning.method} ({quote(key.column)})", params
+
+    schema_editor.table_sql = table_sql
+    try:
+        yield
+    finally:
+        del schema_editor.table_sql
+
+
+def partition_name(model: type[models.Model], suffix: str) -> str:
+    """Return the table name of a partition of the model.
+
+    Args:
+        model: The partitioned model.
+        suffix: The suffix of the partition.
+
+    Returns:
+        The table name.
+    """
+    return f"{model._meta.db_table}_p{suffix}"
+
+
+def list_partitions(schema_editor: Any, model: type[models.Model]) -> list[str]:
+    """Return the names of the partitions attached to the table of the model.
+
+    Args:
+        schema_editor: The schema editor.
+        model: The partitioned model.
+
+    Returns:
+        The table names of the partitions.
+    """
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s ORDER BY child.relname",
+            [model._meta.db_table],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def create_partitioned_table(schema_editor: Any, model: type[models.Model], partitioning: Partitioning) -> None:
+    """Create the partitioned table of the model with its initial partitions.
+
+    Range partitioning gets a ``history`` partition for the rows older than the current interval
+    and the current plus ``premake`` partitions, list partitioning a ``default`` partition and hash
+    partitioning all of its ``modulus`` partitions.
+
+    Args:
+        schema_editor: The schema editor.
+        model: The model.
+        partitioning: The partitioning of the table.
+
+    Raises:
+        ValueError: If the partition key is nullable.
+    """
+    key = nullable_partition_key(model, partitioning)
+    if key is not None:
+        raise ValueError(f"The partition key {model._meta.label}.{key.name} must not be nullable.")
+
+    with _partitioned_table_sql(schema_editor, partitioning):
+        schema_editor.create_model(model)
+
+    table = schema_editor.quote_name(model._meta.db_table)
+    if isinstance(partitioning, RangePartitioning):
+        field = model._meta.get_field(partitioning.key)
+        start = partitioning.floor(timezone.now())
+        schema_editor.execute(
+            f"CREATE TABLE {schema_editor.quote_name(partition_name(model, 'history'))} "
+            f"PARTITION OF {table} FOR VALUES FROM (MINVALUE) TO (%s)",
+            [partitioning.bound(field, start, schema_editor.connection)],
+        )
+        roll_partitions(schema_editor, model, partitioning)
+    elif isinstance(partitioning, ListPartitioning):
+        schema_editor.execute(
+            f"CREATE TABLE {schema_editor.quote_name(partition_name(model, 'default'))} PARTITION OF {table} DEFAULT"
+        )
+    else:
+        for remainder in range(partitioning.modulus):
+            schema_editor.execute(
+                f"CREATE TABLE {schema_editor.quote_name(partition_name(model, str(remainder)))} "
+                f"PARTITION OF {table} FOR VALUES WITH (MODULUS %s, REMAINDER %s)",
+                [partitioning.modulus, remainder],
+            )
+
+
+def create_list_partition(schema_editor: Any, model: type[models.Model], value: Any, suffix: str) -> str:
+    """Create a list partition holding the rows of a single key value, e.g. of one tenant.
+
+    The rows already stored in the default partition for the value have to be moved first.
+
+    Args:
+        schema_editor: The schema editor.
+        model: The model partitioned by :class:`ListPartitioning`.
+        value: The value of the partition key, e.g. the tenant primary key.
+        suffix: The suffix of the partition name.
+
+    Returns:
+        The table name of the partition.
+    """
+    name = partition_name(model, suffix)
+    schema_editor.execute(
+        f"CREATE TABLE {schema_editor.quote_name(name)} "
+        f"PARTITION OF {schema_editor.quote_name(model._meta.db_table)} FOR VALUES IN (%s)",
+        [value],
+    )
+    return name
+
+
+def roll_partitions(
+    schema_editor: Any,
+    model: type[models.Model],
+    partitioning: RangePartitioning,
+    now: Optional[datetime] = None,
+) -> tuple[list[str], list[str]]:
+    """Create the missing future partitions and detach the ones past the retention.
+
+    Detached partitions are regular tables afterwards, they can be archived or dropped.
+
+    Args:
+        schema_editor: The schema editor.
+        model: The model partitioned by :class:`RangePartitioning`.
+        partitioning: The partitioning of the table.
+        now: The current time, defaults to now.
+
+    Returns:
+        The names of the created and of the detached partitions.
+    """
+    table = schema_editor.quote_name(model._meta.db_table)
+    field = model._meta.get_field(partitioning.key)
+    current = partitioning.floor(now or timezone.now())
+    existing = set(list_partitions(schema_editor, model))
+    # Detached partitions keep their names, they are never recreated.
+    tables = existing | set(schema_editor.connection.introspection.table_names())
+
+    created = []
+    for offset in range(partitioning.premake + 1):
+        start = partitioning.shift(current, offset)
+        name = partition_name(model, partitioning.suffix(start))
+        if name in tables:
+            continue
+        schema_editor.execute(
+            f"CREATE TABLE {schema_editor.quote_name(name)} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+            [
+                partitioning.bound(field, start, schema_editor.connection),
+                partitioning.bound(field, partitioning.shift(start, 1), schema_editor.connection),
+            ],
+        )
+        created.append(name)
+
+    detached = []
+    if partitioning.retention is not None:
+        oldest = partition_name(model, partitioning.suffix(partitioning.shift(current, -partitioning.retention)))
+        prefix = partition_name(model, "")
+        for name in sorted(existing):
+            # Suffixes are zero padded dates, so they sort like the partitions.
+            if name.startswith(prefix) and name[len(prefix) :].isdigit() and name < oldest:
+                schema_editor.execute(f"ALTER TABLE {table} DETACH PARTITION {schema_editor.quote_name(name)}")
+                detached.append(name)
+    return created, detached
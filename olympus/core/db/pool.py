@@ -0,0 +1,296 @@
+"""In-process pool of PostgreSQL connections.
+
+Django 4.2 keeps at most one connection per thread and per alias: a request either connects
+and disconnects, or holds a persistent connection for ``CONN_MAX_AGE`` seconds even while its
+thread is idle. With ``OPTIONS["pool"]`` the connections of an alias are shared by all the
+threads of the process instead (gthread, gevent and uvicorn workers), Django takes one when it
+connects and gives it back when it closes, so ``CONN_MAX_AGE`` must be 0.
+
+A pool belongs to the process that created it. A forked child (preloaded gunicorn workers,
+Celery prefork children) starts with empty pools, and the inherited connections are dropped
+without a word to the server, so the connections of the parent stay usable.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+
+import psycopg2
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extensions import TRANSACTION_STATUS_UNKNOWN
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    """No connection of the pool was released in time."""
+
+
+class _Idle(NamedTuple):
+    connection: Any
+    released: float
+
+
+class ConnectionPool:
+    """Thread safe pool of connections, opened on demand up to ``max_size``."""
+
+    def __init__(
+        self,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        max_lifetime: float = 3600.0,
+        check_after: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the pool.
+
+        Args:
+            max_size: The maximum number of connections, in use or idle.
+            timeout: The number of seconds to wait for a connection when they are all in use.
+            max_lifetime: The number of seconds after which a connection is closed instead of reused.
+            check_after: The number of idle seconds after which a connection is checked before reuse.
+            clock: The monotonic clock.
+        """
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._idle: deque[_Idle] = deque()
+        self._opened: dict[int, float] = {}
+        self._in_use = 0
+        self._waiting = 0
+        self._requests = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self._max_wait = 0.0
+
+    def getconn(self, connect: Callable[[], Any]) -> Any:
+        """Take an idle connection, or open one if the pool is not full.
+
+        Args:
+            connect: Opens a new connection.
+
+        Returns:
+            The connection.
+
+        Raises:
+            PoolTimeout: If no connection was released within the timeout.
+            BaseException: If the connection could not be opened, its slot is released.
+        """
+        with self._condition:
+            self._requests += 1
+            start = self._clock()
+            if not self._idle and self._in_use >= self.max_size:
+                self._waits += 1
+                self._waiting += 1
+                try:
+                    while not self._idle and self._in_use >= self.max_size:
+                        remaining = start + self.timeout - self._clock()
+                        if remaining <= 0:
+                            self._timeouts += 1
+                            raise PoolTimeout(f"No connection available within {self.timeout:g}s.")
+                        self._condition.wait(remaining)
+                finally:
+                    self._waiting -= 1
+                    waited = self._clock() - start
+                    self._wait_time += waited
+                    self._max_wait = max(self._max_wait, waited)
+            self._in_use += 1
+            idle = self._idle.pop() if self._idle else None
+
+        try:
+            connection = self._reuse(idle) if idle is not None else None
+            if connection is None:
+                connection = connect()
+                with self._condition:
+                    self._opened[id(connection)] = self._clock()
+        except BaseException:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+        return connection
+
+    def putconn(self, connection: Any) -> None:
+        """Give a connection back to the pool, closing it if it is broken or too old.
+
+        Args:
+            connection: A connection taken from the pool.
+        """
+        opened = self._opened.get(id(connection))
+        if opened is None:
+            # Not from this pool, e.g. inherited from the parent process.
+            _drop(connection)
+            return
+        reusable = not connection.closed and self._clock() - opened < self.max_lifetime
+        if reusable:
+            try:
+                status = connection.info.transaction_status
+                if status == TRANSACTION_STATUS_UNKNOWN:
+                    reusable = False
+                elif status != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+            except psycopg2.Error:
+                reusable = False
+        with self._condition:
+            self._in_use -= 1
+            if reusable:
+                self._idle.append(_Idle(connection, self._clock()))
+            else:
+                self._opened.pop(id(connection), None)
+            self._condition.notify()
+        if not reusable:
+            _close(connection)
+
+    def close(self) -> None:
+        """Close the idle connections, the ones in use are closed when they are given back."""
+        with self._condition:
+            idle = [item.connection for item in self._idle]
+            self._idle.clear()
+            for connection in idle:
+                self._opened.pop(id(connection), None)
+        for connection in idle:
+            _close(connection)
+
+    def detach(self) -> None:
+        """Drop the connections inherited by a forked child without closing them on the server."""
+        with self._condition:
+            idle = [item.connection for item in self._idle]
+            self._idle.clear()
+            self._opened.clear()
+            self._in_use = 0
+        for connection in idle:
+            _drop(connection)
+
+    def stats(self) -> dict[str, int | float]:
+        """Return the usage of the pool.
+
+        Returns:
+            The connections in use and idle, the threads waiting for one, and the count, the timeouts,
+            the mean and the maximum duration in milliseconds of the waits since the pool was created.
+        """
+        with self._condition:
+            return {
+                "max_size": self.max_size,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                "requests": self._requests,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_ms_avg": round(self._wait_time / self._waits * 1000, 3) if self._waits else 0.0,
+                "wait_ms_max": round(self._max_wait * 1000, 3),
+            }
+
+    def _reuse(self, idle: _Idle) -> Optional[Any]:
+        """Return the idle connection if it is still usable, otherwise close it.
+
+        Args:
+            idle: The idle connection.
+
+        Returns:
+            The connection, ``None`` if it was closed.
+        """
+        connection = idle.connection
+        usable = not connection.closed
+        if usable and self._clock() - idle.released >= self.check_after:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+            except psycopg2.Error:
+                usable = False
+        if usable:
+            return connection
+        with self._condition:
+            self._opened.pop(id(connection), None)
+        _close(connection)
+        return None
+
+
+def _close(connection: Any) -> None:
+    """Close a connection, ignoring the errors of a broken one.
+
+    Args:
+        connection: The connection.
+    """
+    try:
+        connection.close()
+    except psycopg2.Error:
+        pass
+
+
+def _drop(connection: Any) -> None:
+    """Close a connection inherited from the parent process without a word to the server.
+
+    The socket is replaced by ``/dev/null`` under the same descriptor first, so the Terminate
+    message of libpq goes nowhere and the descriptor it closes was never free for another thread.
+
+    Args:
+        connection: The connection.
+    """
+    try:
+        fileno = connection.fileno()
+    except psycopg2.Error:
+        # Already closed.
+        fileno = -1
+    if fileno >= 0:
+        devnull = os.open(os.devnull, os.O_RDWR)
+        try:
+            os.dup2(devnull, fileno)
+        finally:
+            os.close(devnull)
+    _close(connection)
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+_pools_pid = os.getpid()
+
+
+def get_pool(alias: str, options: dict[str, Any]) -> ConnectionPool:
+    """Return the pool of a database alias in the current process.
+
+    Args:
+        alias: The database alias.
+        options: The ``OPTIONS["pool"]`` of the database, the keyword arguments of :class:`ConnectionPool`.
+
+    Returns:
+        The pool, created on first use.
+    """
+    global _pools_pid
+
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            for pool in _pools.values():
+                pool.detach()
+            _pools.clear()
+            _pools_pid = os.getpid()
+        pool = _pools.get(alias)
+        if pool is None:
+            pool = _pools[alias] = ConnectionPool(**options)
+        return pool
+
+
+def close_pools() -> None:
+    """Close the idle connections of every pool of the current process."""
+    with _pools_lock:
+        pools = list(_pools.values()) if _pools_pid == os.getpid() else []
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats() -> dict[str, dict[str, int | float]]:
+    """Return the usage of every pool of the current process.
+
+    Returns:
+        The stats of the pools by database alias.
+    """
+    with _pools_lock:
+        pools = dict(_pools) if _pools_pid == os.getpid() else {}
+    return {alias: pool.stats() for alias, pool in pools.items()}
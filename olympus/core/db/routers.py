@@ -0,0 +1,214 @@
+"""Database router sending the reads of the requests and the tasks to the read replicas.
+
+Replica routing is active inside :func:`replica_routing`, entered by the
+``ReplicaRoutingMiddleware`` for every request and around the Celery tasks declared with
+``replica_reads=True``. The other tasks, the management commands, the migrations and the shell
+stay on the primary. Inside the context:
+
+* the writes go to the primary and pin the rest of the context to it, so a request reads its
+  own writes, the requests with an unsafe method are pinned from the start;
+* the reads inside a transaction of the primary stay on it, like the reads of the models of the
+  ``REPLICA_PRIMARY_APPS``, e.g. the sessions and the users, which the middlewares load lazily
+  inside the context;
+* the other reads go to a replica, the same one for the whole context, chosen among the ones
+  whose replication lag is at most ``REPLICA_MAX_LAG`` seconds. The lag of a replica is
+  measured at most once per ``REPLICA_LAG_CACHE_TTL`` seconds and per process. Without a fresh
+  enough replica the reads go to the primary.
+"""
+
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from contextvars import Token
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db import DatabaseError
+from django.db import connections
+from django.db.models import Model
+
+from olympus.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+# The lag in seconds, 0 on the primary, which is not in recovery.
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+class RoutingState:
+    """Routing of the current request or task, shared by the contexts copied from it."""
+
+    __slots__ = ("pinned", "replica")
+
+    def __init__(self, pinned: bool = False) -> None:
+        """Initialize the state.
+
+        Args:
+            pinned: Whether the reads go to the primary.
+        """
+        self.pinned = pinned
+        self.replica: Optional[str] = None
+
+
+_routing_state: ContextVar[Optional[RoutingState]] = ContextVar("olympus_routing_state", default=None)
+
+_lags: dict[str, tuple[float, float]] = {}
+_lags_lock = threading.Lock()
+
+
+def start_replica_routing(pinned: bool = False) -> Token[Optional[RoutingState]]:
+    """Send the reads to the replicas until the token is reset.
+
+    Args:
+        pinned: Whether to start pinned to the primary.
+
+    Returns:
+        The token restoring the previous routing.
+    """
+    return _routing_state.set(RoutingState(pinned))
+
+
+def stop_replica_routing(token: Token[Optional[RoutingState]]) -> None:
+    """Restore the routing active before :func:`start_replica_routing`.
+
+    Args:
+        token: The token returned by :func:`start_replica_routing`.
+    """
+    _routing_state.reset(token)
+
+
+@contextmanager
+def replica_routing(pinned: bool = False) -> Iterator[None]:
+    """Send the reads to the replicas for the duration of the context.
+
+    Args:
+        pinned: Whether to start pinned to the primary.
+
+    Yields:
+        Nothing, the routing is active while the context is.
+    """
+    token = start_replica_routing(pinned)
+    try:
+        yield
+    finally:
+        stop_replica_routing(token)
+
+
+def pin_primary() -> None:
+    """Send the next reads of the current request or task to the primary."""
+    state = _routing_state.get()
+    if state is not None:
+        state.pinned = True
+
+
+def replica_lag(alias: str) -> float:
+    """Return the replication lag of a replica, cached for ``REPLICA_LAG_CACHE_TTL`` seconds.
+
+    Args:
+        alias: The database alias of the replica.
+
+    Returns:
+        The lag in seconds, infinite if the replica is unavailable.
+    """
+    now = time.monotonic()
+    cached = _lags.get(alias)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            lag = float(cursor.fetchone()[0])
+    except DatabaseError as e:
+        logger.bind(alias=alias).warning(f"Replica {alias} is unavailable: {e}")
+        lag = math.inf
+    with _lags_lock:
+        _lags[alias] = (now + settings.REPLICA_LAG_CACHE_TTL, lag)
+    return lag
+
+
+class ReplicaRouter:
+    """Route the reads to the read replicas listed in ``DATABASE_REPLICAS``."""
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> Optional[str]:
+        """Return the database of a read.
+
+        Args:
+            model: The model.
+            **hints: The routing hints.
+
+        Returns:
+            A fresh enough replica or the primary, ``None`` outside of :func:`replica_routing`.
+        """
+        state = _routing_state.get()
+        if state is None:
+            return None
+        if (
+            state.pinned
+            or not settings.DATABASE_REPLICAS
+            or model._meta.app_label in settings.REPLICA_PRIMARY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        if state.replica is None or replica_lag(state.replica) > settings.REPLICA_MAX_LAG:
+            fresh = [alias for alias in settings.DATABASE_REPLICAS if replica_lag(alias) <= settings.REPLICA_MAX_LAG]
+            if not fresh:
+                return DEFAULT_DB_ALIAS
+            state.replica = random.choice(fresh)  # noqa: S311
+        return state.replica
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> Optional[str]:
+        """Return the database of a write, pinning the current request or task to it.
+
+        Args:
+            model: The model.
+            **hints: The routing hints.
+
+        Returns:
+            The primary, also for the objects read from a replica.
+        """
+        pin_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> Optional[bool]:
+        """Allow the relations between the objects of the primary and of the replicas.
+
+        Args:
+            obj1: The first object.
+            obj2: The second object.
+            **hints: The routing hints.
+
+        Returns:
+            ``True`` if both objects come from the primary or a replica, ``None`` otherwise.
+        """
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db: str, app_label: str, model_name: Optional[str] = None, **hints: Any) -> Optional[bool]:
+        """Never migrate the replicas, they replicate the primary.
+
+        Args:
+            db: The database alias.
+            app_label: The application label.
+            model_name: The model name.
+            **hints: The routing hints.
+
+        Returns:
+            ``False`` for a replica, ``None`` otherwise.
+        """
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,181 @@
+"""ULID helpers used by the model fields."""
+
+import functools
+import os
+import threading
+import time
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from typing import Any
+from typing import Callable
+
+from django.utils import timezone
+from ulid import ULID
+from ulid import base32
+
+
+RANDOMNESS_BITS = 80
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class MonotonicULIDGenerator:
+    """Thread safe generator of strictly increasing ULIDs.
+
+    The first ULID of a millisecond gets fresh randomness with the top bit cleared, every next
+    one increments the previous value by one. A whole batch is reserved under a single lock, so
+    IDs of a bulk insert are consecutive and B-tree inserts stay append-only. If the clock goes
+    backwards the generator keeps incrementing the last value.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the generator."""
+        self._lock = threading.Lock()
+        self._last = 0
+
+    def __call__(self) -> ULID:
+        """Generate a single ULID.
+
+        Returns:
+            The ULID object.
+        """
+        return self.batch(1)[0]
+
+    def batch(self, size: int) -> list[ULID]:
+        """Generate a batch of strictly increasing ULIDs.
+
+        Args:
+            size: The number of ULIDs.
+
+        Returns:
+            The list of ULID objects.
+        """
+        with self._lock:
+            timestamp = time.time_ns() // 1_000_000
+            if timestamp > self._last >> RANDOMNESS_BITS:
+                first = timestamp << RANDOMNESS_BITS | int.from_bytes(os.urandom(10), "big") >> 1
+            else:
+                first = self._last + 1
+            self._last = first + size - 1
+        return [ULID(value.to_bytes(16, "big")) for value in range(first, first + size)]
+
+    def reset(self) -> None:
+        """Forget the last generated value, forked processes must not continue the parent sequence."""
+        self._last = 0
+
+
+ulid_generator = MonotonicULIDGenerator()
+os.register_at_fork(after_in_child=ulid_generator.reset)
+
+
+class LazyULID(ULID):
+    """ULID that keeps the string loaded from the database and decodes it on demand.
+
+    ``str()``, ``repr()`` and comparisons with strings or other lazy ULIDs never touch
+    the Base32 decoder, the bytes are only decoded when the timestamp, the bytes or the
+    hash are accessed.
+    """
+
+    def __init__(self, value: str) -> None:  # noqa
+        """Initialize the lazy ULID.
+
+        Args:
+            value: The 26 chars string representation of the ULID.
+        """
+        self._str = value
+
+    @functools.cached_property
+    def bytes(self) -> bytes:  # type: ignore[override]
+        """Decode the string representation on the first access.
+
+        Returns:
+            The 16 bytes of the ULID.
+        """
+        return base32.decode(self._str)
+
+    def __str__(self) -> str:
+        """Return the string representation without encoding.
+
+        Returns:
+            The 26 chars string.
+        """
+        return self._str
+
+    def __eq__(self, other: object) -> bool:
+        """Compare the string representations if both sides are still encoded.
+
+        Args:
+            other: The object to compare with.
+
+        Returns:
+            Whether the ULIDs are equal.
+        """
+        if isinstance(other, LazyULID):
+            return self._str == other._str
+        return super().__eq__(other)
+
+    def __lt__(self, other: Any) -> bool:
+        """Compare the string representations if both sides are still encoded.
+
+        Args:
+            other: The object to compare with.
+
+        Returns:
+            Whether this ULID sorts before the other one.
+        """
+        if isinstance(other, LazyULID):
+            return self._str < other._str
+        return super().__lt__(other)
+
+    def __hash__(self) -> int:
+        """Hash the bytes, consistently with the eager ULID.
+
+        Returns:
+            The hash of the ULID.
+        """
+        return hash(self.bytes)
+
+
+def decode(value: str) -> ULID:
+    """Decode a 26 chars string into a ULID without the type validation of ``ULID.from_str``.
+
+    Args:
+        value: The string representation of the ULID.
+
+    Returns:
+        The ULID object.
+    """
+    return ULID(base32.decode(value))
+
+
+@functools.lru_cache(maxsize=None)
+def cached_decoder(maxsize: int) -> Callable[[str], ULID]:
+    """Return the process wide LRU cached decoder of the given size.
+
+    Decoded ULIDs are shared between the callers, which interns the repeated values.
+
+    Args:
+        maxsize: The size of the cache.
+
+    Returns:
+        The cached decode function.
+    """
+    return functools.lru_cache(maxsize=maxsize)(decode)
+
+
+def ulid_floor(value: datetime) -> ULID:
+    """Return the smallest ULID of the millisecond of the datetime.
+
+    Every ULID generated at ``value`` or later sorts after it, every ULID generated earlier
+    sorts before it, with millisecond precision. Naive datetimes are in the current timezone.
+
+    Args:
+        value: The datetime.
+
+    Returns:
+        The ULID object with the randomness part set to zeros.
+    """
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    delta = value - EPOCH
+    milliseconds = (delta.days * 86_400 + delta.seconds) * 1_000 + delta.microseconds // 1_000
+    return ULID(milliseconds.to_bytes(6, "big") + bytes(10))
@@ -1,46 +1,192 @@
 """Application Logger."""
 
+import atexit
+import gzip
 import logging
+import os
+import queue
 import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from datetime import timezone
+from types import FrameType
+from typing import Any
+from typing import BinaryIO
+from typing import Callable
+from typing import Mapping
+from typing import Optional
 
 import loguru
 import orjson
+import requests
 from django.conf import settings
 
+from olympus.core.correlation import get_request_id
+
 
 logger = loguru.logger
 logger.remove()
 
 
-def serialize(record: "loguru.Record") -> str:
-    """Serialize Rules for the record.
+CALL_SITES_MAXSIZE = 4096
+
+_levels: dict[str, bytes] = {}
+_call_sites: dict[tuple[Optional[str], str, int, str], bytes] = {}
+_second: tuple[Any, int, bytes, bytes] = (None, 0, b"", b"")
+
+
+def _encode_time(value: datetime) -> bytes:
+    """Encode the timestamp and the time members, formatting the date part once per second.
+
+    Args:
+        value: The time of the record.
+
+    Returns:
+        The encoded members, identical to ``timestamp()`` and ``isoformat()``.
+    """
+    global _second
+    key = (value.year, value.month, value.day, value.hour, value.minute, value.second, value.tzinfo)
+    cached_key, seconds, prefix, suffix = _second
+    if cached_key != key:
+        whole = value.replace(microsecond=0)
+        formatted = whole.isoformat()
+        seconds = round(whole.timestamp())
+        prefix, suffix = f',"time":"{formatted[:19]}'.encode(), f'{formatted[19:]}"'.encode()
+        # A single tuple assignment, the threads never see a partially updated cache.
+        _second = (key, seconds, prefix, suffix)
+    microsecond = value.microsecond
+    if not microsecond:
+        return b'{"timestamp":' + orjson.dumps(float(seconds)) + prefix + suffix
+    # Same arithmetic as ``datetime.timestamp()``, so the floats are identical.
+    timestamp = (seconds * 1_000_000 + microsecond) / 1_000_000
+    return b'{"timestamp":' + orjson.dumps(timestamp) + prefix + b".%06d" % microsecond + suffix
+
+
+def _encode_level(name: str) -> bytes:
+    """Encode the level member, once per level.
+
+    Args:
+        name: The level name.
+
+    Returns:
+        The encoded member.
+    """
+    encoded = _levels.get(name)
+    if encoded is None:
+        encoded = _levels[name] = b',"level":' + orjson.dumps(name)
+    return encoded
+
+
+def _encode_call_site(record: "loguru.Record") -> bytes:
+    """Encode the call site members, once per call site.
 
     Args:
         record: Loguru record.
 
     Returns:
-        Serialized record.
+        The encoded members.
+    """
+    key = (record["name"], record["function"], record["line"], record["file"].path)
+    encoded = _call_sites.get(key)
+    if encoded is None:
+        if len(_call_sites) >= CALL_SITES_MAXSIZE:
+            _call_sites.clear()
+        name, function, line, path = key
+        encoded = _call_sites[key] = (
+            b"," + orjson.dumps({"name": name, "function": function, "line": line, "path": path})[1:-1]
+        )
+    return encoded
+
+
+class LoggerName(str):
+    """Name bound by :func:`get_logger`, carrying the encoded ``extra`` member of its records.
+
+    The records of a logger bound by name only have this ``extra``, it is encoded once per logger
+    instead of once per record.
     """
-    log_record = {
-        "timestamp": record["time"].timestamp(),
-        "time": record["time"].isoformat(),
-        "level": record["level"].name,
-        "message": record["message"],
-        "name": record["name"],
-        "function": record["function"],
-        "line": record["line"],
-        "path": record["file"].path,
-    }
-
-    # Add exception info if present
-    if record["exception"]:
-        log_record["exception"] = f"{record['exception'].type}: {record['exception'].value}"
 
-    # Add extra context if present
+    encoded_extra: bytes
+
+    def __new__(cls, name: str) -> "LoggerName":
+        """Create the name and encode its ``extra`` member.
+
+        Args:
+            name: The name of the logger.
+
+        Returns:
+            The name.
+        """
+        self = super().__new__(cls, name)
+        self.encoded_extra = b',"extra":' + orjson.dumps({"name": name})
+        return self
+
+
+def _encode_extra(extra: dict[str, Any]) -> bytes:
+    """Encode the extra member, reusing the one of a logger bound by :func:`get_logger` only.
+
+    Args:
+        extra: The extra dict of the record.
+
+    Returns:
+        The encoded member.
+    """
+    name = extra.get("name")
+    if type(name) is LoggerName and len(extra) == 1:
+        return name.encoded_extra
+    return b',"extra":' + orjson.dumps(extra, default=str)
+
+
+def exception_fields(exception: Any) -> dict[str, str]:
+    """Return the JSON fields of the exception of a record.
+
+    Args:
+        exception: The loguru record exception.
+
+    Returns:
+        The exception type and value.
+    """
+    return {"type": getattr(exception.type, "__name__", str(exception.type)), "value": str(exception.value)}
+
+
+def encode(record: "loguru.Record") -> bytes:
+    """Encode the record into a JSON line.
+
+    The level and the call site members are encoded once and reused, the date part of the time
+    once per second and the ``extra`` of a logger from :func:`get_logger` once per logger, only
+    the message, the fraction of the second and the other ``extra`` are encoded for every record.
+
+    Args:
+        record: Loguru record.
+
+    Returns:
+        The encoded record, with a trailing newline.
+    """
+    encoded = (
+        _encode_time(record["time"])
+        + _encode_level(record["level"].name)
+        + b',"message":'
+        + orjson.dumps(record["message"])
+        + _encode_call_site(record)
+    )
+    if record["exception"]:
+        encoded += b',"exception":' + orjson.dumps(exception_fields(record["exception"]))
     if record["extra"]:
-        log_record["extra"] = record["extra"]
+        encoded += _encode_extra(record["extra"])
+    return encoded + b"}\n"
+
+
+def serialize(record: "loguru.Record") -> str:
+    """Serialize Rules for the record.
+
+    Args:
+        record: Loguru record.
 
-    return orjson.dumps(log_record).decode("utf-8")
+    Returns:
+        Serialized record.
+    """
+    return encode(record)[:-1].decode("utf-8")
 
 
 def sink(message: "loguru.Message") -> None:
@@ -49,32 +195,569 @@ def sink(message: "loguru.Message") -> None:
     Args:
         message: Loguru message.
     """
-    print(serialize(message.record), file=sys.stdout)
+    sys.stdout.write(encode(message.record).decode("utf-8"))
+
+
+class AsyncSink:
+    """Non-blocking loguru sink writing batches of JSON lines from a background thread.
+
+    Records are serialized on the logging thread and queued as bytes, the writer thread joins
+    up to ``batch_size`` of them into a single write to ``sys.stdout.buffer``, so a slow stdout
+    never stalls a request. When the queue is full the ``overflow`` policy applies:
+
+    * ``drop``: discard the record.
+    * ``sample``: past half of the capacity keep one in ``sample_rate`` records below ``ERROR``,
+      discard the records that still do not fit.
+    * ``block``: wait for the writer.
+
+    The number of discarded records is reported by a warning line. The writer is started on the
+    first record of every process, so the sink survives the fork of the gunicorn and Celery workers.
+    """
+
+    def __init__(
+        self,
+        stream: Optional[BinaryIO] = None,
+        maxsize: int = 10_000,
+        batch_size: int = 256,
+        overflow: str = "drop",
+        sample_rate: int = 10,
+        flush_interval: float = 0.0,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            stream: The binary stream, ``sys.stdout.buffer`` at the time of the write by default.
+            maxsize: The capacity of the queue.
+            batch_size: The maximum number of records per write.
+            overflow: The overflow policy, ``drop``, ``sample`` or ``block``.
+            sample_rate: One in how many records is kept by the ``sample`` policy.
+            flush_interval: The number of seconds to wait for a batch to fill up, none by default.
+
+        Raises:
+            ValueError: If the overflow policy is unknown.
+        """
+        if overflow not in ("drop", "sample", "block"):
+            raise ValueError(f"Unknown log overflow policy {overflow!r}.")
+        self.stream = stream
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.overflow = overflow
+        self.sample_rate = sample_rate
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._sampled = 0
+        self._lock = threading.Lock()
+        self._pid = 0
+        self._queue: queue.Queue[Optional[bytes]] = queue.Queue(maxsize)
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self, message: "loguru.Message") -> None:
+        """Serialize and queue the record.
+
+        Args:
+            message: Loguru message.
+        """
+        self.put(encode(message.record), message.record["level"].no)
+
+    def put(self, data: bytes, levelno: int = logging.INFO) -> None:
+        """Queue an encoded line according to the overflow policy.
+
+        Args:
+            data: The encoded line.
+            levelno: The level of the record.
+        """
+        self._ensure_started()
+        if self.overflow == "block":
+            self._queue.put(data)
+            return
+        if self.overflow == "sample" and levelno < logging.ERROR and self._queue.qsize() >= self.maxsize // 2:
+            self._sampled += 1
+            if self._sampled % self.sample_rate:
+                self.dropped += 1
+                return
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            self.dropped += 1
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Write the queued records and stop the writer, called by ``logger.remove()`` and at exit.
+
+        Args:
+            timeout: The maximum number of seconds to wait for the writer.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and self._pid == os.getpid():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _ensure_started(self) -> None:
+        """Start the writer thread of the current process."""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                # The parent queue may hold records of the parent or a lock held by its writer.
+                self._queue = queue.Queue(self.maxsize)
+                self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        """Write the queued records in batches until stopped."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1] is not None:
+                timeout = deadline - time.monotonic()
+                try:
+                    batch.append(self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stopped = batch[-1] is None
+            batch = [data for data in batch if data is not None]
+            if self.dropped:
+                dropped, self.dropped = self.dropped, 0
+                batch.append(self._dropped_line(dropped))
+            if batch:
+                self._write_batch(batch)
+            if stopped:
+                return
+
+    def _write_batch(self, batch: list[bytes]) -> None:
+        """Write a batch of encoded records.
+
+        Args:
+            batch: The encoded records.
+        """
+        self._write(b"".join(batch))
+
+    def _write(self, data: bytes) -> None:
+        """Write and flush the data to the stream.
+
+        Args:
+            data: The encoded lines.
+        """
+        stream = self.stream or getattr(sys.stdout, "buffer", None)
+        try:
+            if stream is None:
+                sys.stdout.write(data.decode("utf-8"))
+                sys.stdout.flush()
+            else:
+                stream.write(data)
+                stream.flush()
+        except (OSError, ValueError):
+            # A closed or broken stdout must not kill the writer.
+            pass
+
+    @classmethod
+    def _dropped_line(cls, count: int) -> bytes:
+        """Encode the warning about the discarded records.
+
+        Args:
+            count: The number of discarded records.
+
+        Returns:
+            The encoded line.
+        """
+        return cls._warning_line(f"Dropped {count} log records, the log queue is full.")
+
+    @staticmethod
+    def _warning_line(message: str) -> bytes:
+        """Encode a warning line of the sink itself.
+
+        Args:
+            message: The message.
+
+        Returns:
+            The encoded line.
+        """
+        now = datetime.now(timezone.utc)
+        return orjson.dumps(
+            {
+                "timestamp": now.timestamp(),
+                "time": now.isoformat(),
+                "level": "WARNING",
+                "message": message,
+                "name": __name__,
+            },
+            option=orjson.OPT_APPEND_NEWLINE,
+        )
+
+
+class LogtailSink(AsyncSink):
+    """Non-blocking loguru sink shipping batches of records to Logtail over HTTP.
+
+    Up to ``batch_size`` records, or the records of ``flush_interval`` seconds, are posted as one
+    gzip compressed JSON array. Failed posts are retried with exponential backoff, the batches that
+    still fail are appended to the ``spool_path`` file and shipped again after the next successful
+    post. Records never wait for the network, the queue drops them when full. The batches rejected
+    by the endpoint, e.g. for an invalid token, are dropped, counted in ``rejected`` and reported by
+    a warning line on the console.
+    """
+
+    def __init__(
+        self,
+        source_token: str,
+        host: str = "https://in.logs.betterstack.com",
+        spool_path: Optional[str] = None,
+        spool_max_bytes: int = 50 * 1024 * 1024,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 10.0,
+        maxsize: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """Initialize the sink.
+
+        Args:
+            source_token: The Logtail source token.
+            host: The ingestion endpoint.
+            spool_path: The file keeping the batches that could not be shipped, none if ``None``.
+            spool_max_bytes: The size of the spool file past which the failed batches are dropped.
+            retries: The number of retries of a failed post.
+            backoff: The delay before the first retry, doubled on every next one.
+            timeout: The timeout of a post in seconds.
+            maxsize: The capacity of the queue.
+            batch_size: The maximum number of records per post.
+            flush_interval: The maximum number of seconds a record waits for its batch to fill up.
+        """
+        super().__init__(maxsize=maxsize, batch_size=batch_size, overflow="drop", flush_interval=flush_interval)
+        self.url = host if host.startswith(("http://", "https://")) else f"https://{host}"
+        self.spool_path = spool_path
+        self.spool_max_bytes = spool_max_bytes
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = {
+            "Authorization": f"Bearer {source_token}",
+            "Content-Type": "application/json",
+            "Content-Encoding": "gzip",
+        }
+        self.rejected = 0
+        self._session: Optional[requests.Session] = None
+
+    def write(self, message: "loguru.Message") -> None:
+        """Encode and queue the record.
+
+        Args:
+            message: Loguru message.
+        """
+        record = message.record
+        payload = {
+            "dt": record["time"].isoformat(),
+            "level": record["level"].name,
+            "message": record["message"],
+            "name": record["name"],
+            "function": record["function"],
+            "line": record["line"],
+        }
+        if record["exception"]:
+            payload["exception"] = exception_fields(record["exception"])
+        if record["extra"]:
+            payload["extra"] = record["extra"]
+        self.put(orjson.dumps(payload, default=str), record["level"].no)
+
+    def _write_batch(self, batch: list[bytes]) -> None:
+        """Ship the batch, spool it if the endpoint stays unreachable.
+
+        Args:
+            batch: The encoded records.
+        """
+        status = self._post(batch)
+        if self._retryable(status):
+            self._spool(batch)
+        elif status < 300:
+            self._ship_spool()
+        else:
+            self._reject(batch, status)
+
+    def _post(self, batch: list[bytes]) -> int:
+        """Post the batch as a gzip compressed JSON array, with retries.
+
+        Args:
+            batch: The encoded records.
+
+        Returns:
+            The status of the last response, ``0`` if the endpoint could not be reached.
+        """
+        if self._session is None or self._pid != os.getpid():
+            self._session = requests.Session()
+        body = gzip.compress(b"[" + b",".join(data.rstrip(b"\n") for data in batch) + b"]", compresslevel=5)
+        status = 0
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                response = self._session.post(self.url, data=body, headers=self.headers, timeout=self.timeout)
+            except requests.RequestException:
+                status = 0
+                continue
+            status = response.status_code
+            if not self._retryable(status):
+                break
+        return status
+
+    @staticmethod
+    def _retryable(status: int) -> bool:
+        """Return whether a post may succeed later.
+
+        Args:
+            status: The status of the response, ``0`` if the endpoint could not be reached.
+
+        Returns:
+            ``False`` for a success or a rejection of the payload or the token.
+        """
+        return status == 0 or status == 429 or status >= 500
+
+    def _reject(self, batch: list[bytes], status: int) -> None:
+        """Count the records of a rejected batch and report them on the console, retrying cannot help.
+
+        Args:
+            batch: The encoded records.
+            status: The status of the response.
+        """
+        self.rejected += len(batch)
+        self._write(self._warning_line(f"Logtail rejected {len(batch)} log records with HTTP {status}."))
+
+    def _spool(self, batch: list[bytes]) -> None:
+        """Append the batch to the spool file, or drop it if there is none or it is full.
+
+        Args:
+            batch: The encoded records.
+        """
+        data = b"".join(data.rstrip(b"\n") + b"\n" for data in batch)
+        try:
+            size = os.path.getsize(self.spool_path) if self.spool_path else 0
+        except OSError:
+            size = 0
+        if self.spool_path is None or size + len(data) > self.spool_max_bytes:
+            self.dropped += len(batch)
+            return
+        try:
+            with open(self.spool_path, "ab") as spool:
+                spool.write(data)
+        except OSError:
+            self.dropped += len(batch)
+
+    def _ship_spool(self) -> None:
+        """Ship the spooled records, keeping the ones that fail again."""
+        if self.spool_path is None or not os.path.exists(self.spool_path):
+            return
+        shipping = f"{self.spool_path}.{os.getpid()}"
+        try:
+            os.replace(self.spool_path, shipping)
+        except OSError:
+            return
+        with open(shipping, "rb") as spool:
+            lines = spool.read().splitlines()
+        os.remove(shipping)
+        for start in range(0, len(lines), self.batch_size):
+            batch = lines[start : start + self.batch_size]
+            status = self._post(batch)
+            if self._retryable(status):
+                self._spool(lines[start:])
+                return
+            if status >= 300:
+                self._reject(batch, status)
+
+
+class CallSiteLimiter:
+    """Loguru filter sampling and rate limiting the records per call site (file and line).
+
+    ``sample_every`` keeps one in N records of a call site for the given levels, ``rate_limits``
+    passes at most the given number of records per second of a call site, with bursts of ``burst``
+    records, using a token bucket. Every ``summary_interval`` seconds the suppressed counts are
+    logged as a single warning with the ``suppressed`` extra, which is never limited itself.
+
+    A single instance can filter several sinks, every record is decided once.
+    """
 
+    def __init__(
+        self,
+        sample_every: Optional[Mapping[str, int]] = None,
+        rate_limits: Optional[Mapping[str, float]] = None,
+        burst: int = 10,
+        summary_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            sample_every: The sampling of the call sites, by level name.
+            rate_limits: The maximum number of records per second of the call sites, by level name.
+            burst: The number of records a call site may log at once before the rate limit applies.
+            summary_interval: The number of seconds between the summaries of the suppressed records.
+            clock: The monotonic clock.
+        """
+        self.sample_every = {name.upper(): every for name, every in (sample_every or {}).items()}
+        self.rate_limits = {name.upper(): rate for name, rate in (rate_limits or {}).items()}
+        self.burst = burst
+        self.summary_interval = summary_interval
+        self.clock = clock
+        self.suppressed: Counter[str] = Counter()
+        self._counts: Counter[tuple[str, int]] = Counter()
+        self._buckets: dict[tuple[str, int], list[float]] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_summary = clock() + summary_interval
+
+    def __call__(self, record: "loguru.Record") -> bool:
+        """Decide whether the record is logged.
+
+        Args:
+            record: Loguru record.
+
+        Returns:
+            Whether the record passes.
+        """
+        if "suppressed" in record["extra"]:
+            return True
+        local = self._local
+        if getattr(local, "record", None) is record:
+            return bool(local.passed)
+
+        level = record["level"].name
+        site = (record["file"].path, record["line"])
+        with self._lock:
+            passed = self._sample(level, site) and self._take(level, site)
+            if not passed:
+                self.suppressed[f"{site[0]}:{site[1]}"] += 1
+            summary = self._pop_summary()
+        local.record, local.passed = record, passed
+
+        if summary:
+            get_logger(__name__).bind(suppressed=summary).warning(
+                f"Suppressed {sum(summary.values())} log records from {len(summary)} call sites."
+            )
+        return passed
+
+    def _sample(self, level: str, site: tuple[str, int]) -> bool:
+        """Keep one in ``sample_every`` records of the call site.
+
+        Args:
+            level: The level name.
+            site: The call site.
+
+        Returns:
+            Whether the record is kept.
+        """
+        every = self.sample_every.get(level)
+        if not every or every <= 1:
+            return True
+        self._counts[site] += 1
+        return self._counts[site] % every == 1
+
+    def _take(self, level: str, site: tuple[str, int]) -> bool:
+        """Take a token from the bucket of the call site.
+
+        Args:
+            level: The level name.
+            site: The call site.
+
+        Returns:
+            Whether a token was available.
+        """
+        rate = self.rate_limits.get(level)
+        if not rate:
+            return True
+        now = self.clock()
+        bucket = self._buckets.setdefault(site, [float(self.burst), now])
+        bucket[0] = min(float(self.burst), bucket[0] + (now - bucket[1]) * rate)
+        bucket[1] = now
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    def _pop_summary(self) -> dict[str, int]:
+        """Return and reset the suppressed counts once the summary interval elapsed.
+
+        Returns:
+            The suppressed counts by call site, empty if the summary is not due.
+        """
+        if not self.suppressed or self.clock() < self._next_summary:
+            return {}
+        summary, self.suppressed = dict(self.suppressed), Counter()
+        self._next_summary = self.clock() + self.summary_interval
+        return summary
+
+
+def add_request_id(record: "loguru.Record") -> None:
+    """Add the correlation ID of the current request or task to the record.
+
+    Args:
+        record: Loguru record.
+    """
+    request_id = get_request_id()
+    if request_id is not None:
+        record["extra"].setdefault("request_id", request_id)
+
+
+async_sinks: list[AsyncSink] = []
+
+
+def flush_logs() -> None:
+    """Write or ship the records buffered by the asynchronous sinks, used on worker shutdown."""
+    for async_sink in async_sinks:
+        async_sink.stop()
+
+
+log_filter: Optional[CallSiteLimiter] = None
+if settings.LOG_SAMPLE_EVERY or settings.LOG_RATE_LIMITS:
+    log_filter = CallSiteLimiter(
+        sample_every=settings.LOG_SAMPLE_EVERY,
+        rate_limits=settings.LOG_RATE_LIMITS,
+        burst=settings.LOG_RATE_BURST,
+        summary_interval=settings.LOG_SUPPRESSED_SUMMARY_INTERVAL,
+    )
+
+logger.configure(patcher=add_request_id)
+
+console_sink: AsyncSink | Callable[["loguru.Message"], None]
+if settings.LOG_ASYNC:
+    console_sink = AsyncSink(
+        maxsize=settings.LOG_QUEUE_SIZE,
+        batch_size=settings.LOG_BATCH_SIZE,
+        overflow=settings.LOG_OVERFLOW,
+        sample_rate=settings.LOG_OVERFLOW_SAMPLE_RATE,
+    )
+    async_sinks.append(console_sink)
+else:
+    console_sink = sink
 
 # Add console handler with JSON formatting
 logger.add(
-    sink,
+    console_sink,
     level=settings.LOG_LEVEL,
+    filter=log_filter,
     serialize=False,  # We're already serializing in our formatter
     backtrace=True,
     diagnose=True,
 )
 if settings.LOGTAIL_ENABLED and settings.LOGTAIL_TOKEN:
-    try:
-        from logtail.handler import LogtailHandler
-
-        logtail_handler = LogtailHandler(source_token=settings.LOGTAIL_TOKEN)
-        logger.add(
-            logtail_handler,
-            level=settings.LOG_LEVEL.upper(),
-            format="{message}",
-            serialize=False,
-            backtrace=True,
-            diagnose=True,
-        )
-    except ImportError:
-        logger.warning("Logtail package not installed. Skipping Logtail integration.")
+    logtail_sink = LogtailSink(
+        settings.LOGTAIL_TOKEN,
+        host=settings.LOGTAIL_HOST,
+        spool_path=settings.LOGTAIL_SPOOL_PATH or None,
+        retries=settings.LOGTAIL_RETRIES,
+        batch_size=settings.LOGTAIL_BATCH_SIZE,
+        flush_interval=settings.LOGTAIL_FLUSH_INTERVAL,
+    )
+    async_sinks.append(logtail_sink)
+    logger.add(
+        logtail_sink,
+        level=settings.LOG_LEVEL.upper(),
+        filter=log_filter,
+        serialize=False,
+        backtrace=True,
+        diagnose=True,
+    )
+atexit.register(flush_logs)
 
 
 def get_logger(name: str) -> "loguru.Logger":
@@ -86,39 +769,96 @@ def get_logger(name: str) -> "loguru.Logger":
     Returns:
         The logger.
     """
-    return logger.bind(name=name)
+    return logger.bind(name=LoggerName(name))
 
 
 class InterceptHandler(logging.Handler):
-    """InterceptHandler for Django logging."""
+    """InterceptHandler for Django logging.
+
+    Forwards the standard library records to loguru, attributed to the code that logged them.
+    """
 
-    def __init__(self):
-        """Initialize the InterceptHandler."""
-        super().__init__()
+    def __init__(self, level: int | str = logging.NOTSET) -> None:
+        """Initialize the InterceptHandler.
+
+        Args:
+            level: The minimum level, ``LOG_LEVEL`` if not set.
+        """
+        super().__init__(level or settings.LOG_LEVEL.upper())
         self.logger = get_logger(__name__)
         self.formatter = None
-        self.level = settings.LOG_LEVEL.upper()
+        # The loguru sinks drop the records below ``LOG_LEVEL`` anyway, skip them before any work.
+        self.min_levelno = max(self.level, logging.getLevelNamesMapping().get(settings.LOG_LEVEL.upper(), 0))
+        self._levels: dict[str, str | int] = {}
+        self._depths: dict[tuple[str, str, int], int] = {}
 
-    def emit(self, record):
+    def emit(self, record: logging.LogRecord) -> None:
         """Emit the record.
 
         Args:
             record: Record.
         """
-        try:
-            level = self.logger.level(record.levelname).name
-        except ValueError:
-            level = record.levelno
+        if record.levelno < self.min_levelno:
+            return
+
+        level = self._levels.get(record.levelname)
+        if level is None:
+            try:
+                level = self.logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            self._levels[record.levelname] = level
+
+        self.logger.opt(depth=self._caller_depth(record), exception=record.exc_info).log(level, record.getMessage())
 
-        frame, depth = sys._getframe(6), 6
-        while frame and frame.f_code.co_filename == logging.__file__:
-            # frame = frame.f_back  # noqa
-            depth += 1
+    def _caller_depth(self, record: logging.LogRecord) -> int:
+        """Return the depth of the frame that logged the record, relative to ``emit``.
 
-        self.logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
+        The depth of a call site only depends on the path through the ``logging`` module, so it is
+        cached per logger and call site and only checked against the frame on the next records.
+
+        Args:
+            record: Record.
+
+        Returns:
+            The depth of the caller frame for ``logger.opt``.
+        """
+        key = (record.name, record.pathname, record.lineno)
+        depth = self._depths.get(key)
+        if depth is not None:
+            try:
+                frame = sys._getframe(depth + 1)
+            except ValueError:
+                pass
+            else:
+                if frame.f_code.co_filename == record.pathname and frame.f_lineno == record.lineno:
+                    return depth
+
+        # Walk out of this method, ``emit`` and the ``logging`` module frames.
+        depth = 1 + _logging_frames(sys._getframe(2))
+        self._depths[key] = depth
+        return depth
+
+
+def _logging_frames(frame: FrameType) -> int:
+    """Return the number of consecutive ``logging`` module frames from the frame outwards.
+
+    Args:
+        frame: The innermost frame.
+
+    Returns:
+        The number of frames.
+    """
+    count = 0
+    while frame.f_back is not None and frame.f_code.co_filename == logging.__file__:
+        frame = frame.f_back
+        count += 1
+    return count
 
 
-logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+intercept_handler = InterceptHandler()
+# The records below the handler level are never even created.
+logging.basicConfig(handlers=[intercept_handler], level=intercept_handler.level, force=True)
 
 for name in logging.root.manager.loggerDict.keys():
     logging.getLogger(name).handlers = []
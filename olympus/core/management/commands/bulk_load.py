@@ -0,0 +1,92 @@
+"""Load a JSON Lines or CSV file into a model table with PostgreSQL ``COPY``."""
+
+import csv
+import sys
+from typing import Any
+from typing import Iterator
+from typing import TextIO
+
+import orjson
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+from django.db import DEFAULT_DB_ALIAS
+
+from olympus.core.db.loading import bulk_load
+
+
+def read_rows(file: TextIO, fmt: str) -> Iterator[dict[str, Any]]:
+    """Read the rows of the file lazily.
+
+    Args:
+        file: The open file.
+        fmt: The format, ``jsonl`` or ``csv``.
+
+    Yields:
+        The rows keyed by field name or attname.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(file)
+    else:
+        for line in file:
+            if line.strip():
+                yield orjson.loads(line)
+
+
+class Command(BaseCommand):
+    """Bulk load command."""
+
+    help = "Load rows from a JSON Lines or CSV file into the table of a model with PostgreSQL COPY."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Add the command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument("model", help="The model label, e.g. crm.Contact.")
+        parser.add_argument("path", help="The file to load, - to read from the standard input.")
+        parser.add_argument("--format", choices=("jsonl", "csv"), help="The file format, guessed from the extension.")
+        parser.add_argument("--chunk-size", type=int, default=10_000, help="The number of rows serialized at a time.")
+        parser.add_argument(
+            "--merge-on",
+            nargs="+",
+            metavar="FIELD",
+            help="Upsert on these unique fields through a staging table instead of a plain insert.",
+        )
+        parser.add_argument("--database", default=DEFAULT_DB_ALIAS, help="The database alias.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Load the file.
+
+        Args:
+            *args: The positional arguments.
+            **options: The command options.
+
+        Raises:
+            CommandError: If the model does not exist.
+        """
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as error:
+            raise CommandError(f"Unknown model {options['model']!r}.") from error
+
+        path = options["path"]
+        fmt = options["format"] or ("csv" if path.endswith(".csv") else "jsonl")
+        with sys.stdin if path == "-" else open(path, newline="", encoding="utf-8") as file:
+            result = bulk_load(
+                model,
+                read_rows(file, fmt),
+                chunk_size=options["chunk_size"],
+                merge_on=options["merge_on"],
+                using=options["database"],
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {result.rows} rows into {model._meta.label} "
+                f"({result.inserted} inserted, {result.updated} updated) "
+                f"in {result.seconds:.2f}s, {result.rate:,.0f} rows/s."
+            )
+        )
@@ -0,0 +1,186 @@
+"""Olympus Middlewares.
+
+The middlewares support both the sync and the async request paths, so the async views served
+under ASGI run without a thread switch per middleware.
+"""
+
+import time
+from typing import Awaitable
+from typing import Callable
+
+from asgiref.sync import iscoroutinefunction
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest
+from django.http import HttpResponse
+
+from olympus.core.correlation import REQUEST_ID_HEADER
+from olympus.core.correlation import clean_request_id
+from olympus.core.correlation import new_request_id
+from olympus.core.correlation import request_id_context
+from olympus.core.db.routers import replica_routing
+from olympus.core.logger import get_logger
+from olympus.core.tenancy import tenant_context
+
+
+access_logger = get_logger("olympus.access")
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+GetResponse = Callable[[HttpRequest], HttpResponse] | Callable[[HttpRequest], Awaitable[HttpResponse]]
+
+
+class HybridMiddleware:
+    """Base of the middlewares running in the mode of the next handler of the chain."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: GetResponse) -> None:
+        """Initialize the middleware.
+
+        Args:
+            get_response: The next handler of the chain.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+
+class RequestIDMiddleware(HybridMiddleware):
+    """Assign the correlation ID of the request and log the request once it is answered.
+
+    A valid ``X-Request-ID`` of the client or the proxy is kept, a new ID is generated otherwise.
+    The ID is stored as ``request.request_id``, active in every log record and enqueued task of the
+    request and returned in the ``X-Request-ID`` header of the response. With ``LOG_ACCESS`` the
+    final line reports the method, the path, the status and the duration in milliseconds.
+    """
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        """Process the request inside the correlation context.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The response, or its coroutine in async mode.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        request_id = self.assign(request)
+        with request_id_context(request_id):
+            response = self.get_response(request)
+            self.finish(request, response, started)  # type: ignore[arg-type]
+        return response  # type: ignore[return-value]
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Process the request inside the correlation context, in async mode.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The response.
+        """
+        started = time.perf_counter()
+        request_id = self.assign(request)
+        with request_id_context(request_id):
+            response = await self.get_response(request)  # type: ignore[misc]
+            self.finish(request, response, started)
+        return response  # type: ignore[no-any-return]
+
+    def assign(self, request: HttpRequest) -> str:
+        """Return the correlation ID of the request, storing it as ``request.request_id``.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The ID.
+        """
+        request_id = clean_request_id(request.headers.get(REQUEST_ID_HEADER)) or new_request_id()
+        request.request_id = request_id  # type: ignore[attr-defined]
+        return request_id
+
+    def finish(self, request: HttpRequest, response: HttpResponse, started: float) -> None:
+        """Return the correlation ID to the client and log the access line.
+
+        Args:
+            request: The request.
+            response: The response.
+            started: The ``perf_counter`` at the start of the request.
+        """
+        response[REQUEST_ID_HEADER] = request.request_id  # type: ignore[attr-defined]
+        if settings.LOG_ACCESS:
+            duration_ms = round((time.perf_counter() - started) * 1000, 3)
+            access_logger.bind(
+                method=request.method,
+                path=request.path,
+                status=response.status_code,
+                duration_ms=duration_ms,
+            ).info(f"{request.method} {request.path} {response.status_code} {duration_ms}ms")
+
+
+class TenantContextMiddleware(HybridMiddleware):
+    """Activate ``request.tenant`` for the ORM scoping of the request."""
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        """Process the request inside the tenant context.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The response, or its coroutine in async mode.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with tenant_context(getattr(request, "tenant", None)):
+            return self.get_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Process the request inside the tenant context, in async mode.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The response.
+        """
+        with tenant_context(getattr(request, "tenant", None)):
+            return await self.get_response(request)  # type: ignore[no-any-return,misc]
+
+
+class ReplicaRoutingMiddleware(HybridMiddleware):
+    """Send the reads of the request to the read replicas until it writes.
+
+    The requests with an unsafe method are pinned to the primary from the start, so what they
+    read before writing is up to date.
+    """
+
+    def __call__(self, request: HttpRequest) -> HttpResponse | Awaitable[HttpResponse]:
+        """Process the request inside the replica routing context.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The response, or its coroutine in async mode.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with replica_routing(pinned=request.method not in SAFE_METHODS):
+            return self.get_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Process the request inside the replica routing context, in async mode.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The response.
+        """
+        with replica_routing(pinned=request.method not in SAFE_METHODS):
+            return await self.get_response(request)  # type: ignore[no-any-return,misc]
@@ -0,0 +1,155 @@
+"""Keyset (cursor) pagination backed by the ULID primary keys.
+
+Every page is fetched with ``WHERE (ordering) > (last position) ORDER BY ordering LIMIT n``,
+which is a range scan over the index, so deep pages cost the same as the first one and rows
+inserted concurrently never shift the pages.
+"""
+
+import base64
+from typing import Any
+from typing import Optional
+from typing import Sequence
+
+import orjson
+from django.core.exceptions import ValidationError
+from django.db.models import Model
+from django.db.models import Q
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+from rest_framework.utils.urls import replace_query_param
+
+
+class ULIDCursorPagination(CursorPagination):
+    """Keyset pagination over the lexicographically sortable ULID ``id``.
+
+    ``ordering`` must end with a unique field and use the same direction for every field,
+    e.g. ``("-id",)`` or ``("tenant_id", "id")`` to match a composite ``(tenant, id)`` index.
+    Rows with ``NULL`` in one of the ordering fields are not reachable through the cursor.
+    """
+
+    ordering: Sequence[str] = ("-id",)  # type: ignore[assignment]
+
+    def paginate_queryset(  # type: ignore[override]
+        self,
+        queryset: QuerySet[Any],
+        request: Request,
+        view: Any = None,
+    ) -> Optional[list[Any]]:
+        """Return the page of the queryset selected by the cursor of the request.
+
+        Args:
+            queryset: The queryset to paginate.
+            request: The request.
+            view: The view.
+
+        Returns:
+            The objects of the page, or ``None`` if the pagination is disabled.
+
+        Raises:
+            NotFound: If the cursor does not match the ordering fields.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.fields = [name.lstrip("-") for name in self.ordering]
+        position, self.reverse = self.decode_cursor(request)
+
+        descending = self.ordering[0].startswith("-") != self.reverse
+        queryset = queryset.order_by(*[f"-{name}" if descending else name for name in self.fields])
+        if position is not None:
+            try:
+                queryset = queryset.filter(self.keyset_filter(position, descending))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message) from None
+
+        results = list(queryset[: self.page_size + 1])
+        has_following = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = position is not None, has_following
+        else:
+            self.has_next, self.has_previous = has_following, position is not None
+
+        if (self.has_next or self.has_previous) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def keyset_filter(self, position: Sequence[Any], descending: bool) -> Q:
+        """Build the filter of the rows strictly after the position in the ordering.
+
+        Args:
+            position: The values of the ordering fields of the last seen row.
+            descending: Whether the rows are ordered in descending order.
+
+        Returns:
+            The ``(a > x) OR (a = x AND b > y) ...`` filter.
+        """
+        lookup = "lt" if descending else "gt"
+        keyset = Q()
+        for index, name in enumerate(self.fields):
+            equal = dict(zip(self.fields[:index], position[:index], strict=True))
+            keyset |= Q(**equal, **{f"{name}__{lookup}": position[index]})
+        return keyset
+
+    def get_next_link(self) -> Optional[str]:
+        """Return the link to the next page.
+
+        Returns:
+            The link, or ``None`` if this is the last page.
+        """
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        """Return the link to the previous page.
+
+        Returns:
+            The link, or ``None`` if this is the first page.
+        """
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_link(self.page[0], reverse=True)
+
+    def encode_link(self, instance: Model | dict[str, Any], reverse: bool) -> str:
+        """Build the link with the opaque cursor pointing at the instance.
+
+        Args:
+            instance: The model instance or the dict of values.
+            reverse: Whether the cursor walks backwards.
+
+        Returns:
+            The link.
+        """
+        position = [instance[name] if isinstance(instance, dict) else getattr(instance, name) for name in self.fields]
+        payload = orjson.dumps([reverse, position], default=str)
+        token = base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+        return str(replace_query_param(self.base_url, self.cursor_query_param, token))
+
+    def decode_cursor(self, request: Request) -> tuple[Optional[list[Any]], bool]:  # type: ignore[override]
+        """Decode the cursor of the request.
+
+        Args:
+            request: The request.
+
+        Returns:
+            The position and the direction, ``(None, False)`` for the first page.
+
+        Raises:
+            NotFound: If the cursor is malformed.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            reverse, position = orjson.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message) from None
+        if not isinstance(reverse, bool) or not isinstance(position, list) or len(position) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
@@ -0,0 +1,49 @@
+"""JSON parsing of the API requests with orjson."""
+
+import codecs
+from typing import IO
+from typing import Any
+from typing import Mapping
+from typing import Optional
+
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+
+class ORJSONParser(BaseParser):
+    """Parser of the ``application/json`` requests, a drop-in replacement of the DRF ``JSONParser``.
+
+    Like the strict DRF parser, ``NaN`` and ``Infinity`` are rejected.
+    """
+
+    media_type = "application/json"
+
+    def parse(
+        self,
+        stream: IO[bytes],
+        media_type: Optional[str] = None,
+        parser_context: Optional[Mapping[str, Any]] = None,
+    ) -> Any:
+        """Parse the JSON body of the request.
+
+        Args:
+            stream: The body of the request.
+            media_type: The media type of the request.
+            parser_context: The context of the view.
+
+        Returns:
+            The parsed data.
+
+        Raises:
+            ParseError: If the body is not valid JSON in the charset of the request.
+        """
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        try:
+            body: bytes | str = stream.read()
+            if codecs.lookup(encoding).name != "utf-8":
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (LookupError, UnicodeDecodeError, orjson.JSONDecodeError) as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
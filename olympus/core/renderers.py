@@ -0,0 +1,159 @@
+"""JSON rendering of the API responses with orjson.
+
+orjson encodes the dicts, lists, strings, numbers, datetimes and UUIDs of the serializer output
+natively, only the remaining types go through :func:`encode_default`: ULIDs, decimals and the
+few types the DRF encoder knows about. Large lists are rendered in batches by
+:func:`iter_json_array` to be streamed, see :class:`olympus.core.views.StreamingListMixin`.
+"""
+
+import datetime
+import decimal
+import ipaddress
+from itertools import islice
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import Optional
+
+import orjson
+from django.db.models import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from django.utils.http import parse_header_parameters
+from rest_framework.renderers import BaseRenderer
+from ulid import ULID
+
+
+# Datetimes in UTC end with "Z" like with the DRF encoder.
+OPTIONS = orjson.OPT_UTC_Z
+
+IP_TYPES = (
+    ipaddress.IPv4Address,
+    ipaddress.IPv6Address,
+    ipaddress.IPv4Network,
+    ipaddress.IPv6Network,
+    ipaddress.IPv4Interface,
+    ipaddress.IPv6Interface,
+)
+
+
+def encode_default(obj: Any) -> Any:
+    """Convert a value orjson does not encode natively, like the DRF encoder does.
+
+    Args:
+        obj: The value.
+
+    Returns:
+        The JSON compatible value.
+
+    Raises:
+        TypeError: If the value cannot be encoded.
+    """
+    if isinstance(obj, (ULID, Promise, *IP_TYPES)):
+        return force_str(obj)
+    if isinstance(obj, decimal.Decimal):
+        # A float like the DRF encoder, the serializer fields already coerce them to strings by default.
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if isinstance(obj, (QuerySet, set, frozenset)) or hasattr(obj, "__next__"):
+        return list(obj)
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """Encode the data with the options of the renderer.
+
+    Args:
+        data: The data.
+        indent: Whether to indent the output with 2 spaces.
+
+    Returns:
+        The encoded JSON.
+    """
+    return orjson.dumps(data, default=encode_default, option=(OPTIONS | orjson.OPT_INDENT_2) if indent else OPTIONS)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Renderer of the ``application/json`` responses, a drop-in replacement of the DRF ``JSONRenderer``.
+
+    The output is always compact and UTF-8 encoded, an ``indent`` parameter of the accepted media
+    type, e.g. ``application/json; indent=4``, indents it with 2 spaces.
+    """
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        """Render the data into JSON.
+
+        Args:
+            data: The serialized data.
+            accepted_media_type: The accepted media type, with its parameters.
+            renderer_context: The context of the view.
+
+        Returns:
+            The encoded JSON, empty for ``None``.
+        """
+        if data is None:
+            return b""
+        return dumps(data, indent=self.get_indent(accepted_media_type, renderer_context or {}))
+
+    def get_indent(self, accepted_media_type: Optional[str], renderer_context: Mapping[str, Any]) -> bool:
+        """Return whether the client asked for an indented output.
+
+        Args:
+            accepted_media_type: The accepted media type, with its parameters.
+            renderer_context: The context of the view.
+
+        Returns:
+            ``True`` if the media type or the context has a non-zero ``indent``.
+        """
+        indent = renderer_context.get("indent")
+        if accepted_media_type:
+            indent = parse_header_parameters(accepted_media_type)[1].get("indent", indent)
+        try:
+            return int(indent or 0) > 0
+        except (TypeError, ValueError):
+            return False
+
+
+def iter_json_array(
+    items: Iterable[Any],
+    serialize: Callable[[list[Any]], list[Any]],
+    batch_size: int = 500,
+) -> Iterator[bytes]:
+    """Render a JSON array batch by batch, to stream a list too large to be held as one response.
+
+    Args:
+        items: The items, e.g. the ``iterator()`` of a queryset.
+        serialize: The function converting a batch of items into a list of JSON compatible values.
+        batch_size: The number of items serialized and encoded at once.
+
+    Yields:
+        The chunks of the encoded array.
+    """
+    iterator = iter(items)
+    yield b"["
+    separator = b""
+    while batch := list(islice(iterator, batch_size)):
+        encoded = dumps(serialize(batch))
+        if len(encoded) > 2:
+            # Drops the brackets of the batch and joins it to the previous one.
+            yield separator + encoded[1:-1]
+            separator = b","
+    yield b"]"
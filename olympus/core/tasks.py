@@ -0,0 +1,36 @@
+"""Core Celery tasks."""
+
+from celery import shared_task
+from django.apps import apps
+from django.db import connections
+from django.db import router
+
+from olympus.core.db.partitioning import RangePartitioning
+from olympus.core.db.partitioning import roll_partitions as roll_model_partitions
+from olympus.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+@shared_task
+def roll_partitions() -> dict[str, dict[str, list[str]]]:
+    """Pre-create the future range partitions and detach the expired ones of every partitioned model.
+
+    Scheduled daily by the ``chronos`` beat.
+
+    Returns:
+        The created and detached partitions per model label.
+    """
+    result = {}
+    for model in apps.get_models():
+        partitioning = getattr(model, "partitioning", None)
+        if not isinstance(partitioning, RangePartitioning):
+            continue
+        connection = connections[router.db_for_write(model)]
+        with connection.schema_editor() as schema_editor:
+            created, detached = roll_model_partitions(schema_editor, model, partitioning)
+        if created or detached:
+            logger.info(f"Rolled partitions of {model._meta.label}: created {created}, detached {detached}")
+        result[model._meta.label] = {"created": created, "detached": detached}
+    return result
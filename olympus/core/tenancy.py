@@ -0,0 +1,40 @@
+"""Current tenant of the request or the task.
+
+The tenant is kept in a context variable, so it follows the code across threads and
+coroutines of the same request without being passed around explicitly.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+from typing import Iterator
+from typing import Optional
+
+
+_current_tenant: ContextVar[Optional[Any]] = ContextVar("olympus_current_tenant", default=None)
+
+
+def get_current_tenant() -> Optional[Any]:
+    """Return the current tenant.
+
+    Returns:
+        The tenant instance or primary key, ``None`` outside of a tenant context.
+    """
+    return _current_tenant.get()
+
+
+@contextmanager
+def tenant_context(tenant: Optional[Any]) -> Iterator[None]:
+    """Activate the tenant for the duration of the context.
+
+    Args:
+        tenant: The tenant instance or primary key, ``None`` disables the scoping.
+
+    Yields:
+        Nothing, the tenant is active while the context is.
+    """
+    token = _current_tenant.set(tenant)
+    try:
+        yield
+    finally:
+        _current_tenant.reset(token)
@@ -0,0 +1,54 @@
+"""Shared fixtures for the core tests."""
+
+import pytest
+from django.db import connection
+from django.db import models
+
+from olympus.core.behaviours import Timable
+from olympus.core.behaviours import ULIDable
+from olympus.core.db.managers import CachedCRMManager
+from olympus.core.db.managers import CRMManager
+from olympus.core.db.managers import UnscopedCRMManager
+
+
+class Item(ULIDable):
+    """Concrete ULID model for the tests."""
+
+    name = models.CharField(max_length=32, default="")
+
+    class Meta:
+        """Meta class for the model."""
+
+        app_label = "core"
+
+
+class Record(ULIDable, Timable):
+    """Concrete CRM-like model for the tests, with a plain tenant column."""
+
+    tenant = models.CharField(max_length=32, null=True)
+    name = models.CharField(max_length=32, default="")
+
+    objects = CRMManager()
+    unscoped = UnscopedCRMManager()
+    cached = CachedCRMManager()
+
+    class Meta:
+        """Meta class for the model."""
+
+        app_label = "core"
+
+
+@pytest.fixture
+def item_table(db):
+    """Create the table of the test model."""
+    with connection.schema_editor() as editor:
+        editor.create_model(Item)
+    yield Item
+
+
+@pytest.fixture
+def record_table(db):
+    """Create the table of the CRM-like test model."""
+    with connection.schema_editor() as editor:
+        editor.create_model(Record)
+    yield Record
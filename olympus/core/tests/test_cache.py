@@ -0,0 +1,112 @@
+"""Tests for the two-tier cache and the caching helpers."""
+
+import threading
+import time
+
+import pytest
+from django.core.cache import caches
+
+from olympus.core.cache import TieredCache
+from olympus.core.cache import get_many
+from olympus.core.cache import get_or_compute
+from olympus.core.cache import set_many
+from olympus.core.cache import tenant_key
+from olympus.core.tenancy import tenant_context
+
+
+@pytest.fixture
+def cache():
+    """A tiered cache of 2 local entries in front of the shared cache, emptied after the test."""
+    cache = TieredCache("shared", {"KEY_PREFIX": "olympus", "OPTIONS": {"LOCAL_MAX_ENTRIES": 2, "LOCAL_TIMEOUT": 60}})
+    yield cache
+    cache.clear()
+
+
+def test_values_are_served_from_the_process(cache):
+    """Test a value read or written once is served locally, and the least recently used evicted."""
+    shared = caches["shared"]
+    cache.set("a", {"deals": 1})
+    shared.set("b", 2)
+    assert cache.get("b") == 2
+
+    shared.delete_many(["a", "b"])
+    value = cache.get("a")
+    value["deals"] = 2
+    assert cache.get("a") == {"deals": 1}
+    assert cache.get("b") == 2
+
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get_many(["b", "c"]) == {"b": 2, "c": 3}
+
+
+def test_local_values_expire(cache):
+    """Test a local value is not served past LOCAL_TIMEOUT, nor past its own timeout."""
+    cache.local_timeout = 0.05
+    cache.set("a", 1)
+    cache.set("b", 2, timeout=0)
+    caches["shared"].set("a", 10)
+
+    time.sleep(0.06)
+
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+def test_tenant_keys_and_bulk_helpers(cache):
+    """Test the bulk helpers namespace the keys by the current tenant."""
+    with tenant_context("acme"):
+        assert tenant_key("deals") == "tenant:acme:deals"
+        assert set_many({"deals": 1, "contacts": 2}, cache=cache) == []
+        assert get_many(["deals", "contacts", "leads"], cache=cache) == {"deals": 1, "contacts": 2}
+
+    with tenant_context("globex"):
+        assert get_many(["deals"], cache=cache) == {}
+    assert tenant_key("deals") == "tenant:-:deals"
+
+
+def test_get_or_compute_coalesces_the_callers(cache):
+    """Test concurrent callers of a missing key compute it once."""
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.1)
+        return "totals"
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(get_or_compute("totals", compute, cache=cache)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["totals"] * 8
+    assert len(calls) == 1
+
+
+def test_get_or_compute_refreshes_early(cache):
+    """Test a value close to its expiry is recomputed early, or served stale while another process does."""
+    cache.set("totals", ("old", 60.0, time.time() + 1))
+
+    assert get_or_compute("totals", lambda: "new", beta=0, cache=cache) == "old"
+    cache.add("totals:lock", 1)
+    assert get_or_compute("totals", lambda: "new", beta=100, cache=cache) == "old"
+    cache.delete("totals:lock")
+    assert get_or_compute("totals", lambda: "new", beta=100, cache=cache) == "new"
+
+
+def test_get_or_compute_leaves_the_lock_of_another_process(cache):
+    """Test a caller whose wait for the lock timed out computes without releasing the lock it does not hold."""
+    cache.add("totals:lock", "other")
+
+    assert get_or_compute("totals", lambda: "new", lock_timeout=0.1, cache=cache) == "new"
+    assert cache.shared.get("totals:lock") == "other"
+
+    cache.delete("totals:lock")
+    cache.delete("totals")
+    assert get_or_compute("totals", lambda: "own", cache=cache) == "own"
+    assert cache.get("totals:lock") is None
@@ -0,0 +1,90 @@
+"""Tests for the request correlation ID."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+from celery.app.task import Context
+from django.http import HttpResponse
+from django.test import RequestFactory
+from loguru import logger as loguru_logger
+
+from config.celery import clear_request_id
+from config.celery import restore_request_id
+from config.celery import send_request_id
+from olympus.core.correlation import get_request_id
+from olympus.core.correlation import request_id_context
+from olympus.core.logger import get_logger
+from olympus.core.middleware import RequestIDMiddleware
+
+
+@pytest.fixture
+def records():
+    """Capture the loguru records."""
+    captured = []
+    handler_id = loguru_logger.add(lambda message: captured.append(message.record), level="DEBUG")
+    yield captured
+    loguru_logger.remove(handler_id)
+
+
+def _view(request):
+    get_logger("olympus.tests").info("handled")
+    return HttpResponse(status=201)
+
+
+@pytest.mark.parametrize(
+    ("header", "kept"),
+    [("edge-7f3a:1", True), ("forged\nline", False), ("x" * 200, False), (None, False)],
+)
+def test_middleware_tags_the_request_logs(settings, records, header, kept):
+    """Test a valid incoming ID is kept, a missing or unsafe one replaced, and the access line is timed."""
+    settings.LOG_ACCESS = True
+    headers = {"HTTP_X_REQUEST_ID": header} if header else {}
+    request = RequestFactory().get("/deals/", **headers)
+
+    response = RequestIDMiddleware(_view)(request)
+
+    request_id = response["X-Request-ID"]
+    assert (request_id == header) is kept
+    assert request.request_id == request_id
+    handled, access = records
+    assert handled["extra"]["request_id"] == access["extra"]["request_id"] == request_id
+    assert access["extra"]["status"] == 201
+    assert access["extra"]["duration_ms"] >= 0
+    assert access["message"].startswith("GET /deals/ 201 ")
+    assert get_request_id() is None
+
+
+def test_middleware_async_mode(records):
+    """Test the middleware awaits an async chain inside the correlation context."""
+
+    async def view(request):
+        get_logger("olympus.tests").info("handled")
+        return HttpResponse()
+
+    middleware = RequestIDMiddleware(view)
+    response = asyncio.run(middleware(RequestFactory().get("/", HTTP_X_REQUEST_ID="edge-1")))
+
+    assert iscoroutinefunction(middleware)
+    assert response["X-Request-ID"] == "edge-1"
+    assert records[0]["extra"]["request_id"] == "edge-1"
+
+
+def test_request_id_travels_with_the_tasks():
+    """Test the ID is sent in the task headers and restored around the task in the worker."""
+    headers = {}
+    with request_id_context("req-1"):
+        send_request_id(headers=headers)
+    assert headers == {"request_id": "req-1"}
+
+    task = SimpleNamespace(request=Context(id="task-1", **headers))
+    restore_request_id(task_id="task-1", task=task)
+    assert get_request_id() == "req-1"
+    clear_request_id(task=task)
+    assert get_request_id() is None
+
+    task = SimpleNamespace(request=Context(id="task-2"))
+    restore_request_id(task_id="task-2", task=task)
+    assert get_request_id() == "task-2"
+    clear_request_id(task=task)
@@ -0,0 +1,162 @@
+"""Tests for the ULID model fields."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from django.db import connection
+from django.db import migrations
+from django.db import models
+from django.db.migrations.state import ProjectState
+from ulid import ULID
+
+from olympus.core.db.fields import BinaryULIDField
+from olympus.core.db.fields import BinaryULIDPrimaryKeyField
+from olympus.core.db.fields import ULIDField
+from olympus.core.db.fields import ULIDPrimaryKeyField
+from olympus.core.db.operations import ConvertULIDStorage
+from olympus.core.db.ulids import LazyULID
+from olympus.core.db.ulids import MonotonicULIDGenerator
+
+
+@pytest.mark.parametrize(
+    "vendor,db_type,db_value",
+    [
+        ("postgresql", "uuid", lambda value: value.to_uuid()),
+        ("sqlite", "binary(16)", lambda value: value.bytes),
+    ],
+)
+def test_binary_ulid_field_round_trip(vendor, db_type, db_value):
+    """Test the binary field converts ULIDs to the backend representation and back."""
+    field = BinaryULIDField()
+    backend = MagicMock(vendor=vendor)
+    value = ULID()
+
+    assert field.db_type(backend) == db_type
+    assert field.get_db_prep_value(value, backend) == db_value(value)
+    assert field.get_db_prep_value(str(value), backend) == db_value(value)
+    assert field.from_db_value(db_value(value), None, backend) == value
+    assert field.from_db_value(None, None, backend) is None
+
+
+def test_binary_ulid_field_accepts_memoryview():
+    """Test the binary field reads ``bytea`` style buffers."""
+    value = ULID()
+
+    assert BinaryULIDField().to_python(memoryview(value.bytes)) == value
+
+
+def test_binary_ulid_primary_key_field_deconstruct():
+    """Test the binary primary key keeps the defaults out of migrations."""
+    name, path, args, kwargs = BinaryULIDPrimaryKeyField().deconstruct()
+
+    assert path == "olympus.core.db.fields.BinaryULIDPrimaryKeyField"
+    assert kwargs == {}
+
+
+def test_lazy_ulid_decodes_on_demand():
+    """Test the lazy ULID behaves like the eager one and decodes only when needed."""
+    value = ULID()
+    lazy = LazyULID(str(value))
+
+    assert str(lazy) == str(value)
+    assert lazy == LazyULID(str(value))
+    assert lazy == str(value)
+    assert "bytes" not in lazy.__dict__
+
+    assert lazy == value
+    assert hash(lazy) == hash(value)
+    assert lazy.datetime == value.datetime
+
+    values = [ULID.from_timestamp(timestamp) for timestamp in (3, 1, 2)]
+    assert [str(item) for item in sorted(LazyULID(str(item)) for item in values)] == [
+        str(item) for item in sorted(values)
+    ]
+
+
+def test_ulid_field_from_db_value_modes():
+    """Test the eager, lazy and cached decoding of the database values."""
+    value = str(ULID())
+    eager = ULIDField(lazy=False, decode_cache_size=0)
+    lazy = ULIDField(lazy=True, decode_cache_size=0)
+    cached = ULIDField(lazy=False, decode_cache_size=128)
+    foreign_key_column = MagicMock(target=object())
+
+    assert type(eager.from_db_value(value, None, connection)) is ULID
+    assert type(lazy.from_db_value(value, None, connection)) is LazyULID
+    assert cached.from_db_value(value, foreign_key_column, connection) is cached.from_db_value(
+        value, foreign_key_column, connection
+    )
+    assert cached.from_db_value(value, None, connection) is not cached.from_db_value(value, None, connection)
+
+
+def test_monotonic_ulid_generator():
+    """Test the generated ULIDs are strictly increasing within and across batches."""
+    generator = MonotonicULIDGenerator()
+    values = generator.batch(1000) + generator.batch(1000) + [generator()]
+
+    assert all(left < right for left, right in zip(values, values[1:]))
+    assert all(int(right) - int(left) == 1 for left, right in zip(values[:999], values[1:1000]))
+
+
+def test_ulid_primary_key_keeps_assigned_value():
+    """Test the primary key is generated only when the object has none."""
+    field = ULIDPrimaryKeyField()
+    field.attname = "id"
+    assigned = ULID()
+
+    assert field.pre_save(MagicMock(id=assigned), add=True) is assigned
+    assert isinstance(field.pre_save(MagicMock(id=None), add=True), ULID)
+
+
+def _apply(operations, state, backwards=False):
+    """Apply migration operations to the database and return the new state."""
+    new_state = state.clone()
+    for operation in operations:
+        operation.state_forwards("core", new_state)
+    with connection.schema_editor() as editor:
+        for operation in operations:
+            if backwards:
+                operation.database_backwards("core", editor, new_state, state)
+            else:
+                operation.database_forwards("core", editor, state, new_state)
+    return new_state
+
+
+def _fetch(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(sql)
+        return cursor.fetchall()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_convert_ulid_storage():
+    """Test the char columns are converted to uuid with their foreign keys and back."""
+    create = [
+        migrations.CreateModel("Parent", [("id", ULIDPrimaryKeyField())]),
+        migrations.CreateModel(
+            "Child",
+            [
+                ("id", ULIDPrimaryKeyField()),
+                ("parent", models.ForeignKey("core.Parent", on_delete=models.CASCADE)),
+            ],
+        ),
+    ]
+    convert = [ConvertULIDStorage("parent", "id", BinaryULIDPrimaryKeyField())]
+    state = _apply(create, ProjectState())
+    parent, child = ULID(), ULID()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("INSERT INTO core_parent (id) VALUES (%s)", [str(parent)])
+            cursor.execute("INSERT INTO core_child (id, parent_id) VALUES (%s, %s)", [str(child), str(parent)])
+
+        converted = _apply(convert, state)
+        assert _fetch("SELECT id FROM core_parent") == [(parent.to_uuid(),)]
+        assert _fetch("SELECT parent_id FROM core_child") == [(parent.to_uuid(),)]
+
+        _apply(convert, state, backwards=True)
+        assert _fetch("SELECT id FROM core_parent") == [(str(parent),)]
+        assert _fetch("SELECT parent_id FROM core_child") == [(str(parent),)]
+        assert isinstance(converted.apps.get_model("core", "Parent")._meta.pk, BinaryULIDPrimaryKeyField)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS core_child, core_parent CASCADE")
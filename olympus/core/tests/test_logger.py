@@ -1,14 +1,32 @@
 """Tests for the application logger."""
 
+import gzip
+import io
 import json
 import logging
+import sys
+import threading
+import time
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler
+from http.server import HTTPServer
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 from loguru import logger as loguru_logger
 
+from olympus.core.logger import AsyncSink
+from olympus.core.logger import CallSiteLimiter
 from olympus.core.logger import InterceptHandler
+from olympus.core.logger import LoggerName
+from olympus.core.logger import LogtailSink
+from olympus.core.logger import _logging_frames
+from olympus.core.logger import encode
+from olympus.core.logger import get_logger
 from olympus.core.logger import serialize
 from olympus.core.logger import sink
 
@@ -17,13 +35,13 @@ from olympus.core.logger import sink
 def sample_record():
     """Create a sample loguru record for testing."""
     return {
-        "time": MagicMock(timestamp=lambda: 1609459200.0, isoformat=lambda: "2021-01-01T00:00:00"),
-        "level": MagicMock(name="INFO"),
+        "time": datetime(2021, 1, 1, tzinfo=dt_timezone.utc),
+        "level": SimpleNamespace(name="INFO", no=logging.INFO),
         "message": "Test message",
         "name": "test_logger",
         "function": "test_function",
         "line": 42,
-        "file": MagicMock(path="/path/to/file.py"),
+        "file": SimpleNamespace(path="/path/to/file.py"),
         "exception": None,
         "extra": {"user_id": 123},
     }
@@ -33,14 +51,14 @@ def sample_record():
 def sample_record_with_exception():
     """Create a sample loguru record with exception for testing."""
     record = {
-        "time": MagicMock(timestamp=lambda: 1609459200.0, isoformat=lambda: "2021-01-01T00:00:00"),
-        "level": MagicMock(name="ERROR"),
+        "time": datetime(2021, 1, 1, tzinfo=dt_timezone.utc),
+        "level": SimpleNamespace(name="ERROR", no=logging.ERROR),
         "message": "Test error message",
         "name": "test_logger",
         "function": "test_function",
         "line": 42,
-        "file": MagicMock(path="/path/to/file.py"),
-        "exception": {"type": "ValueError", "value": "Test error", "traceback": "..."},
+        "file": SimpleNamespace(path="/path/to/file.py"),
+        "exception": SimpleNamespace(type=ValueError, value=ValueError("Test error"), traceback=None),
         "extra": {},
     }
     return record
@@ -52,7 +70,7 @@ def test_serialize(sample_record):
     data = json.loads(serialized)
 
     assert data["timestamp"] == 1609459200.0
-    assert data["time"] == "2021-01-01T00:00:00"
+    assert data["time"] == "2021-01-01T00:00:00+00:00"
     assert data["level"] == "INFO"
     assert data["message"] == "Test message"
     assert data["name"] == "test_logger"
@@ -74,6 +92,42 @@ def test_serialize_with_exception(sample_record_with_exception):
     assert data["exception"]["value"] == "Test error"
 
 
+def test_encode_matches_the_formatted_time(sample_record):
+    """Test the cached second formatting agrees with ``isoformat()`` across seconds and fractions."""
+    for value in (
+        datetime(2021, 1, 1, 0, 0, 0, 250000, tzinfo=dt_timezone.utc),
+        datetime(2021, 1, 1, 0, 0, 0, tzinfo=dt_timezone.utc),
+        datetime(2021, 1, 1, 0, 0, 1, 7, tzinfo=dt_timezone.utc),
+    ):
+        data = json.loads(encode({**sample_record, "time": value}))
+        assert (data["timestamp"], data["time"]) == (value.timestamp(), value.isoformat())
+
+
+def test_encode_extra(sample_record):
+    """Test the encoded records end with a newline and keep unhashable or non JSON extra values."""
+    encoded = encode({**sample_record, "extra": {"ids": [1, 2], "path": Path("/tmp")}})
+
+    assert encoded.endswith(b"}\n")
+    assert json.loads(encoded)["extra"] == {"ids": [1, 2], "path": "/tmp"}
+    assert b"extra" not in encode({**sample_record, "extra": {}})
+
+
+def test_encode_extra_of_a_named_logger(sample_record):
+    """Test the pre-encoded extra of a logger from get_logger matches the encoding of a plain name."""
+    records = []
+    handler = loguru_logger.add(records.append, format="{message}")
+    try:
+        get_logger("olympus.deals").bind(tenant="acme").info("bound")
+        get_logger("olympus.deals").info("named")
+    finally:
+        loguru_logger.remove(handler)
+
+    bound, named = (message.record["extra"] for message in records)
+    assert type(named["name"]) is LoggerName
+    assert encode({**sample_record, "extra": named}) == encode({**sample_record, "extra": {"name": "olympus.deals"}})
+    assert json.loads(encode({**sample_record, "extra": bound}))["extra"] == {"name": "olympus.deals", "tenant": "acme"}
+
+
 @patch("sys.stdout")
 def test_sink(mock_stdout, sample_record):
     """Test the sink function."""
@@ -88,35 +142,70 @@ def test_sink(mock_stdout, sample_record):
 
 
 def test_intercept_handler():
-    """Test the InterceptHandler."""
+    """Test the InterceptHandler forwards the level, the message and the exception."""
     handler = InterceptHandler()
-
-    # Test basic properties
     assert isinstance(handler, logging.Handler)
 
-    # Test emit method with a standard logging record
-    with patch.object(loguru_logger, "opt", return_value=loguru_logger) as mock_opt:
-        with patch.object(loguru_logger, "log") as mock_log:
-            record = logging.LogRecord(
-                name="test_logger",
-                level=logging.INFO,
-                pathname="/path/to/file.py",
-                lineno=42,
-                msg="Test message",
-                args=(),
-                exc_info=None,
-            )
+    with patch.object(handler, "logger") as mock_logger:
+        mock_logger.level.return_value.name = "INFO"
+        record = logging.LogRecord(
+            name="test_logger",
+            level=logging.INFO,
+            pathname="/path/to/file.py",
+            lineno=42,
+            msg="Test %s",
+            args=("message",),
+            exc_info=None,
+        )
+
+        handler.emit(record)
+
+    assert set(mock_logger.opt.call_args.kwargs) == {"depth", "exception"}
+    assert mock_logger.opt.call_args.kwargs["exception"] is None
+    mock_logger.opt.return_value.log.assert_called_once_with("INFO", "Test message")
+
+
+@pytest.fixture
+def intercepted():
+    """A standard library logger forwarding to its own InterceptHandler, and the loguru records."""
+    handler = InterceptHandler(logging.DEBUG)
+    handler.min_levelno = logging.INFO
+    std_logger = logging.getLogger("olympus.tests.intercept")
+    std_logger.handlers, std_logger.propagate, std_logger.level = [handler], False, logging.DEBUG
+    records = []
+    sink_id = loguru_logger.add(lambda message: records.append(message.record), level="DEBUG")
+    yield std_logger, handler, records
+    loguru_logger.remove(sink_id)
+    std_logger.handlers, std_logger.propagate = [], True
+
+
+def test_intercept_handler_attributes_the_caller(intercepted):
+    """Test the records point at the caller, and the caller depth is found once per call site."""
+    std_logger, handler, records = intercepted
+
+    with patch("olympus.core.logger._logging_frames", wraps=_logging_frames) as walk:
+        for index in range(3):
+            std_logger.info("deal %s updated", index)
+            line = sys._getframe().f_lineno - 1
 
-            handler.emit(record)
+    assert [(record["function"], record["line"]) for record in records] == [
+        ("test_intercept_handler_attributes_the_caller", line)
+    ] * 3
+    assert [record["message"] for record in records] == [f"deal {index} updated" for index in range(3)]
+    assert walk.call_count == 1
+    assert list(handler._depths) == [("olympus.tests.intercept", __file__, line)]
 
-            # Verify that logger.opt was called with the right parameters
-            mock_opt.assert_called_once()
-            assert "depth" in mock_opt.call_args[1]
-            assert "exception" in mock_opt.call_args[1]
-            assert mock_opt.call_args[1]["exception"] is None
 
-            # Verify that log was called with the right level and message
-            mock_log.assert_called_once_with("INFO", "Test message")
+def test_intercept_handler_skips_the_disabled_levels(intercepted):
+    """Test the records below LOG_LEVEL are dropped before the frame walk."""
+    std_logger, handler, records = intercepted
+
+    with patch("olympus.core.logger._logging_frames", wraps=_logging_frames) as walk:
+        std_logger.debug("contact fetched")
+
+    assert records == []
+    walk.assert_not_called()
+    assert handler._depths == {}
 
 
 @pytest.mark.django_db
@@ -140,46 +229,184 @@ def test_django_logging_integration():
             mock_log.assert_called()
 
 
-@pytest.mark.django_db
-def test_logtail_integration(settings):
-    """Test Logtail integration."""
-    # Test with Logtail enabled
-    with patch("olympus.core.logger.LogtailHandler") as mock_handler:
-        with patch.object(loguru_logger, "add") as mock_add:
-            # Enable Logtail
-            settings.LOGTAIL_ENABLED = True
-            settings.LOGTAIL_TOKEN = "test_token"
-
-            # Re-import to trigger the Logtail setup
-            from importlib import reload
+class LogtailStub(BaseHTTPRequestHandler):
+    """Ingestion endpoint stub recording the posted batches."""
 
-            from olympus.core import logger
+    batches = []
+    statuses = []
 
-            reload(logger)
+    def do_POST(self):  # noqa: N802
+        """Record the batch and answer with the next status."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        status = self.statuses.pop(0) if self.statuses else 202
+        if status < 300:
+            self.batches.append(json.loads(gzip.decompress(body)))
+        self.send_response(status)
+        self.end_headers()
 
-            # Verify that LogtailHandler was created with the right token
-            mock_handler.assert_called_once_with(source_token="test_token")
+    def log_message(self, *args):
+        """Keep the test output quiet."""
 
-            # Verify that logger.add was called for the Logtail handler
-            assert mock_add.call_count >= 1
 
-
-@pytest.mark.django_db
-def test_logtail_import_error(settings):
-    """Test handling of Logtail import error."""
-    # Test with Logtail enabled but import error
-    with patch("olympus.core.logger.LogtailHandler", side_effect=ImportError):
-        with patch.object(loguru_logger, "warning") as mock_warning:
-            # Enable Logtail
-            settings.LOGTAIL_ENABLED = True
-            settings.LOGTAIL_TOKEN = "test_token"
-
-            # Re-import to trigger the Logtail setup
-            from importlib import reload
-
-            from olympus.core import logger
-
-            reload(logger)
-
-            # Verify that a warning was logged
-            mock_warning.assert_called_once_with("Logtail package not installed. Skipping Logtail integration.")
+@pytest.fixture
+def logtail_stub():
+    """Run the ingestion endpoint stub on a free local port."""
+    LogtailStub.batches, LogtailStub.statuses = [], []
+    server = HTTPServer(("127.0.0.1", 0), LogtailStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _logtail_sink(url, **kwargs):
+    """Create a Logtail sink that retries without waiting."""
+    return LogtailSink("token", host=url, backoff=0, flush_interval=0.01, **kwargs)
+
+
+def test_logtail_sink_ships_gzip_batches(logtail_stub):
+    """Test the records are posted as gzip compressed JSON batches, retrying the server errors."""
+    LogtailStub.statuses = [503]
+    logtail_sink = _logtail_sink(f"http://127.0.0.1:{logtail_stub.server_port}", batch_size=2, retries=1)
+    handler_id = loguru_logger.add(logtail_sink, format="{message}")
+    try:
+        for index in range(3):
+            loguru_logger.info(f"shipped {index}")
+    finally:
+        loguru_logger.remove(handler_id)
+
+    messages = [record["message"] for batch in LogtailStub.batches for record in batch]
+    assert messages == ["shipped 0", "shipped 1", "shipped 2"]
+    assert all(record["dt"] and record["level"] == "INFO" for batch in LogtailStub.batches for record in batch)
+
+
+def test_logtail_sink_spools_when_unreachable(logtail_stub, tmp_path):
+    """Test the batches failing every retry are spooled and shipped after the next success."""
+    spool_path = tmp_path / "logtail.spool"
+    unreachable = _logtail_sink("http://127.0.0.1:9", spool_path=str(spool_path), retries=1, timeout=1)
+    unreachable.put(b'{"message": "spooled"}')
+    unreachable.stop()
+    assert spool_path.read_bytes() == b'{"message": "spooled"}\n'
+
+    reachable = _logtail_sink(f"http://127.0.0.1:{logtail_stub.server_port}", spool_path=str(spool_path))
+    reachable.put(b'{"message": "live"}')
+    reachable.stop()
+
+    assert [record["message"] for batch in LogtailStub.batches for record in batch] == ["live", "spooled"]
+    assert not spool_path.exists()
+
+
+def test_logtail_sink_reports_rejected_batches(logtail_stub, tmp_path):
+    """Test a rejected batch is counted and reported, not retried, and the spool is kept."""
+    LogtailStub.statuses = [401]
+    spool_path = tmp_path / "logtail.spool"
+    spool_path.write_bytes(b'{"message": "spooled"}\n')
+    logtail_sink = _logtail_sink(f"http://127.0.0.1:{logtail_stub.server_port}", spool_path=str(spool_path))
+    logtail_sink.stream = io.BytesIO()
+    logtail_sink.put(b'{"message": "rejected"}')
+    logtail_sink.put(b'{"message": "rejected"}')
+    logtail_sink.stop()
+
+    assert logtail_sink.rejected == 2
+    warning = json.loads(logtail_sink.stream.getvalue())
+    assert (warning["level"], warning["message"]) == ("WARNING", "Logtail rejected 2 log records with HTTP 401.")
+    assert LogtailStub.batches == []
+    assert spool_path.read_bytes() == b'{"message": "spooled"}\n'
+
+
+class BlockingStream(io.BytesIO):
+    """Binary stream whose writes wait for the test to release them."""
+
+    def __init__(self):
+        """Initialize the stream."""
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, data):
+        """Write once released."""
+        self.release.wait(5)
+        return super().write(data)
+
+
+def test_async_sink_writes_batches():
+    """Test the async sink writes every queued line and stops cleanly."""
+    stream = io.BytesIO()
+    async_sink = AsyncSink(stream=stream, batch_size=3)
+    for index in range(10):
+        async_sink.put(f"{index}\n".encode())
+
+    async_sink.stop()
+
+    assert stream.getvalue().decode().split() == [str(index) for index in range(10)]
+
+
+@pytest.mark.parametrize("overflow,maxsize,dropped", [("drop", 4, 2), ("sample", 6, 2)])
+def test_async_sink_overflow(overflow, maxsize, dropped):
+    """Test the records past the capacity, or sampled out past half of it, are discarded and reported."""
+    stream = BlockingStream()
+    async_sink = AsyncSink(stream=stream, maxsize=maxsize, overflow=overflow, sample_rate=2)
+    async_sink.put(b"first\n")
+    while async_sink._queue.qsize():
+        time.sleep(0.001)
+    for index in range(6):
+        async_sink.put(f"{index}\n".encode())
+
+    stream.release.set()
+    async_sink.stop()
+
+    lines = stream.getvalue().decode().splitlines()
+    assert json.loads(lines[-1])["message"] == f"Dropped {dropped} log records, the log queue is full."
+    assert len(lines) == 7 - dropped + 1
+
+
+def test_async_sink_rejects_unknown_policy():
+    """Test the overflow policy is validated."""
+    with pytest.raises(ValueError):
+        AsyncSink(overflow="ignore")
+
+
+def test_call_site_limiter_samples_and_rate_limits():
+    """Test the records are sampled and rate limited per call site and the suppressed ones summarized."""
+    now = [0.0]
+    limiter = CallSiteLimiter(
+        sample_every={"debug": 3}, rate_limits={"error": 1}, burst=2, summary_interval=10, clock=lambda: now[0]
+    )
+    records = []
+    handler_id = loguru_logger.add(lambda message: records.append(message.record), filter=limiter, level="DEBUG")
+    try:
+        for _ in range(6):
+            loguru_logger.debug("sampled")
+        for _ in range(4):
+            loguru_logger.error("limited")
+        now[0] = 1.0
+        loguru_logger.error("limited")
+        now[0] = 10.0
+        loguru_logger.info("unlimited")
+    finally:
+        loguru_logger.remove(handler_id)
+
+    messages = [record["message"] for record in records]
+    assert messages[:5] == ["sampled", "sampled", "limited", "limited", "limited"]
+    assert messages[-1] == "unlimited"
+    summary = records[5]
+    assert summary["message"] == "Suppressed 6 log records from 2 call sites."
+    assert sorted(summary["extra"]["suppressed"].values()) == [2, 4]
+
+
+def test_call_site_limiter_decides_once_per_record():
+    """Test the sinks sharing the limiter receive the same records."""
+    limiter = CallSiteLimiter(rate_limits={"INFO": 0.001}, burst=1)
+    first, second = [], []
+    handler_ids = [
+        loguru_logger.add(first.append, filter=limiter),
+        loguru_logger.add(second.append, filter=limiter),
+    ]
+    try:
+        for _ in range(3):
+            loguru_logger.info("shared")
+    finally:
+        for handler_id in handler_ids:
+            loguru_logger.remove(handler_id)
+
+    assert len(first) == len(second) == 1
@@ -0,0 +1,107 @@
+"""Tests for the base managers and querysets."""
+
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+
+from django.db import connection
+from ulid import ULID
+
+from olympus.core.checks import missing_tenant_indexes
+from olympus.core.tenancy import tenant_context
+
+
+def test_bulk_create_fills_increasing_ids(item_table):
+    """Test bulk_create generates consecutive ULIDs and keeps the assigned ones."""
+    assigned = ULID()
+    items = item_table.objects.bulk_create([item_table(), item_table(id=assigned), item_table(), item_table()])
+
+    generated = [items[0].id, items[2].id, items[3].id]
+    assert items[1].id == assigned
+    assert generated == sorted(generated)
+    assert int(generated[-1]) - int(generated[0]) == 2
+    assert set(item_table.objects.values_list("id", flat=True)) == {item.id for item in items}
+
+
+def test_save_keeps_assigned_id(item_table):
+    """Test save generates a ULID for new objects and keeps the assigned one."""
+    assigned = ULID()
+    generated = item_table.objects.create(name="generated")
+    kept = item_table.objects.create(id=assigned, name="kept")
+
+    assert isinstance(generated.id, ULID)
+    assert kept.id == assigned
+    assert item_table.objects.get(name="kept").id == assigned
+
+
+def test_created_between_uses_the_primary_key(item_table):
+    """Test the time window filters translate into a primary key range."""
+    start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for minutes in range(5):
+        item_table.objects.create(id=ULID.from_datetime(start + timedelta(minutes=minutes)), name=str(minutes))
+
+    window = item_table.objects.created_between(start + timedelta(minutes=1), start + timedelta(minutes=3))
+
+    assert sorted(window.values_list("name", flat=True)) == ["1", "2"]
+    assert sorted(item_table.objects.created_after(start + timedelta(minutes=4)).values_list("name", flat=True)) == [
+        "4"
+    ]
+    assert item_table.objects.created_before(start).count() == 0
+    assert '"core_item"."id" >= ' in str(window.query)
+
+
+def test_queries_are_scoped_to_the_current_tenant(record_table):
+    """Test the default manager filters by the active tenant only."""
+    record_table.objects.bulk_create([record_table(tenant="a"), record_table(tenant="a"), record_table(tenant="b")])
+
+    assert record_table.objects.count() == 3
+    with tenant_context("a"):
+        assert record_table.objects.count() == 2
+        assert record_table.objects.filter(tenant="b").count() == 0
+        assert record_table.unscoped.count() == 3
+        with tenant_context("b"):
+            assert record_table.objects.count() == 1
+    assert record_table.objects.for_tenant("b").count() == 1
+
+
+def test_missing_tenant_indexes(record_table):
+    """Test the check flags the models without the tenant composite indexes."""
+    assert missing_tenant_indexes(record_table) == [("tenant", "id"), ("tenant", "created_at")]
+
+
+def test_bulk_upsert_sets_timestamps_and_splits_the_result(record_table):
+    """Test bulk_upsert inserts new rows, updates the conflicting ones and keeps created_at."""
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE UNIQUE INDEX core_record_tenant_name ON core_record (tenant, name)")
+    existing = record_table.objects.create(tenant="a", name="existing")
+    created_at = existing.created_at
+
+    result = record_table.objects.bulk_upsert(
+        [record_table(tenant="a", name="existing"), record_table(tenant="a", name="new"), record_table(tenant="b")],
+        unique_fields=["tenant", "name"],
+        batch_size=2,
+    )
+
+    assert [record.name for record in result.inserted] == ["new", ""]
+    assert result.updated[0].id == existing.id
+    assert result.updated[0].created_at == created_at
+    existing.refresh_from_db()
+    assert existing.created_at == created_at
+    assert existing.updated_at > created_at
+    new = record_table.objects.get(name="new")
+    assert new.created_at == new.updated_at == existing.updated_at
+    assert record_table.objects.count() == 3
+
+
+def test_bulk_upsert_always_sets_updated_at(record_table):
+    """Test the updated rows get the new updated_at of the objects with custom update fields."""
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE UNIQUE INDEX core_record_tenant_name ON core_record (tenant, name)")
+    existing = record_table.objects.create(tenant="a", name="existing")
+
+    result = record_table.objects.bulk_upsert(
+        [record_table(tenant="a", name="existing")], unique_fields=["tenant", "name"], update_fields=["name"]
+    )
+
+    existing.refresh_from_db()
+    assert existing.updated_at == result.updated[0].updated_at > existing.created_at
@@ -0,0 +1,95 @@
+"""Tests for the read-through cache of the model instances."""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+
+from olympus.core.db.caching import model_cache
+from olympus.core.db.loading import bulk_load
+from olympus.core.tenancy import tenant_context
+
+
+@pytest.fixture
+def records(record_table):
+    """Three cached records, with an empty cache and counters."""
+    caches["default"].clear()
+    cache = model_cache(record_table)
+    cache.hits = cache.misses = 0
+    yield record_table.objects.bulk_create([record_table(tenant="a", name=str(index)) for index in range(3)])
+    caches["default"].clear()
+
+
+def test_instances_are_read_through_the_cache(record_table, records, django_assert_num_queries):
+    """Test the instances are fetched once, the misses of a batch with a single query."""
+    first, second, third = records
+    with django_assert_num_queries(1):
+        assert record_table.cached.get(first.pk).name == "0"
+    with django_assert_num_queries(0):
+        assert record_table.cached.get(pk=str(first.pk)) == first
+
+    with django_assert_num_queries(1):
+        found = record_table.cached.get_many([first.pk, second.pk, third.pk, str(third.pk)])
+    assert found == {first.pk: first, second.pk: second, third.pk: third}
+    assert model_cache(record_table).stats() == {"hits": 2, "misses": 3, "hit_ratio": 0.4}
+
+
+def test_changes_invalidate_the_instances(record_table, records):
+    """Test a save, a bulk update and a delete are visible through the cache."""
+    first, second, third = records
+    record_table.cached.get_many([first.pk, second.pk, third.pk])
+
+    first.name = "saved"
+    first.save()
+    record_table.objects.filter(pk=second.pk).update(name="updated")
+    third.delete()
+
+    assert record_table.cached.get(first.pk).name == "saved"
+    assert record_table.cached.get(second.pk).name == "updated"
+    with pytest.raises(record_table.DoesNotExist):
+        record_table.cached.get(third.pk)
+
+
+def test_bulk_upserts_invalidate_the_instances(record_table, records):
+    """Test the rows updated on conflict by bulk_create and by a bulk_load merge are visible through the cache."""
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE UNIQUE INDEX core_record_tenant_name ON core_record (tenant, name)")
+    first, second, _ = records
+    record_table.cached.get_many([first.pk, second.pk])
+
+    record_table.objects.bulk_create(
+        [record_table(tenant="a", name="0")],
+        update_conflicts=True,
+        unique_fields=["tenant", "name"],
+        update_fields=["updated_at"],
+    )
+    bulk_load(record_table, [{"tenant": "a", "name": "1"}], merge_on=["tenant", "name"])
+
+    assert record_table.cached.get(first.pk).updated_at > first.updated_at
+    assert record_table.cached.get(second.pk).updated_at > second.updated_at
+
+
+def test_a_stale_row_does_not_replace_a_tombstone(record_table, records):
+    """Test a row fetched before a change is not cached over the tombstone of the change."""
+    first = records[0]
+    cache = model_cache(record_table)
+    cache.invalidate([first.pk], first.updated_at + timedelta(seconds=1))
+    stale = cache.cache.get(cache.key(first.pk))
+
+    cache.get_many([first.pk])
+    assert cache.cache.get(cache.key(first.pk)) == stale
+
+    cache.invalidate([first.pk], first.updated_at)
+    cache.get_many([first.pk])
+    assert cache.cache.get(cache.key(first.pk))[1] == first
+
+
+def test_instances_of_other_tenants_are_hidden(record_table, records):
+    """Test the cached lookups are scoped to the current tenant."""
+    with tenant_context("b"):
+        assert record_table.cached.get_many([records[0].pk]) == {}
+        with pytest.raises(record_table.DoesNotExist):
+            record_table.cached.get(records[0].pk)
+    with tenant_context("a"):
+        assert record_table.cached.get(records[0].pk) == records[0]
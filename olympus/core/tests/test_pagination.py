@@ -0,0 +1,60 @@
+"""Tests for the ULID keyset pagination."""
+
+from urllib.parse import parse_qs
+from urllib.parse import urlparse
+
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from olympus.core.pagination import ULIDCursorPagination
+
+
+def _paginate(paginator, queryset, url="/items/"):
+    """Paginate the queryset for a GET request to the url."""
+    request = Request(APIRequestFactory().get(url))
+    page = paginator.paginate_queryset(queryset, request)
+    return page, paginator.get_next_link(), paginator.get_previous_link()
+
+
+def _path(link):
+    parsed = urlparse(link)
+    return f"{parsed.path}?cursor={parse_qs(parsed.query)['cursor'][0]}"
+
+
+@pytest.mark.parametrize("ordering", [("-id",), ("id",), ("name", "id")])
+def test_walks_pages_forward_and_backward(item_table, ordering):
+    """Test the cursors walk every row exactly once in both directions."""
+    items = item_table.objects.bulk_create([item_table(name=str(index % 2)) for index in range(7)])
+    paginator = ULIDCursorPagination()
+    paginator.page_size = 3
+    paginator.ordering = ordering
+    expected = [
+        item.id
+        for item in sorted(
+            items,
+            key=lambda item: tuple(getattr(item, name.lstrip("-")) for name in ordering),
+            reverse=ordering[0].startswith("-"),
+        )
+    ]
+
+    pages, link = [], "/items/"
+    while link:
+        url = _path(link) if "cursor" in link else link
+        page, link, previous = _paginate(paginator, item_table.objects.all(), url)
+        pages.append([item.id for item in page])
+    assert [pk for page in pages for pk in page] == expected
+    assert [len(page) for page in pages] == [3, 3, 1]
+
+    page, _, previous = _paginate(paginator, item_table.objects.all(), _path(previous))
+    assert [item.id for item in page] == pages[1]
+    page, _, previous = _paginate(paginator, item_table.objects.all(), _path(previous))
+    assert [item.id for item in page] == pages[0]
+    assert previous is None
+
+
+def test_invalid_cursor(item_table):
+    """Test a malformed cursor is reported as not found."""
+    with pytest.raises(NotFound):
+        _paginate(ULIDCursorPagination(), item_table.objects.all(), "/items/?cursor=bm9wZQ")
@@ -0,0 +1,162 @@
+"""Tests for the PostgreSQL table partitioning."""
+
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+import pytest
+from django.db import connection
+from django.db import models
+from django.db.migrations.state import ProjectState
+from django.test.utils import isolate_apps
+
+from olympus.core.checks import check_partition_keys
+from olympus.core.db.fields import ULIDPrimaryKeyField
+from olympus.core.db.operations import CreatePartitionedModel
+from olympus.core.db.operations import RollPartitions
+from olympus.core.db.partitioning import HashPartitioning
+from olympus.core.db.partitioning import ListPartitioning
+from olympus.core.db.partitioning import RangePartitioning
+from olympus.core.db.partitioning import list_partitions
+from olympus.core.db.partitioning import roll_partitions
+from olympus.core.db.ulids import ulid_floor
+
+
+FIELDS = [
+    ("id", ULIDPrimaryKeyField()),
+    ("tenant", models.CharField(max_length=32)),
+    ("created_at", models.DateTimeField()),
+]
+
+
+def _create(partitioning, fields=FIELDS):
+    """Create the partitioned ``core_event`` table and return the state."""
+    operation = CreatePartitionedModel("Event", fields, partitioning=partitioning)
+    state = ProjectState()
+    new_state = state.clone()
+    operation.state_forwards("core", new_state)
+    with connection.schema_editor() as editor:
+        operation.database_forwards("core", editor, state, new_state)
+    return new_state
+
+
+@pytest.fixture
+def drop_event_table():
+    """Drop the partitioned table and its partitions after the test."""
+    yield
+    with connection.cursor() as cursor:
+        for name in ["core_event", *(f"core_event_p{suffix}" for suffix in ("history", "default", "acme"))]:
+            cursor.execute(f"DROP TABLE IF EXISTS {name} CASCADE")
+        cursor.execute("SELECT tablename FROM pg_tables WHERE tablename LIKE 'core\\_event\\_p%%'")
+        for (name,) in cursor.fetchall():
+            cursor.execute(f"DROP TABLE {name}")
+
+
+def test_range_partitioning_intervals():
+    """Test the partition starts, shifts and names of the intervals."""
+    value = datetime(2024, 12, 18, 15, 30, tzinfo=dt_timezone.utc)
+    month = RangePartitioning(interval="month")
+    week = RangePartitioning(interval="week")
+
+    assert month.floor(value) == datetime(2024, 12, 1, tzinfo=dt_timezone.utc)
+    assert month.shift(month.floor(value), 1) == datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+    assert month.shift(month.floor(value), -12) == datetime(2023, 12, 1, tzinfo=dt_timezone.utc)
+    assert month.suffix(month.floor(value)) == "202412"
+    assert week.floor(value) == datetime(2024, 12, 16, tzinfo=dt_timezone.utc)
+    with pytest.raises(ValueError):
+        RangePartitioning(interval="year")
+
+
+def test_create_partitioned_model_deconstruct():
+    """Test the partitioning is serialized into the migration."""
+    partitioning = RangePartitioning(key="created_at", interval="day", premake=7)
+    name, args, kwargs = CreatePartitionedModel("Event", FIELDS, partitioning=partitioning).deconstruct()
+
+    assert name == "CreatePartitionedModel"
+    assert kwargs["partitioning"] == partitioning
+    assert partitioning.deconstruct() == (
+        "olympus.core.db.partitioning.RangePartitioning",
+        (),
+        {"key": "created_at", "interval": "day", "premake": 7},
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("drop_event_table")
+def test_range_partitioning_by_ulid_prunes_and_rolls():
+    """Test the ULID range partitions route the rows, prune the scans and roll over time."""
+    partitioning = RangePartitioning(key="id", interval="month", premake=2, retention=1)
+    state = _create(partitioning)
+    model = state.apps.get_model("core", "Event")
+    now = datetime.now(dt_timezone.utc)
+    current = partitioning.floor(now)
+
+    with connection.schema_editor() as editor:
+        assert len(list_partitions(editor, model)) == 4
+    model.objects.create(tenant="acme", created_at=now)
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) FROM core_event_p{partitioning.suffix(current)}")
+        assert cursor.fetchone() == (1,)
+        cursor.execute(
+            "EXPLAIN SELECT * FROM core_event WHERE id >= %s", [str(ulid_floor(partitioning.shift(current, 1)))]
+        )
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+    assert f"core_event_p{partitioning.suffix(current)}" not in plan
+    assert "core_event_phistory" not in plan
+
+    later = partitioning.shift(current, 2)
+    with connection.schema_editor() as editor:
+        created, detached = roll_partitions(editor, model, partitioning, now=later)
+    assert created == [f"core_event_p{partitioning.suffix(partitioning.shift(later, offset))}" for offset in (1, 2)]
+    assert detached == [f"core_event_p{partitioning.suffix(current)}"]
+
+    with connection.schema_editor() as editor:
+        partitions = list_partitions(editor, model)
+        RollPartitions("event", partitioning).database_forwards("core", editor, state, state)
+        assert list_partitions(editor, model) == partitions
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures("drop_event_table")
+@pytest.mark.parametrize(
+    "partitioning,partitions",
+    [
+        (RangePartitioning(key="created_at", premake=0), 2),
+        (ListPartitioning(key="tenant"), 1),
+        (HashPartitioning(key="tenant", modulus=4), 4),
+    ],
+)
+def test_partitioning_by_other_columns(partitioning, partitions):
+    """Test the primary key includes the partition key and the rows are stored."""
+    state = _create(partitioning)
+    model = state.apps.get_model("core", "Event")
+    model.objects.create(tenant="acme", created_at=datetime.now(dt_timezone.utc))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = 'core_event'::regclass "
+            "AND contype = 'p'"
+        )
+        assert cursor.fetchone()[0] == f"PRIMARY KEY (id, {model._meta.get_field(partitioning.key).column})"
+    with connection.schema_editor() as editor:
+        assert len(list_partitions(editor, model)) == partitions
+    assert model.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_nullable_partition_keys_are_rejected():
+    """Test a nullable partition key is flagged by the checks and refused by the migration."""
+    with isolate_apps("olympus.core") as registry:
+
+        class Event(models.Model):
+            tenant = models.CharField(max_length=32, null=True)
+            partitioning = ListPartitioning(key="tenant")
+
+            class Meta:
+                app_label = "core"
+
+        errors = check_partition_keys([registry.get_app_config("core")])
+    assert [error.id for error in errors] == ["olympus.E001"]
+
+    fields = [*FIELDS[:1], ("tenant", models.CharField(max_length=32, null=True)), *FIELDS[2:]]
+    with pytest.raises(ValueError, match="must not be nullable"):
+        _create(ListPartitioning(key="tenant"), fields)
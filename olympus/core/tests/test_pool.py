@@ -0,0 +1,169 @@
+"""Tests for the PostgreSQL connection pool."""
+
+import os
+import stat
+import threading
+from types import SimpleNamespace
+
+import pytest
+from django.db import OperationalError
+from django.db import connection
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extensions import TRANSACTION_STATUS_INERROR
+from psycopg2.extensions import TRANSACTION_STATUS_UNKNOWN
+
+from olympus.core.db import pool as pools
+from olympus.core.db.pool import ConnectionPool
+from olympus.core.db.pool import PoolTimeout
+from olympus.core.db.pool import get_pool
+from olympus.core.db.pool import pool_stats
+from olympus.healthcheck.probes import probe_database
+
+
+class FakeConnection:
+    """Stand-in for a psycopg2 connection."""
+
+    def __init__(self) -> None:
+        """Initialize the connection."""
+        self.closed = 0
+        self.rolled_back = False
+        self.info = SimpleNamespace(transaction_status=TRANSACTION_STATUS_IDLE)
+        self._read, self._write = os.pipe()
+
+    def rollback(self) -> None:
+        """Roll back the transaction."""
+        self.rolled_back = True
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def fileno(self) -> int:
+        """Return the socket of the connection."""
+        return self._read
+
+    def close(self) -> None:
+        """Close the connection, recording what its socket was at that time."""
+        if not self.closed:
+            self.closed = 1
+            self.socket_mode = os.fstat(self._read).st_mode
+            for fd in (self._read, self._write):
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+
+
+def test_pool_reuses_and_rolls_back_the_connections():
+    """Test a released connection is reused, after rolling back its transaction."""
+    pool = ConnectionPool(max_size=2)
+    first = pool.getconn(FakeConnection)
+    first.info.transaction_status = TRANSACTION_STATUS_INERROR
+    pool.putconn(first)
+
+    assert first.rolled_back
+    assert pool.getconn(FakeConnection) is first
+    assert pool.stats()["in_use"] == 1
+
+
+def test_pool_discards_the_broken_and_old_connections():
+    """Test a broken connection or one older than max_lifetime is closed instead of reused."""
+    now = [0.0]
+    pool = ConnectionPool(max_size=2, max_lifetime=60, clock=lambda: now[0])
+    broken = pool.getconn(FakeConnection)
+    broken.info.transaction_status = TRANSACTION_STATUS_UNKNOWN
+    pool.putconn(broken)
+    old = pool.getconn(FakeConnection)
+    now[0] = 61
+    pool.putconn(old)
+
+    assert broken.closed and old.closed
+    assert pool.stats()["idle"] == 0
+    assert pool.getconn(FakeConnection) not in (broken, old)
+
+
+def test_pool_waits_for_a_connection():
+    """Test a thread waits for a released connection, and times out if none is."""
+    pool = ConnectionPool(max_size=1, timeout=0.05)
+    held = pool.getconn(FakeConnection)
+
+    with pytest.raises(PoolTimeout):
+        pool.getconn(FakeConnection)
+
+    threading.Timer(0.01, pool.putconn, [held]).start()
+    pool.timeout = 5
+    assert pool.getconn(FakeConnection) is held
+
+    stats = pool.stats()
+    assert stats["waits"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait_ms_max"] >= 10
+    assert stats["in_use"] == 1 and stats["waiting"] == 0
+
+
+def test_forked_child_detaches_the_inherited_connections(monkeypatch):
+    """Test a child process gets new pools and drops the connections of the parent."""
+    monkeypatch.setattr(pools, "_pools", {})
+    parent = get_pool("default", {})
+    inherited = parent.getconn(FakeConnection)
+    parent.putconn(inherited)
+    monkeypatch.setattr(pools, "_pools_pid", -1)
+
+    child = get_pool("default", {})
+
+    assert child is not parent
+    assert inherited.closed
+    assert stat.S_ISCHR(inherited.socket_mode)
+    assert pool_stats() == {"default": child.stats()}
+
+
+def test_pool_drops_the_connections_it_does_not_own():
+    """Test a connection of another pool is closed on /dev/null, its socket left to its owner."""
+    inherited = ConnectionPool().getconn(FakeConnection)
+    pool = ConnectionPool()
+
+    pool.putconn(inherited)
+
+    assert inherited.closed
+    assert stat.S_ISCHR(inherited.socket_mode)
+    assert pool.stats()["idle"] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backend_takes_the_connections_from_the_pool(monkeypatch):
+    """Test the backend gives its connection back to the pool when Django closes it."""
+    monkeypatch.setattr(pools, "_pools", {})
+    monkeypatch.setitem(connection.settings_dict["OPTIONS"], "pool", {"max_size": 1, "timeout": 0.1})
+    connection.close()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        raw = connection.connection
+        assert pool_stats()["default"]["in_use"] == 1
+
+        connection.close()
+        assert pool_stats()["default"]["idle"] == 1
+        connection.ensure_connection()
+        assert connection.connection is raw
+
+        connection.close()
+        pools.close_pools()
+        pools._pools["default"].max_size = 0
+        with pytest.raises(OperationalError):
+            connection.ensure_connection()
+    finally:
+        connection.close()
+        pools.close_pools()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_database_probe_gives_the_connection_back(monkeypatch):
+    """Test the database probe, run on a thread no request signal cleans up, releases its pool slot."""
+    monkeypatch.setattr(pools, "_pools", {})
+    monkeypatch.setitem(connection.settings_dict["OPTIONS"], "pool", {"max_size": 1, "timeout": 0.1})
+    monkeypatch.setitem(connection.settings_dict, "CONN_MAX_AGE", 0)
+    try:
+        for _ in range(2):
+            thread = threading.Thread(target=probe_database)
+            thread.start()
+            thread.join()
+            assert pool_stats()["default"]["in_use"] == 0
+    finally:
+        pools.close_pools()
@@ -0,0 +1,114 @@
+"""Tests for the orjson renderer, parser and streamed lists."""
+
+import io
+import json
+from datetime import datetime
+from datetime import timedelta
+from datetime import timezone
+from decimal import Decimal
+
+import orjson
+import pytest
+from django.contrib.auth.models import User
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.generics import ListAPIView
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from ulid import ULID
+
+from olympus.core.db.ulids import LazyULID
+from olympus.core.parsers import ORJSONParser
+from olympus.core.renderers import ORJSONRenderer
+from olympus.core.renderers import iter_json_array
+from olympus.core.views import StreamingListMixin
+
+
+def test_renderer_matches_the_drf_renderer():
+    """Test the ULIDs, datetimes, decimals and other types render like with the DRF encoder."""
+    ulid = ULID()
+    data = {
+        "id": ulid,
+        "lazy": LazyULID(str(ulid)),
+        "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc),
+        "amount": Decimal("1234.50"),
+        "duration": timedelta(minutes=1),
+        "label": gettext_lazy("Deal"),
+        "tags": {"won"},
+        "nested": [{"ratio": 0.5, "missing": None}],
+    }
+    expected = json.loads(JSONRenderer().render({**data, "id": str(ulid), "lazy": str(ulid)}))
+
+    assert orjson.loads(ORJSONRenderer().render(data)) == expected
+    assert expected["created_at"] == "2024-05-01T12:30:15.123456Z"
+    assert expected["amount"] == 1234.5
+    assert ORJSONRenderer().render(None) == b""
+    with pytest.raises(TypeError):
+        ORJSONRenderer().render({"object": object()})
+
+
+def test_renderer_indents_on_request():
+    """Test the output is indented only for a positive indent of the accepted media type."""
+    renderer = ORJSONRenderer()
+
+    assert renderer.render({"a": 1}, "application/json") == b'{"a":1}'
+    assert renderer.render({"a": 1}, "application/json; indent=4") == b'{\n  "a": 1\n}'
+    assert renderer.render({"a": 1}, "application/json; indent=0", {"indent": 4}) == b'{"a":1}'
+    assert renderer.render({"a": 1}, "application/json; indent=x") == b'{"a":1}'
+
+
+def test_parser():
+    """Test the bodies are decoded in the charset of the request and invalid JSON rejected."""
+    parser = ORJSONParser()
+
+    assert parser.parse(io.BytesIO('{"name": "Décor"}'.encode())) == {"name": "Décor"}
+    assert parser.parse(io.BytesIO('{"name": "Décor"}'.encode("latin-1")), None, {"encoding": "latin-1"}) == {
+        "name": "Décor"
+    }
+    for body in (b'{"name":', b'{"amount": NaN}'):
+        with pytest.raises(ParseError):
+            parser.parse(io.BytesIO(body))
+
+
+def test_iter_json_array():
+    """Test the batches are joined into a single array."""
+    for size in (0, 1, 5, 6):
+        chunks = list(iter_json_array(range(size), lambda batch: [{"n": n} for n in batch], batch_size=5))
+        assert orjson.loads(b"".join(chunks)) == [{"n": n} for n in range(size)]
+
+
+class UserSerializer(serializers.ModelSerializer):
+    """Serializer of the streamed users."""
+
+    class Meta:
+        model = User
+        fields = ("id", "username")
+
+
+class UserListView(StreamingListMixin, ListAPIView):
+    """List of the users, streamed without pagination."""
+
+    queryset = User.objects.order_by("id")
+    serializer_class = UserSerializer
+    permission_classes = ()
+    pagination_class = None
+    stream_batch_size = 2
+
+
+@pytest.mark.django_db
+def test_unpaginated_lists_are_streamed():
+    """Test an unpaginated list is streamed in batches, a paginated one rendered as usual."""
+    User.objects.bulk_create([User(username=f"user{index}") for index in range(5)])
+    expected = [{"id": user.id, "username": user.username} for user in User.objects.order_by("id")]
+    request = APIRequestFactory().get("/users/")
+
+    response = UserListView.as_view()(request)
+    assert response.streaming
+    assert response["Content-Type"] == "application/json"
+    assert orjson.loads(b"".join(response.streaming_content)) == expected
+
+    response = UserListView.as_view(pagination_class=ListAPIView.pagination_class)(request)
+    response.render()
+    assert not response.streaming
+    assert orjson.loads(response.content)["results"] == expected[::-1]
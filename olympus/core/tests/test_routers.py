@@ -0,0 +1,180 @@
+"""Tests for the read replica router."""
+
+import asyncio
+
+import pytest
+from django.conf import settings as django_settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client
+from django.test import RequestFactory
+
+from config.celery import app
+from olympus.core.db import routers
+from olympus.core.db.routers import ReplicaRouter
+from olympus.core.db.routers import replica_lag
+from olympus.core.db.routers import replica_routing
+from olympus.core.middleware import ReplicaRoutingMiddleware
+
+
+@app.task
+def read_content_type(pk: int) -> str:
+    """Read a content type, like a task reading the row its request just wrote."""
+    return ContentType.objects.get(pk=pk).model
+
+
+@app.task(replica_reads=True)
+def database_of_the_reads() -> str:
+    """Return the database of the reads of a task reading from the replicas."""
+    return ReplicaRouter().db_for_read(ContentType)
+
+
+@pytest.fixture
+def lags(settings, monkeypatch):
+    """Two replicas with a settable lag."""
+    settings.DATABASE_REPLICAS = ["replica1", "replica2"]
+    settings.REPLICA_MAX_LAG = 5.0
+    lags = {"replica1": 0.0, "replica2": 0.0}
+    monkeypatch.setattr(routers, "replica_lag", lags.__getitem__)
+    return lags
+
+
+@pytest.fixture
+def transactional_table(transactional_db, record_table):
+    """The table of the CRM-like test model, created outside a transaction and dropped afterwards."""
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE UNIQUE INDEX core_record_tenant_name ON core_record (tenant, name)")
+    yield record_table
+    with connection.schema_editor() as editor:
+        editor.delete_model(record_table)
+
+
+def test_reads_go_to_a_replica_until_a_write(lags):
+    """Test the reads of a context stick to one replica, and go to the primary after a write."""
+    router = ReplicaRouter()
+    assert router.db_for_read(ContentType) is None
+
+    with replica_routing():
+        replica = router.db_for_read(ContentType)
+        assert replica in lags
+        assert {router.db_for_read(ContentType) for _ in range(10)} == {replica}
+
+        assert router.db_for_write(ContentType) == "default"
+        assert router.db_for_read(ContentType) == "default"
+
+    with replica_routing(pinned=True):
+        assert router.db_for_read(ContentType) == "default"
+
+
+def test_lagging_replicas_are_skipped(lags):
+    """Test a replica lagging more than REPLICA_MAX_LAG is left, the primary used without a fresh one."""
+    router = ReplicaRouter()
+    with replica_routing():
+        replica = router.db_for_read(ContentType)
+        other = "replica2" if replica == "replica1" else "replica1"
+        lags[replica] = 30.0
+        assert router.db_for_read(ContentType) == other
+
+        lags[other] = float("inf")
+        assert router.db_for_read(ContentType) == "default"
+
+
+@pytest.mark.django_db
+def test_reads_in_a_transaction_stay_on_the_primary(lags):
+    """Test the reads inside a transaction of the primary are not sent to a replica."""
+    with replica_routing():
+        assert ReplicaRouter().db_for_read(ContentType) == "default"
+
+
+def test_replicas_are_not_migrated(settings):
+    """Test the migrations only run on the primary."""
+    settings.DATABASE_REPLICAS = ["replica1"]
+    router = ReplicaRouter()
+
+    assert router.allow_migrate("replica1", "core") is False
+    assert router.allow_migrate("default", "core") is None
+
+
+@pytest.mark.parametrize(("method", "pinned"), [("GET", False), ("POST", True)])
+def test_middleware_pins_the_unsafe_methods(lags, method, pinned):
+    """Test the unsafe requests read from the primary, in sync and async mode."""
+
+    def view(request):
+        return HttpResponse(ReplicaRouter().db_for_read(ContentType))
+
+    async def async_view(request):
+        return view(request)
+
+    request = RequestFactory().generic(method, "/")
+    responses = [
+        ReplicaRoutingMiddleware(view)(request),
+        asyncio.run(ReplicaRoutingMiddleware(async_view)(request)),
+    ]
+
+    for response in responses:
+        assert (response.content == b"default") is pinned
+
+
+@pytest.mark.django_db
+def test_replica_lag_of_the_primary(settings):
+    """Test the primary, which is not in recovery, has no lag and the lag is cached."""
+    settings.REPLICA_LAG_CACHE_TTL = 60
+    routers._lags.pop("default", None)
+
+    assert replica_lag("default") == 0
+    assert routers._lags["default"][1] == 0
+
+
+def test_bulk_upsert_writes_to_the_primary(lags, transactional_table):
+    """Test bulk_upsert is not sent to a replica by the unpinned routing of a safe request."""
+    transactional_table.unscoped.create(tenant="a", name="existing")
+
+    with replica_routing():
+        result = transactional_table.unscoped.bulk_upsert(
+            [transactional_table(tenant="a", name="existing"), transactional_table(tenant="a", name="new")],
+            unique_fields=["tenant", "name"],
+        )
+
+    assert [obj._state.db for obj in result.inserted + result.updated] == ["default", "default"]
+    assert transactional_table.unscoped.count() == 2
+
+
+def test_updates_write_to_the_primary(lags, transactional_table):
+    """Test the updates of a cached model snapshot, update and invalidate the rows on the primary."""
+    record = transactional_table.unscoped.create(tenant="a", name="before")
+
+    with replica_routing():
+        assert transactional_table.unscoped.filter(pk=record.pk).update(name="updated") == 1
+        record.name = "bulk"
+        assert transactional_table.unscoped.bulk_update([record], ["name"]) == 1
+
+    assert transactional_table.unscoped.get(pk=record.pk).name == "bulk"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_tasks_read_from_the_primary_unless_declared(lags):
+    """Test a task reads the row written before it was enqueued, only the declared tasks use a replica."""
+    content_type = ContentType.objects.create(app_label="crm", model="deal")
+
+    assert read_content_type.apply(args=[content_type.pk]).get() == "deal"
+    assert database_of_the_reads.apply().get() in lags
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sessions_and_users_are_read_from_the_primary(lags):
+    """Test the session and the user of a safe request, loaded lazily inside the routing, come from the primary."""
+    client = Client()
+    client.force_login(User.objects.create_user("ana"))
+    request = RequestFactory().get("/")
+    request.COOKIES[django_settings.SESSION_COOKIE_NAME] = client.cookies[django_settings.SESSION_COOKIE_NAME].value
+
+    def view(request):
+        return HttpResponse(request.user.username)
+
+    handler = SessionMiddleware(AuthenticationMiddleware(ReplicaRoutingMiddleware(view)))
+
+    assert handler(request).content == b"ana"
@@ -0,0 +1,120 @@
+"""Tests for the sizing of the gunicorn workers."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from config.tuning import WorkerMonitor
+from config.tuning import WorkerSizing
+from config.tuning import cpu_limit
+from config.tuning import memory_limit
+from config.tuning import resident_memory
+from config.tuning import worker_class_for
+from config.tuning import worker_sizing
+
+
+MIB = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def host_cpus(monkeypatch):
+    """Pretend the host has 8 CPUs."""
+    monkeypatch.setattr("os.sched_getaffinity", lambda pid: set(range(8)))
+
+
+def test_cgroup_v2_limits(tmp_path):
+    """Test the CPU quota and the memory limit of a cgroup v2."""
+    (tmp_path / "cpu.max").write_text("150000 100000\n")
+    (tmp_path / "memory.max").write_text(f"{1024 * MIB}\n")
+
+    assert cpu_limit(tmp_path) == 1.5
+    assert memory_limit(tmp_path) == 1024 * MIB
+
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    (tmp_path / "memory.max").write_text("max\n")
+
+    assert cpu_limit(tmp_path) == 8
+    assert memory_limit(tmp_path) is None
+
+
+def test_cgroup_v1_limits(tmp_path):
+    """Test the CFS quota and the memory limit of a cgroup v1."""
+    (tmp_path / "cpu").mkdir()
+    (tmp_path / "memory").mkdir()
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("-1\n")
+    (tmp_path / "cpu" / "cpu.cfs_period_us").write_text("100000\n")
+    (tmp_path / "memory" / "memory.limit_in_bytes").write_text("9223372036854771712\n")
+
+    assert cpu_limit(tmp_path) == 8
+    assert memory_limit(tmp_path) is None
+
+    (tmp_path / "cpu" / "cpu.cfs_quota_us").write_text("1600000\n")
+
+    assert cpu_limit(tmp_path) == 8
+
+
+def test_no_cgroup(tmp_path):
+    """Test the host limits are used outside of a cgroup."""
+    assert cpu_limit(tmp_path) == 8
+    assert memory_limit(tmp_path) is None
+
+
+@pytest.mark.parametrize(
+    ("mode", "cpus", "memory", "expected"),
+    [
+        ("sync", 2, None, WorkerSizing(5, 1)),
+        ("gthread", 1.5, None, WorkerSizing(3, 4)),
+        ("gevent", 4, None, WorkerSizing(4, 1)),
+        ("uvicorn", 0.5, None, WorkerSizing(1, 1)),
+        ("sync", 4, 1024 * MIB, WorkerSizing(4, 1)),
+        ("sync", 4, 128 * MIB, WorkerSizing(1, 1)),
+    ],
+)
+def test_worker_sizing(mode, cpus, memory, expected):
+    """Test the workers follow the mode and fit in the memory limit."""
+    assert worker_sizing(mode, cpus, memory, worker_memory=256 * MIB) == expected
+
+
+def test_unknown_worker_mode():
+    """Test an unknown worker mode is rejected."""
+    assert worker_class_for("uvicorn") == "config.workers.UvicornWorker"
+    with pytest.raises(ValueError, match="meinheld"):
+        worker_class_for("meinheld")
+    with pytest.raises(ValueError, match="meinheld"):
+        worker_sizing("meinheld", 2, None, worker_memory=256 * MIB)
+
+
+def test_resident_memory():
+    """Test the resident memory of the process is read."""
+    assert 0 < resident_memory() < 1 << 40
+
+
+def test_worker_monitor(monkeypatch):
+    """Test the stats are logged every interval and the worker recycled once above the memory limit."""
+    rss = 100 * MIB
+    monkeypatch.setattr("config.tuning.resident_memory", lambda: rss)
+    worker = SimpleNamespace(pid=42, nr=0, max_requests=1500, log=Mock())
+    monitor = WorkerMonitor(max_memory=512 * MIB, stats_interval=10)
+
+    for worker.nr in range(1, 21):
+        assert monitor.check(worker) is None
+    assert worker.log.info.call_count == 2
+    worker.log.info.assert_called_with("Worker stats", extra={"pid": 42, "requests": 20, "rss_mb": 100.0})
+
+    rss = 600 * MIB
+    worker.nr = 21
+    assert monitor.check(worker) == "memory"
+    worker.log.info.assert_called_with(
+        "Recycling worker", extra={"pid": 42, "requests": 21, "rss_mb": 600.0, "reason": "memory"}
+    )
+    assert monitor.check(worker) is None
+
+
+def test_worker_monitor_max_requests(monkeypatch):
+    """Test the restart after max_requests is reported."""
+    monkeypatch.setattr("config.tuning.resident_memory", lambda: 100 * MIB)
+    worker = SimpleNamespace(pid=42, nr=1500, max_requests=1500, log=Mock())
+
+    assert WorkerMonitor(max_memory=0).check(worker) == "max_requests"
+    assert worker.log.info.call_args.kwargs["extra"]["reason"] == "max_requests"
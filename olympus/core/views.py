@@ -0,0 +1,54 @@
+"""Mixins of the API views."""
+
+from typing import Any
+
+from django.http import StreamingHttpResponse
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from olympus.core.renderers import ORJSONRenderer
+from olympus.core.renderers import iter_json_array
+
+
+class StreamingListMixin:
+    """Stream the unpaginated lists of a ``ListModelMixin`` view as a JSON array.
+
+    The rows are read with a server-side cursor and serialized ``stream_batch_size`` at a time,
+    so an export of the whole queryset never holds more than a batch of instances nor the full
+    response in memory. A paginated list, or a list rendered in another format, e.g. by the
+    browsable API, is rendered as usual::
+
+        class DealExportView(StreamingListMixin, ListAPIView):
+            pagination_class = None
+
+    The response streams under the WSGI workers only. Under ASGI, e.g. with the uvicorn workers,
+    Django 4.2 consumes the synchronous iterator of a ``StreamingHttpResponse`` whole before
+    sending it, so the response is sent at once, with the batches still serialized one at a time.
+    """
+
+    stream_batch_size = 500
+
+    def list(self, request: Request, *args: Any, **kwargs: Any) -> Response | StreamingHttpResponse:
+        """List the queryset, streamed when it is not paginated.
+
+        Args:
+            request: The request.
+            *args: The positional arguments of the URL.
+            **kwargs: The keyword arguments of the URL.
+
+        Returns:
+            The streamed response, or the response of the parent view.
+        """
+        paginated = self.paginator is not None  # type: ignore[attr-defined]
+        if paginated or not isinstance(request.accepted_renderer, ORJSONRenderer):
+            return super().list(request, *args, **kwargs)  # type: ignore[misc]
+
+        queryset = self.filter_queryset(self.get_queryset())  # type: ignore[attr-defined]
+
+        def serialize(batch: list[Any]) -> list[Any]:
+            return self.get_serializer(batch, many=True).data  # type: ignore[attr-defined, no-any-return]
+
+        return StreamingHttpResponse(
+            iter_json_array(queryset.iterator(chunk_size=self.stream_batch_size), serialize, self.stream_batch_size),
+            content_type=request.accepted_renderer.media_type,
+        )
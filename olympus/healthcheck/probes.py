@@ -0,0 +1,541 @@
+"""Dependency probes of the aggregate health check.
+
+Apps register their probes in the :data:`registry`, usually from ``AppConfig.ready``::
+
+    from olympus.healthcheck.probes import registry
+
+    @registry.register("search", timeout=1.0, critical=False)
+    def probe_search() -> None:
+        search_client.ping()
+
+A probe raises if its dependency is unavailable, it is either a coroutine function or a blocking
+function run on a small per-process thread pool. The probes run concurrently, each one awaited
+up to its own timeout, and the results are cached for ``HEALTH_CHECK_CACHE_TTL`` seconds, so
+frequent load balancer and Kubernetes probes hit the dependencies at most once per interval and
+per process. A background sampler runs them every
+``HEALTH_SAMPLE_INTERVAL`` seconds as well and keeps their latencies over a sliding window, so
+the p50 and p99 reveal a degrading dependency before it fails. Only the failure of a critical
+probe makes the service unavailable.
+"""
+
+import asyncio
+import math
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Iterator
+from typing import Mapping
+from typing import NamedTuple
+from typing import Optional
+
+from celery.backends.base import DisabledBackend
+from celery.backends.rpc import RPCBackend
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+
+from config.celery import app as celery_app
+from olympus.core.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+ProbeCheck = Callable[[], Optional[Awaitable[None]]]
+
+
+@dataclass(frozen=True)
+class Probe:
+    """A registered dependency probe.
+
+    Attributes:
+        name: The dependency name.
+        check: The function raising if the dependency is unavailable.
+        timeout: The timeout in seconds, ``HEALTH_CHECK_TIMEOUT`` if ``None``.
+        critical: Whether the service is unavailable when the probe fails.
+    """
+
+    name: str
+    check: ProbeCheck
+    timeout: Optional[float] = None
+    critical: bool = True
+
+
+class ProbeRegistry:
+    """The dependency probes of the health check, by name."""
+
+    def __init__(self) -> None:
+        """Initialize the registry."""
+        self._probes: dict[str, Probe] = {}
+
+    def register(
+        self,
+        name: str,
+        check: Optional[ProbeCheck] = None,
+        timeout: Optional[float] = None,
+        critical: bool = True,
+    ) -> Callable[..., Any]:
+        """Register a probe, replacing the probe registered under the same name.
+
+        Can be used as a decorator when ``check`` is not given.
+
+        Args:
+            name: The dependency name.
+            check: The function raising if the dependency is unavailable.
+            timeout: The timeout in seconds, ``HEALTH_CHECK_TIMEOUT`` if ``None``.
+            critical: Whether the service is unavailable when the probe fails.
+
+        Returns:
+            The check function, or the decorator registering it.
+        """
+
+        def decorator(check: ProbeCheck) -> ProbeCheck:
+            self._probes[name] = Probe(name, check, timeout, critical)
+            return check
+
+        return decorator if check is None else decorator(check)
+
+    def unregister(self, name: str) -> None:
+        """Remove a probe.
+
+        Args:
+            name: The dependency name.
+        """
+        self._probes.pop(name, None)
+
+    def __getitem__(self, name: str) -> Probe:
+        """Return a probe.
+
+        Args:
+            name: The dependency name.
+
+        Returns:
+            The probe.
+        """
+        return self._probes[name]
+
+    def __iter__(self) -> Iterator[Probe]:
+        """Iterate over the probes in the registration order.
+
+        Returns:
+            The iterator of the probes.
+        """
+        return iter(list(self._probes.values()))
+
+    def __len__(self) -> int:
+        """Return the number of probes.
+
+        Returns:
+            The number of probes.
+        """
+        return len(self._probes)
+
+
+class ProbeResult(NamedTuple):
+    """The outcome of a single probe."""
+
+    ok: bool
+    latency_ms: float
+    error: Optional[str] = None
+
+    def as_dict(self) -> dict[str, bool | float | str]:
+        """Return the JSON representation of the result.
+
+        Returns:
+            The status, the latency and the error if any.
+        """
+        data: dict[str, bool | float | str] = {"ok": self.ok, "latency_ms": self.latency_ms}
+        if self.error is not None:
+            data["error"] = self.error
+        return data
+
+
+def percentile(values: list[float], q: float) -> Optional[float]:
+    """Return the nearest-rank percentile of sorted values.
+
+    Args:
+        values: The sorted values.
+        q: The percentile, between 0 and 100.
+
+    Returns:
+        The percentile, ``None`` without values.
+    """
+    if not values:
+        return None
+    return values[max(math.ceil(q / 100 * len(values)) - 1, 0)]
+
+
+class LatencyWindow:
+    """The latencies of a probe over a sliding time window.
+
+    The window holds a few dozen samples at the sampling interval, so the raw latencies are kept
+    and the percentiles are exact.
+    """
+
+    def __init__(self, window: float, maxlen: int = 10_000, clock: Callable[[], float] = time.monotonic) -> None:
+        """Initialize the window.
+
+        Args:
+            window: The length of the window in seconds.
+            maxlen: The maximum number of samples kept.
+            clock: The monotonic clock, in seconds.
+        """
+        self.window = window
+        self.clock = clock
+        self._samples: deque[tuple[float, float]] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float) -> None:
+        """Add a sample.
+
+        Args:
+            latency_ms: The latency in milliseconds.
+        """
+        with self._lock:
+            self._samples.append((self.clock(), latency_ms))
+
+    def latencies(self) -> list[float]:
+        """Return the sorted latencies of the window, dropping the older ones.
+
+        Returns:
+            The latencies in milliseconds.
+        """
+        with self._lock:
+            oldest = self.clock() - self.window
+            while self._samples and self._samples[0][0] < oldest:
+                self._samples.popleft()
+            return sorted(latency for _, latency in self._samples)
+
+    def summary(self) -> dict[str, Optional[float]]:
+        """Return the number of samples and the median and the 99th percentile of the window.
+
+        Returns:
+            The ``samples``, ``p50_ms`` and ``p99_ms``, the percentiles are ``None`` without samples.
+        """
+        latencies = self.latencies()
+        return {
+            "samples": len(latencies),
+            "p50_ms": percentile(latencies, 50),
+            "p99_ms": percentile(latencies, 99),
+        }
+
+
+class HealthChecker:
+    """Run the registered probes concurrently, cache their results and sample their latencies.
+
+    Every probe is awaited with ``asyncio.wait_for`` and its own timeout. Coroutine probes are
+    cancelled when they time out. Blocking probes run on a small thread pool, and one still running
+    from a previous check is awaited again instead of being started twice, so a hanging dependency
+    never piles up threads.
+    """
+
+    def __init__(
+        self,
+        probes: ProbeRegistry,
+        ttl: float = 5.0,
+        timeout: float = 2.0,
+        timeouts: Optional[Mapping[str, float]] = None,
+        sample_interval: float = 0.0,
+        window: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the checker.
+
+        Args:
+            probes: The registry of the probes.
+            ttl: The number of seconds the results are cached, ``0`` disables the cache.
+            timeout: The timeout of the probes registered without one, in seconds.
+            timeouts: The timeouts overriding the registered ones by dependency name.
+            sample_interval: The number of seconds between the background samples, ``0`` disables them.
+            window: The length of the latency window in seconds.
+            clock: The monotonic clock, in seconds.
+        """
+        self.probes = probes
+        self.ttl = ttl
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.sample_interval = sample_interval
+        self.window = window
+        self.clock = clock
+        self.latencies: dict[str, LatencyWindow] = {}
+        self._lock = threading.Lock()
+        self._pid = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers = 0
+        self._sampler: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._running: dict[str, Future[None]] = {}
+        self._refreshing: Optional[asyncio.Task[dict[str, ProbeResult]]] = None
+        self._results: dict[str, ProbeResult] = {}
+        self._expires = 0.0
+
+    async def check(self) -> tuple[dict[str, ProbeResult], bool]:
+        """Return the results of the probes, from the cache while they are fresh.
+
+        Concurrent callers of the same event loop wait for the running check instead of starting
+        their own, a caller going away does not cancel it.
+
+        Returns:
+            The results by dependency name and whether they come from the cache.
+        """
+        self._ensure_sampler()
+        if self._pid == os.getpid() and self.clock() < self._expires:
+            return self._results, True
+        loop = asyncio.get_running_loop()
+        refreshing = self._refreshing
+        if refreshing is None or refreshing.done() or refreshing.get_loop() is not loop:
+            refreshing = self._refreshing = loop.create_task(self._refresh())
+        return await asyncio.shield(refreshing), False
+
+    async def run(self, name: str) -> ProbeResult:
+        """Run a single probe, bypassing the cache.
+
+        Args:
+            name: The dependency name.
+
+        Returns:
+            The result.
+        """
+        result = await self._probe(self.probes[name])
+        self._record(name, result)
+        return result
+
+    async def sample(self) -> None:
+        """Run the probes, refreshing the cached results, called by the background sampler."""
+        await self._refresh()
+
+    def is_online(self, results: Mapping[str, ProbeResult]) -> bool:
+        """Return whether every critical probe succeeded.
+
+        Args:
+            results: The results by dependency name.
+
+        Returns:
+            Whether the service is available.
+        """
+        return all(result.ok or not self.is_critical(name) for name, result in results.items())
+
+    def is_critical(self, name: str) -> bool:
+        """Return whether the probe is critical, the unregistered ones are.
+
+        Args:
+            name: The dependency name.
+
+        Returns:
+            Whether the probe is critical.
+        """
+        try:
+            return self.probes[name].critical
+        except KeyError:
+            return True
+
+    def summary(self, name: str) -> dict[str, Optional[float]]:
+        """Return the latency percentiles of a probe over the window.
+
+        Args:
+            name: The dependency name.
+
+        Returns:
+            The number of samples, the p50 and the p99.
+        """
+        return self.latencies.get(name, LatencyWindow(self.window)).summary()
+
+    def stop(self) -> None:
+        """Stop the background sampler."""
+        self._stopped.set()
+
+    async def _refresh(self) -> dict[str, ProbeResult]:
+        """Run the probes, record their latencies and cache the results.
+
+        Returns:
+            The results by dependency name.
+        """
+        probes = list(self.probes)
+        outcomes = await asyncio.gather(*(self._probe(probe) for probe in probes))
+        results = {probe.name: result for probe, result in zip(probes, outcomes, strict=True)}
+        for name, result in results.items():
+            self._record(name, result)
+        self._results, self._expires = results, self.clock() + self.ttl
+        return results
+
+    def _record(self, name: str, result: ProbeResult) -> None:
+        """Record the latency of a probe and log its failure.
+
+        Args:
+            name: The dependency name.
+            result: The result of the probe.
+        """
+        if not result.ok:
+            logger.error(f"Health check of {name} failed: {result.error}")
+        if name not in self.latencies:
+            self.latencies[name] = LatencyWindow(self.window, clock=self.clock)
+        self.latencies[name].record(result.latency_ms)
+
+    async def _probe(self, probe: Probe) -> ProbeResult:
+        """Await the probe up to its timeout.
+
+        Args:
+            probe: The probe.
+
+        Returns:
+            The result, with the latency in milliseconds.
+        """
+        timeout = self.timeouts.get(probe.name, probe.timeout or self.timeout)
+        started = time.perf_counter()
+        try:
+            if asyncio.iscoroutinefunction(probe.check):
+                await asyncio.wait_for(probe.check(), timeout)
+            else:
+                executor = self._ensure_executor()
+                future = self._running.get(probe.name)
+                if future is None or future.done():
+                    future = self._running[probe.name] = executor.submit(probe.check)
+                # A thread cannot be cancelled, the shielded future keeps the probe tracked.
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), timeout)
+        except asyncio.TimeoutError:
+            return ProbeResult(False, round((time.perf_counter() - started) * 1000, 3), "timeout")
+        except Exception as e:
+            return ProbeResult(False, round((time.perf_counter() - started) * 1000, 3), str(e) or type(e).__name__)
+        return ProbeResult(True, round((time.perf_counter() - started) * 1000, 3))
+
+    def _ensure_executor(self) -> ThreadPoolExecutor:
+        """Create the thread pool of the blocking probes, once in every process.
+
+        Returns:
+            The thread pool.
+        """
+        size = max(len(self.probes), 1)
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid() or self._workers < size:
+                # The threads of the parent do not survive the fork of the workers.
+                self._pid, self._workers = os.getpid(), size
+                self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="health")
+                self._running = {}
+            return self._executor
+
+    def _ensure_sampler(self) -> None:
+        """Start the background sampler, once in every process."""
+        if (
+            not self.sample_interval
+            or self._stopped.is_set()
+            or (self._sampler is not None and self._sampler.is_alive())
+        ):
+            return
+        with self._lock:
+            # The thread of the parent is not alive in the forked workers.
+            if self._sampler is None or not self._sampler.is_alive():
+                self._sampler = threading.Thread(target=self._sample_forever, name="health-sampler", daemon=True)
+                self._sampler.start()
+
+    def _sample_forever(self) -> None:
+        """Sample the probes on an event loop of the thread until the checker is stopped or the interpreter exits."""
+        while not self._stopped.wait(self.sample_interval):
+            try:
+                asyncio.run(self.sample())
+            except RuntimeError:
+                # The executor refuses new probes once the interpreter shuts down.
+                return
+
+
+registry = ProbeRegistry()
+
+
+@registry.register("database")
+def probe_database() -> None:
+    """Run ``SELECT 1`` on the default database.
+
+    No request signal ever closes the connections of the probe threads, so the probe closes its
+    connection like the end of a request does: past ``CONN_MAX_AGE``, always when it is pooled and
+    the slot goes back to the pool, or when the check fails so the next one reconnects.
+
+    Raises:
+        Exception: If the database is unreachable.
+        RuntimeError: If the database answers with an unexpected result.
+    """
+    connection = connections["default"]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            result = cursor.fetchone()
+    except Exception:
+        connection.close()
+        raise
+    finally:
+        connection.close_if_unusable_or_obsolete()
+    if not result or result[0] != 1:
+        raise RuntimeError(f"Unexpected result {result!r}.")
+
+
+@registry.register("broker")
+def probe_broker() -> None:
+    """Open a channel on a connection of the Celery broker connection pool.
+
+    The connection is kept in the pool between the checks, a failing one is discarded.
+
+    Raises:
+        Exception: If the broker is unreachable.
+    """
+    with celery_app.pool.acquire(block=True, timeout=settings.HEALTH_CHECK_TIMEOUT) as connection:
+        try:
+            connection.ensure_connection(max_retries=1)
+            connection.default_channel
+        except Exception:
+            connection.collect()
+            raise
+
+
+@registry.register("result_backend", critical=False)
+def probe_result_backend() -> None:
+    """Look up the state of a nonexistent task in the Celery result backend.
+
+    The ``rpc`` backend replies through the broker, which the broker probe already covers.
+    """
+    backend = celery_app.backend
+    if not isinstance(backend, (DisabledBackend, RPCBackend)):
+        backend.get_task_meta(f"health-{uuid.uuid4()}")
+
+
+@registry.register("cache", critical=False)
+def probe_cache() -> None:
+    """Write and read back a key of the shared cache, behind the cache of the process.
+
+    Raises:
+        RuntimeError: If the value is not read back.
+    """
+    cache = caches["shared"]
+    key = f"health:{os.getpid()}"
+    value = time.time()
+    cache.set(key, value, timeout=60)
+    if cache.get(key) != value:
+        raise RuntimeError("The cached value was not read back.")
+
+
+@registry.register("disk", critical=False)
+def probe_disk() -> None:
+    """Check the free space of the disk holding ``HEALTH_DISK_PATH``.
+
+    Raises:
+        RuntimeError: If less than ``HEALTH_DISK_MIN_FREE`` of the disk is free.
+    """
+    usage = shutil.disk_usage(settings.HEALTH_DISK_PATH)
+    if usage.free < usage.total * settings.HEALTH_DISK_MIN_FREE:
+        raise RuntimeError(f"Only {usage.free / usage.total:.1%} of {settings.HEALTH_DISK_PATH} is free.")
+
+
+health_checker = HealthChecker(
+    registry,
+    ttl=settings.HEALTH_CHECK_CACHE_TTL,
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+    timeouts=settings.HEALTH_CHECK_TIMEOUTS,
+    sample_interval=settings.HEALTH_SAMPLE_INTERVAL,
+    window=settings.HEALTH_SAMPLE_WINDOW,
+)
@@ -1,14 +1,21 @@
 """Tests for healthcheck app."""
 
+import asyncio
+import time
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
+from django.db import OperationalError
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from olympus.core.logger import get_logger
+from olympus.healthcheck.probes import HealthChecker
+from olympus.healthcheck.probes import LatencyWindow
+from olympus.healthcheck.probes import ProbeRegistry
+from olympus.healthcheck.probes import probe_database
 
 
 logger = get_logger(__name__)
@@ -42,14 +49,14 @@ def test_simple_health_check(api_client, view_name, expected_data):
     response = api_client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
-    assert response.data == expected_data
+    assert response.json() == expected_data
 
 
 @pytest.mark.parametrize(
     "mock_return,expected_status,expected_data",
     [
-        ((1,), status.HTTP_200_OK, {"is_db_online": True}),
-        ((0,), status.HTTP_503_SERVICE_UNAVAILABLE, {"is_db_online": False}),
+        ((1,), status.HTTP_200_OK, {"is_db_online": True, "pools": {}}),
+        ((0,), status.HTTP_503_SERVICE_UNAVAILABLE, {"is_db_online": False, "pools": {}}),
     ],
 )
 def test_db_health_check_results(api_client, mock_return, expected_status, expected_data):
@@ -61,34 +68,36 @@ def test_db_health_check_results(api_client, mock_return, expected_status, expec
         expected_status: The expected status code.
         expected_data: The expected data to return from the view.
     """
-    with patch("olympus.healthcheck.views.connection") as mock_connection:
+    with patch("olympus.healthcheck.probes.connections") as mock_connections:
         # Setup mock cursor
         mock_cursor = MagicMock()
         mock_cursor.fetchone.return_value = mock_return
-        mock_connection.cursor.return_value.__enter__.return_value = mock_cursor
+        mock_connections.__getitem__.return_value.cursor.return_value.__enter__.return_value = mock_cursor
 
         url = reverse("db_health_check")
         response = api_client.get(url)
 
         assert response.status_code == expected_status
-        assert response.data == expected_data
+        assert response.json() == expected_data
         mock_cursor.execute.assert_called_once_with("SELECT 1")
 
 
 def test_db_health_check_exception(api_client):
-    """Test DB health check when an exception occurs.
+    """Test DB health check when an exception occurs, the connection is closed.
 
     Args:
         api_client: The API client to use for testing.
     """
-    with patch("olympus.healthcheck.views.connection") as mock_connection:
-        mock_connection.cursor.side_effect = logger.error("DB connection error")
+    with patch("olympus.healthcheck.probes.connections") as mock_connections:
+        connection = mock_connections.__getitem__.return_value
+        connection.cursor.side_effect = OperationalError("DB connection error")
 
         url = reverse("db_health_check")
         response = api_client.get(url)
 
         assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
-        assert response.data == {"is_db_online": False}
+        assert response.json() == {"is_db_online": False, "pools": {}}
+        connection.close.assert_called_once()
 
 
 @pytest.mark.parametrize(
@@ -99,7 +108,7 @@ def test_db_health_check_exception(api_client):
     ],
 )
 def test_broker_health_check(api_client, connection_success, expected_status, expected_data):
-    """Test broker health check with success and failure scenarios.
+    """Test broker health check with success and failure scenarios, on a pooled connection.
 
     Args:
         api_client: The API client to use for testing.
@@ -107,18 +116,176 @@ def test_broker_health_check(api_client, connection_success, expected_status, ex
         expected_status: The expected status code.
         expected_data: The expected data to return from the view.
     """
-    with patch("olympus.healthcheck.views.Connection") as mock_connection:
-        if connection_success:
-            mock_conn_instance = MagicMock()
-            mock_connection.return_value.__enter__.return_value = mock_conn_instance
-        else:
-            mock_connection.return_value.__enter__.side_effect = logger.error("Broker connection error")
+    with patch("olympus.healthcheck.probes.celery_app") as mock_app:
+        mock_conn_instance = mock_app.pool.acquire.return_value.__enter__.return_value
+        if not connection_success:
+            mock_conn_instance.ensure_connection.side_effect = OSError("Broker connection error")
 
         url = reverse("broker_health_check")
         response = api_client.get(url)
 
         assert response.status_code == expected_status
-        assert response.data == expected_data
+        assert response.json() == expected_data
+        mock_conn_instance.ensure_connection.assert_called_once()
+        assert mock_conn_instance.collect.called is not connection_success
 
-        if connection_success:
-            mock_conn_instance.connect.assert_called_once()
+
+def _sleeping_probe(seconds, calls):
+    """Return a probe sleeping for the given time and counting its calls.
+
+    Args:
+        seconds: The time the probe takes.
+        calls: The list the probe appends its duration to.
+
+    Returns:
+        The probe.
+    """
+
+    def probe():
+        calls.append(seconds)
+        time.sleep(seconds)
+
+    return probe
+
+
+def _registry(critical=True, **checks):
+    """Return a registry of the checks.
+
+    Args:
+        critical: Whether the probes are critical.
+        **checks: The check functions by dependency name.
+
+    Returns:
+        The registry.
+    """
+    registry = ProbeRegistry()
+    for name, check in checks.items():
+        registry.register(name, check, critical=critical)
+    return registry
+
+
+def test_health_checker_runs_the_probes_concurrently_with_timeouts():
+    """Test the probes run in parallel, each bounded by its own timeout, and a hanging one is not restarted."""
+    calls = []
+    registry = _registry(
+        fast=_sleeping_probe(0.05, calls),
+        slow=_sleeping_probe(1.0, calls),
+        broken=MagicMock(side_effect=OSError("refused")),
+    )
+    registry.register("slow", registry["slow"].check, timeout=0.3)
+    checker = HealthChecker(
+        registry,
+        ttl=0,
+        timeout=0.2,
+        timeouts={"fast": 0.15},
+    )
+
+    started = time.perf_counter()
+    results, cached = asyncio.run(checker.check())
+
+    assert time.perf_counter() - started < 0.45
+    assert not cached
+    assert results["fast"].ok and results["fast"].latency_ms >= 50
+    assert results["slow"] == (False, results["slow"].latency_ms, "timeout")
+    assert results["broken"].error == "refused"
+
+    results, _ = asyncio.run(checker.check())
+    assert results["slow"].error == "timeout"
+    assert calls.count(1.0) == 1
+
+
+def test_health_checker_cancels_the_async_probes_on_timeout():
+    """Test a coroutine probe is awaited up to its timeout and cancelled."""
+    cancelled = []
+
+    async def hanging():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def ok():
+        await asyncio.sleep(0)
+
+    checker = HealthChecker(_registry(hanging=hanging, ok=ok), ttl=0, timeout=0.05)
+    results, _ = asyncio.run(checker.check())
+
+    assert results["hanging"].error == "timeout"
+    assert results["ok"].ok
+    assert cancelled == [True]
+
+
+def test_health_checker_caches_the_results():
+    """Test the probes run again only once the results expired."""
+    now = [0.0]
+    probe = MagicMock()
+    checker = HealthChecker(_registry(database=probe), ttl=5, clock=lambda: now[0])
+
+    assert asyncio.run(checker.check())[1] is False
+    now[0] = 4.9
+    assert asyncio.run(checker.check())[1] is True
+    now[0] = 5.0
+    assert asyncio.run(checker.check())[1] is False
+    assert probe.call_count == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_probe_database():
+    """Test the database probe succeeds against the test database."""
+    probe_database()
+
+
+@pytest.mark.parametrize("broker_error,expected_status", [(None, status.HTTP_200_OK), (OSError("refused"), 503)])
+def test_aggregate_health_check(api_client, broker_error, expected_status):
+    """Test the aggregate endpoint reports every dependency and fails if one of them is down.
+
+    Args:
+        api_client: The API client to use for testing.
+        broker_error: The error raised by the broker probe.
+        expected_status: The expected status code.
+    """
+    registry = _registry(database=MagicMock(), broker=MagicMock(side_effect=broker_error))
+    registry.register("cache", MagicMock(side_effect=OSError("down")), critical=False)
+    checker = HealthChecker(registry, ttl=60)
+    with patch("olympus.healthcheck.views.health_checker", checker):
+        response = api_client.get(reverse("aggregate_health_check"))
+        cached = api_client.get(reverse("aggregate_health_check"))
+
+    assert response.status_code == expected_status
+    assert response.json()["is_service_online"] is (broker_error is None)
+    assert response.json()["checks"]["database"]["ok"] is True
+    assert response.json()["checks"]["broker"].get("error") == (broker_error and "refused")
+    assert (response.json()["cached"], cached.json()["cached"]) == (False, True)
+    assert response.json()["checks"]["cache"]["critical"] is False
+    assert cached.json()["checks"]["database"]["samples"] == 1
+
+
+def test_latency_window_percentiles():
+    """Test the percentiles cover the samples of the sliding window only."""
+    now = [0.0]
+    window = LatencyWindow(60, clock=lambda: now[0])
+    assert window.summary() == {"samples": 0, "p50_ms": None, "p99_ms": None}
+
+    for latency in range(1, 101):
+        window.record(float(latency))
+    assert window.summary() == {"samples": 100, "p50_ms": 50.0, "p99_ms": 99.0}
+
+    now[0] = 30.0
+    window.record(500.0)
+    now[0] = 61.0
+    assert window.summary() == {"samples": 1, "p50_ms": 500.0, "p99_ms": 500.0}
+
+
+def test_health_checker_samples_in_the_background():
+    """Test the sampler refreshes the results and records the latencies without requests."""
+    probe = MagicMock()
+    checker = HealthChecker(_registry(database=probe), ttl=60, sample_interval=0.01)
+
+    asyncio.run(checker.check())
+    deadline = time.monotonic() + 2
+    while checker.summary("database")["samples"] < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    checker.stop()
+
+    assert checker.summary("database")["samples"] >= 3
@@ -2,6 +2,7 @@
 
 from django.urls import path
 
+from .views import AggregateHealthCheckView
 from .views import DBHealthCheckView
 from .views import HealthCheckView
 from .views import RabbitMQHealthCheckView
@@ -11,4 +12,5 @@ urlpatterns = [
     path("", HealthCheckView.as_view(), name="health_check"),
     path("db/", DBHealthCheckView.as_view(), name="db_health_check"),
     path("broker/", RabbitMQHealthCheckView.as_view(), name="broker_health_check"),
+    path("all/", AggregateHealthCheckView.as_view(), name="aggregate_health_check"),
 ]
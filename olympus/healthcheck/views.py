@@ -1,93 +1,127 @@
-from typing import Any
-
-from django.conf import settings
-from django.db import connection
-from kombu import Connection
-from rest_framework import status
-from rest_framework.permissions import AllowAny
-from rest_framework.response import Response
-from rest_framework.views import APIView
+"""Health check views.
 
-from olympus.core.logger import get_logger
+The views are asynchronous: under ASGI a worker keeps serving other requests while the probes
+wait for the dependencies, under WSGI Django runs them in an event loop of the request thread.
+"""
 
+from http import HTTPStatus
+from typing import Any
 
-logger = get_logger(__name__)
+from django.http import HttpRequest
+from django.http import JsonResponse
+from django.views import View
 
+from olympus.core.db.caching import model_cache_stats
+from olympus.core.db.pool import pool_stats
+from olympus.healthcheck.probes import health_checker
 
-class HealthCheckView(APIView):
-    """
-    Health check endpoint to verify if the application is running.
-    """
 
-    permission_classes = [AllowAny]
+class HealthCheckView(View):
+    """Health check endpoint to verify if the application is running."""
 
-    def get(self, *args: Any, **kwargs: Any) -> Response:  # noqa
-        """
-        Health check endpoint to verify if the application is running.
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+        """Health check endpoint to verify if the application is running.
 
         Args:
+            request: The request.
             args: Variable length argument list.
             kwargs: Arbitrary keyword arguments.
 
         Returns:
-            Response: A JSON response with a status of "ok" if the application is running.
+            JsonResponse: A JSON response with a status of "ok" if the application is running.
         """
-        return Response({"is_service_online": True}, status=status.HTTP_200_OK)
+        return JsonResponse({"is_service_online": True}, status=HTTPStatus.OK)
 
 
-class DBHealthCheckView(APIView):
-    """
-    Health check endpoint to verify if the database connection is alive.
-    """
+class ProbeHealthCheckView(View):
+    """Health check endpoint running a single probe of the registry, bypassing the cache."""
 
-    permission_classes = [AllowAny]
+    probe: str
+    key: str
 
-    def get(self, *args: Any, **kwargs: Any) -> Response:  # noqa
-        """
-        Health check endpoint to verify if the database connection is alive.
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+        """Health check endpoint to verify if the dependency is available.
 
         Args:
+            request: The request.
             args: Variable length argument list.
             kwargs: Arbitrary keyword arguments.
 
         Returns:
-            Response: A JSON response with a status of "ok" if the database connection is alive.
+            JsonResponse: A JSON response with the status of the dependency, 503 if it is unavailable.
         """
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-                result = cursor.fetchone()
-                if result and result[0] == 1:
-                    return Response({"is_db_online": True}, status=status.HTTP_200_OK)
-                else:
-                    return Response({"is_db_online": False}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-        except Exception as e:
-            logger.error(f"Database health check failed: {str(e)}")
-            return Response({"is_db_online": False}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
-
-
-class RabbitMQHealthCheckView(APIView):
-    """
-    Health check endpoint to verify if RabbitMQ connection is alive.
-    """
-
-    permission_classes = [AllowAny]
-
-    def get(self, *args: Any, **kwargs: Any) -> Response:  # noqa
+        result = await health_checker.run(self.probe)
+        return JsonResponse(
+            {self.key: result.ok, **self.details()},
+            status=HTTPStatus.OK if result.ok else HTTPStatus.SERVICE_UNAVAILABLE,
+        )
+
+    def details(self) -> dict[str, Any]:
+        """Return more information about the dependency.
+
+        Returns:
+            The members added to the response.
+        """
+        return {}
+
+
+class DBHealthCheckView(ProbeHealthCheckView):
+    """Health check endpoint to verify if the database connection is alive."""
+
+    probe = "database"
+    key = "is_db_online"
+
+    def details(self) -> dict[str, Any]:
+        """Return the usage of the connection pools of the process.
+
+        Returns:
+            The pool stats by database alias, empty without pooling.
         """
-        Health check endpoint to verify if RabbitMQ connection is alive.
+        return {"pools": pool_stats()}
+
+
+class RabbitMQHealthCheckView(ProbeHealthCheckView):
+    """Health check endpoint to verify if RabbitMQ connection is alive."""
+
+    probe = "broker"
+    key = "is_broker_online"
+
+
+class AggregateHealthCheckView(View):
+    """Health check endpoint reporting every dependency at once."""
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> JsonResponse:
+        """Health check endpoint reporting the status and the latency of every dependency.
+
+        The probes of the registry run concurrently with a timeout each and the results are cached
+        per process for ``HEALTH_CHECK_CACHE_TTL`` seconds. Every check reports its latency
+        percentiles over the sampling window, only the failed critical checks make it a 503.
 
         Args:
+            request: The request.
             args: Variable length argument list.
             kwargs: Arbitrary keyword arguments.
 
         Returns:
-            Response: A JSON response with a status of "ok" if the RabbitMQ connection is alive.
+            JsonResponse: A JSON response with the result of every probe, the usage of the connection
+                pools and the hit ratios of the model caches, 503 if a critical one failed.
         """
-        try:
-            with Connection(settings.CELERY_BROKER_URL) as connection:
-                connection.connect()
-                return Response({"is_broker_online": True}, status=status.HTTP_200_OK)
-        except Exception as e:
-            logger.error(f"Broker health check failed: {str(e)}")
-            return Response({"is_broker_online": False}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        results, cached = await health_checker.check()
+        is_online = health_checker.is_online(results)
+        return JsonResponse(
+            {
+                "is_service_online": is_online,
+                "cached": cached,
+                "pools": pool_stats(),
+                "model_caches": model_cache_stats(),
+                "checks": {
+                    name: {
+                        **result.as_dict(),
+                        "critical": health_checker.is_critical(name),
+                        **health_checker.summary(name),
+                    }
+                    for name, result in results.items()
+                },
+            },
+            status=HTTPStatus.OK if is_online else HTTPStatus.SERVICE_UNAVAILABLE,
+        )